@@ -0,0 +1,195 @@
+"""Offline benchmarks for the Cookie API clients.
+
+All requests are served by :class:`cookie.testing.MockCookieAPI`, so the results measure
+the overhead of the clients themselves plus the injected latency.
+
+.. code-block:: text
+
+    python benchmarks/run.py --output results.json
+    python benchmarks/run.py --compare results.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+from collections.abc import Callable
+from datetime import datetime, timezone
+from pathlib import Path
+
+import httpx
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import cookie  # noqa: E402
+from cookie._internal import get_decoder, lazy_model  # noqa: E402
+from cookie.testing import MockCookieAPI  # noqa: E402
+
+GUILD_ID = 1010915072694046794
+MODELS = {
+    "GuildStats": "stats/guild/1",
+    "UserStats": "stats/user/1",
+    "MemberStats": "stats/member/1/1",
+    "MemberActivity": "activity/member/1/1",
+    "GuildActivity": "activity/guild/1",
+}
+
+
+def percentiles(samples: list[float]) -> dict[str, float]:
+    ordered = sorted(samples)
+
+    def pick(q: float) -> float:
+        return ordered[min(int(q * len(ordered)), len(ordered) - 1)] * 1000
+
+    return {"p50_ms": pick(0.5), "p95_ms": pick(0.95), "p99_ms": pick(0.99)}
+
+
+def per_call(func: Callable[[], object], number: int) -> float:
+    """Return the best time per call in microseconds."""
+    best = float("inf")
+    for _ in range(3):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        best = min(best, time.perf_counter() - start)
+    return best / number * 1e6
+
+
+def bench_sync(mock: MockCookieAPI, requests: int) -> dict[str, float]:
+    client = httpx.Client(transport=mock.transport())
+    samples = []
+    with cookie.CookieAPI(api_key="test", httpx_client=client) as api:
+        start = time.perf_counter()
+        for user_id in range(1, requests + 1):
+            call_start = time.perf_counter()
+            api.get_member_stats(user_id, GUILD_ID)
+            samples.append(time.perf_counter() - call_start)
+        elapsed = time.perf_counter() - start
+
+    return {"requests_per_sec": requests / elapsed, **percentiles(samples)}
+
+
+def bench_async(mock: MockCookieAPI, requests: int, concurrency: int) -> dict[str, float]:
+    async def main() -> dict[str, float]:
+        samples = []
+        session = httpx.AsyncClient(transport=mock.async_transport())
+        async with cookie.AsyncCookieAPI(api_key="test", session=session) as api:
+
+            async def timed(user_id: int) -> None:
+                call_start = time.perf_counter()
+                await api.get_member_stats(user_id, GUILD_ID)
+                samples.append(time.perf_counter() - call_start)
+
+            start = time.perf_counter()
+            await api._run_many(timed, ((i,) for i in range(1, requests + 1)), concurrency)
+            elapsed = time.perf_counter() - start
+
+        return {"requests_per_sec": requests / elapsed, **percentiles(samples)}
+
+    return asyncio.run(main())
+
+
+def bench_parse(mock: MockCookieAPI, days: int, number: int) -> dict[str, float]:
+    results = {}
+    for name, path in MODELS.items():
+        model = getattr(cookie, name)
+        data = mock.payload(path, days)
+        results[f"{name}_eager_us"] = per_call(lambda: model(**data), number)
+        results[f"{name}_lazy_us"] = per_call(lambda: lazy_model(model, data), number)
+    return results
+
+
+def bench_decode(mock: MockCookieAPI, days: int, number: int) -> dict[str, float]:
+    body = json.dumps(mock.payload("activity/guild/1", days)).encode()
+    results = {}
+    for backend in ("json", "orjson", "msgspec"):
+        try:
+            decode = get_decoder(backend)  # type: ignore[arg-type]
+        except ImportError:
+            continue
+        results[f"{backend}_us"] = per_call(lambda: decode(body), number)
+    return results
+
+
+def bench_memory(mock: MockCookieAPI, members: int, days: int) -> dict[str, float]:
+    async def bulk() -> None:
+        session = httpx.AsyncClient(transport=mock.async_transport())
+        async with cookie.AsyncCookieAPI(api_key="test", session=session) as api:
+            pairs = [(user_id, GUILD_ID) for user_id in range(1, members + 1)]
+            await api.get_many_member_stats(pairs, concurrency=50)
+
+    def large_days() -> None:
+        client = httpx.Client(transport=mock.transport())
+        with cookie.CookieAPI(api_key="test", httpx_client=client) as api:
+            [api.get_guild_activity(guild_id, days) for guild_id in range(1, 51)]
+
+    results = {}
+    for name, func in (
+        ("bulk_member_stats", lambda: asyncio.run(bulk())),
+        ("large_days", large_days),
+    ):
+        tracemalloc.start()
+        func()
+        results[f"{name}_peak_kib"] = tracemalloc.get_traced_memory()[1] / 1024
+        tracemalloc.stop()
+    return results
+
+
+def compare(old: dict, new: dict) -> None:
+    print(f"{'benchmark':<52}{'old':>12}{'new':>12}{'change':>10}")
+    for group, metrics in new["results"].items():
+        for metric, value in metrics.items():
+            previous = old["results"].get(group, {}).get(metric)
+            if previous is None:
+                continue
+            change = (value - previous) / previous * 100 if previous else 0.0
+            print(f"{group + '.' + metric:<52}{previous:>12.2f}{value:>12.2f}{change:>9.1f}%")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--latency", type=float, default=0.002, help="Mock latency in seconds.")
+    parser.add_argument("--requests", type=int, default=300, help="Requests per client benchmark.")
+    parser.add_argument("--concurrency", type=int, default=20, help="Async concurrency.")
+    parser.add_argument("--days", type=int, default=365, help="Days for large responses.")
+    parser.add_argument("--output", type=Path, help="Save the results to a JSON file.")
+    parser.add_argument("--compare", type=Path, help="Compare with previously saved results.")
+    args = parser.parse_args()
+
+    mock = MockCookieAPI(latency=args.latency)
+    results = {
+        "sync": bench_sync(mock, args.requests),
+        "async": bench_async(mock, args.requests, args.concurrency),
+        "parse_14_days": bench_parse(mock, 14, 2000),
+        f"parse_{args.days}_days": bench_parse(mock, args.days, 200),
+        f"decode_{args.days}_days": bench_decode(mock, args.days, 500),
+    }
+    mock.latency = 0
+    results["memory"] = bench_memory(mock, args.requests * 3, args.days)
+
+    report = {
+        "meta": {
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "cookie": cookie.__version__,
+            "args": {k: str(v) for k, v in vars(args).items()},
+        },
+        "results": results,
+    }
+
+    if args.compare:
+        compare(json.loads(args.compare.read_text()), report)
+    else:
+        print(json.dumps(results, indent=2))
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -2,6 +2,89 @@ __title__ = "cookie-api"
 __license__ = "MIT"
 __version__ = "0.3.0"
 
-from .api import AsyncCookieAPI, CookieAPI
+from importlib import import_module
+from importlib.util import find_spec
+from typing import TYPE_CHECKING
+
 from .errors import *
-from .models import *
+
+# Clients and models are imported on first access, so that importing the
+# package does not import httpx or pydantic (PEP 562).
+_LAZY_ATTRIBUTES = {
+    "AsyncCookieAPI": "api",
+    "CookieAPI": "api",
+    "ResponseCache": "cache",
+    "ClientConfig": "config",
+    "KeyPool": "keys",
+    "PrefetchScheduler": "prefetch",
+    "QuotaBudget": "ratelimit",
+    "RateLimiter": "ratelimit",
+    "low_priority": "ratelimit",
+    "CircuitBreaker": "retry",
+    "HedgePolicy": "retry",
+    "RetryPolicy": "retry",
+    "deadline": "retry",
+    "ChartStore": "store",
+    "MemberStatsTable": "table",
+    "MetricsCollector": "tracing",
+    "OpenTelemetryTracer": "tracing",
+    "RequestEvent": "tracing",
+    "Tracer": "tracing",
+}
+
+if TYPE_CHECKING:
+    from .api import AsyncCookieAPI, CookieAPI
+    from .cache import ResponseCache
+    from .config import ClientConfig
+    from .keys import KeyPool
+    from .models import *
+    from .prefetch import PrefetchScheduler
+    from .ratelimit import QuotaBudget, RateLimiter, low_priority
+    from .retry import CircuitBreaker, HedgePolicy, RetryPolicy, deadline
+    from .store import ChartStore
+    from .table import MemberStatsTable
+    from .tracing import MetricsCollector, OpenTelemetryTracer, RequestEvent, Tracer
+
+
+def _model_names() -> list[str]:
+    from pydantic import BaseModel
+
+    models = import_module(".models", __name__)
+    return [
+        name
+        for name, value in vars(models).items()
+        if isinstance(value, type)
+        and issubclass(value, BaseModel)
+        and value.__module__ == models.__name__
+    ]
+
+
+def __getattr__(name: str):
+    if name == "__all__":
+        from . import errors
+
+        error_names = [
+            n for n, v in vars(errors).items() if isinstance(v, type) and issubclass(v, Exception)
+        ]
+        return [*_LAZY_ATTRIBUTES, *error_names, *_model_names()]
+
+    module_name = _LAZY_ATTRIBUTES.get(name)
+    if module_name is None:
+        # Submodules, e.g. cookie.api, that weren't imported yet
+        if find_spec(f".{name}", __name__) is not None:
+            return import_module(f".{name}", __name__)
+        if name.startswith("_"):
+            raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+        module = import_module(".models", __name__)
+        if name not in vars(module):
+            raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    else:
+        module = import_module(f".{module_name}", __name__)
+
+    value = getattr(module, name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted({*globals(), *_LAZY_ATTRIBUTES})
@@ -1 +1,5 @@
-from .custom_models import BaseChart
+from .custom_models import BaseChart, BaseResponse
+from .decoders import JSONBackend, get_decoder
+from .lazy import lazy_model
+from .shared import ClientRegistry
+from .singleflight import AsyncSingleFlight, CallAbandoned, SingleFlight
@@ -1,29 +1,155 @@
-from pydantic import BaseModel
+from __future__ import annotations
+
+import time
+from bisect import bisect_left, bisect_right
+from datetime import date, datetime, timezone
+from typing import Any
+
+from pydantic import BaseModel, PrivateAttr
+
+
+class BaseResponse(BaseModel):
+    """Base class for all API responses that records when the response was fetched.
+
+    Cached responses keep the time of the original request, so :attr:`age` shows how
+    old the data is and :attr:`is_stale` whether it was served after its cache TTL.
+    """
+
+    _fetched_at: float | None = PrivateAttr(default=None)
+    _stale: bool = PrivateAttr(default=False)
+
+    @property
+    def fetched_at(self) -> datetime | None:
+        """When the response was fetched from the API, or ``None`` for models that
+        were created manually."""
+        if self._fetched_at is None:
+            return None
+        return datetime.fromtimestamp(self._fetched_at, timezone.utc)
+
+    @property
+    def age(self) -> float | None:
+        """The seconds since the response was fetched from the API."""
+        if self._fetched_at is None:
+            return None
+        return max(time.time() - self._fetched_at, 0.0)
+
+    @property
+    def is_stale(self) -> bool:
+        """Whether the response was returned from the cache after its TTL expired,
+        while a fresh response is requested in the background."""
+        return self._stale
+
+    def __eq__(self, other: Any) -> bool:
+        # The fetch time is not part of the data
+        if type(other) is not type(self):
+            return NotImplemented
+        return (
+            self.__dict__ == other.__dict__ and self.__pydantic_extra__ == other.__pydantic_extra__
+        )
 
 
 class BaseChart(BaseModel):
-    """Base class for all charts that allows dictionary usage."""
+    """Base class for all charts that allows dictionary usage.
 
-    def to_dict(self):
+    The date index and the NumPy arrays are built on first use and rebuilt when
+    ``x`` or ``y`` are reassigned or change their length. Changing single elements
+    in place, e.g. ``chart.y[3] = 5``, is not detected; assign a new list instead.
+    """
+
+    _index: dict | None = PrivateAttr(default=None)
+    _index_key: tuple | None = PrivateAttr(default=None)
+    _arrays: Any = PrivateAttr(default=None)
+    _arrays_key: tuple | None = PrivateAttr(default=None)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        super().__setattr__(name, value)
+        if name in ("x", "y"):
+            self._index = None
+            self._arrays = None
+
+    def __eq__(self, other: Any) -> bool:
+        # The cached index and arrays are not part of the data
+        if type(other) is not type(self):
+            return NotImplemented
+        return (
+            self.__dict__ == other.__dict__ and self.__pydantic_extra__ == other.__pydantic_extra__
+        )
+
+    def _mapping(self) -> dict:
         try:
-            return {d: value for d, value in zip(getattr(self, "x"), getattr(self, "y"))}
+            x, y = getattr(self, "x"), getattr(self, "y")
         except AttributeError:
             return self.model_dump()
 
+        # Reassignments clear the index, appends are detected by the lengths
+        key = (len(x), len(y))
+        if self._index is None or self._index_key != key:
+            self._index = dict(zip(x, y))
+            self._index_key = key
+        return self._index
+
+    def to_dict(self):
+        return dict(self._mapping())
+
     def __getitem__(self, item):
-        return self.to_dict()[item]
+        return self._mapping()[item]
+
+    def __contains__(self, item):
+        return item in self._mapping()
+
+    def get(self, item, default=None):
+        return self._mapping().get(item, default)
 
     def values(self):
-        return self.to_dict().values()
+        return self._mapping().values()
 
     def keys(self):
-        return self.to_dict().keys()
+        return self._mapping().keys()
 
     def items(self):
-        return self.to_dict().items()
+        return self._mapping().items()
 
     def __iter__(self):
-        return iter(self.to_dict())
+        return iter(self._mapping())
 
     def __len__(self):
-        return len(self.to_dict())
+        return len(self._mapping())
+
+    def to_numpy(self):
+        """Return the dates as a ``datetime64[D]`` array and the values as an ``int64`` array.
+        Requires ``numpy``. See :func:`cookie.arrays.chart_to_numpy`.
+        """
+        from ..arrays import chart_to_numpy
+
+        return chart_to_numpy(self)
+
+    def between(self, start: date | None = None, end: date | None = None) -> Any:
+        """Return a new chart with the values between two dates (inclusive).
+
+        Parameters
+        ----------
+        start:
+            The first date. Defaults to the start of the chart.
+        end:
+            The last date. Defaults to the end of the chart.
+        """
+        x, y = getattr(self, "x"), getattr(self, "y")
+        i = 0 if start is None else bisect_left(x, start)
+        j = len(x) if end is None else bisect_right(x, end)
+        return self.model_construct(x=x[i:j], y=y[i:j])
+
+    def nearest(self, day: date) -> date | None:
+        """Return the date in the chart that is closest to ``day``, or ``None`` if the
+        chart is empty. If two dates are equally close, the earlier one is returned.
+        """
+        x = getattr(self, "x")
+        if not x:
+            return None
+
+        i = bisect_left(x, day)
+        if i == 0:
+            return x[0]
+        if i == len(x):
+            return x[-1]
+        before, after = x[i - 1], x[i]
+        return before if day - before <= after - day else after
@@ -0,0 +1,30 @@
+from __future__ import annotations
+
+import json
+from collections.abc import Callable
+from typing import Any, Literal
+
+JSONBackend = Literal["json", "orjson", "msgspec"]
+
+
+def get_decoder(backend: JSONBackend) -> Callable[[bytes], Any]:
+    """Return a function that decodes a JSON response body with the given backend."""
+    if backend == "json":
+        return json.loads
+
+    try:
+        if backend == "orjson":
+            import orjson
+
+            return orjson.loads
+        if backend == "msgspec":
+            import msgspec
+
+            return msgspec.json.Decoder().decode
+    except ImportError:
+        raise ImportError(
+            f"The {backend} package is required for this JSON backend. "
+            f"Install it with: pip install cookie-api[{backend}]"
+        ) from None
+
+    raise ValueError(f"Unknown JSON backend: {backend!r}")
@@ -1,12 +1,20 @@
 from datamodel_code_generator.format import CustomCodeFormatter
 
+RESPONSE_MODELS = ("GuildActivity", "GuildStats", "MemberActivity", "MemberStats", "UserStats")
+
 
 class CodeFormatter(CustomCodeFormatter):
     def apply(self, code: str) -> str:
-        # Import BaseChart
-        code = code.replace("\nclass", "from ._internal import BaseChart\n\n\nclass", 1)
+        # Import BaseChart and BaseResponse
+        code = code.replace(
+            "\nclass", "from ._internal import BaseChart, BaseResponse\n\n\nclass", 1
+        )
 
         # Let BaseChart inherit from BaseModel
         code = code.replace("class Chart(BaseModel)", "class Chart(BaseChart)")
 
+        # Let the models of API responses inherit from BaseResponse
+        for name in RESPONSE_MODELS:
+            code = code.replace(f"class {name}(BaseModel)", f"class {name}(BaseResponse)")
+
         return code
@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+from typing import Any, TypeVar, cast
+
+from pydantic import BaseModel, TypeAdapter
+
+M = TypeVar("M", bound=BaseModel)
+
+_lazy_classes: dict[type[BaseModel], type[BaseModel]] = {}
+_adapters: dict[tuple[type[BaseModel], str], TypeAdapter] = {}
+
+
+def _adapter(model: type[BaseModel], name: str) -> TypeAdapter:
+    adapter = _adapters.get((model, name))
+    if adapter is None:
+        annotation = model.model_fields[name].annotation
+        assert annotation is not None
+        adapter = _adapters[(model, name)] = TypeAdapter(annotation)
+    return adapter
+
+
+def _model_of(obj: Any) -> type[BaseModel]:
+    # The MRO of a lazy class is (lazy class, _LazyModel, model, ...)
+    return cast("type[BaseModel]", type(obj).__mro__[2])
+
+
+class _LazyModel:
+    """Validates the fields of a model on first access instead of on construction.
+
+    The raw data is kept in ``_lazy_data``. When a field is accessed for the first
+    time, only that field is validated and the result is stored on the instance,
+    so following accesses are regular attribute lookups.
+    """
+
+    __slots__ = ()
+    _lazy_data: dict[str, Any]
+
+    def __getattr__(self, name: str) -> Any:
+        model = _model_of(self)
+        if name not in model.model_fields:
+            return super().__getattr__(name)  # type: ignore[misc]
+
+        data = object.__getattribute__(self, "_lazy_data")
+        if name not in data:
+            # Let pydantic raise a proper validation error for the missing field
+            model.model_validate(data)
+
+        value = _adapter(model, name).validate_python(data[name])
+        self.__dict__[name] = value
+        return value
+
+    def _materialize(self) -> None:
+        for name in _model_of(self).model_fields:
+            if name not in self.__dict__:
+                getattr(self, name)
+
+    def model_dump(self, **kwargs) -> dict[str, Any]:
+        self._materialize()
+        return super().model_dump(**kwargs)  # type: ignore[misc]
+
+    def model_dump_json(self, **kwargs) -> str:
+        self._materialize()
+        return super().model_dump_json(**kwargs)  # type: ignore[misc]
+
+    def model_copy(self, **kwargs):
+        self._materialize()
+        return super().model_copy(**kwargs)  # type: ignore[misc]
+
+    def __repr_args__(self):
+        self._materialize()
+        return super().__repr_args__()  # type: ignore[misc]
+
+    def __reduce__(self):
+        return lazy_model, (_model_of(self), object.__getattribute__(self, "_lazy_data"))
+
+    def __eq__(self, other: Any) -> bool:
+        model = _model_of(self)
+        if not isinstance(other, model):
+            return NotImplemented
+
+        self._materialize()
+        if isinstance(other, _LazyModel):
+            other._materialize()
+        return self.__dict__ == other.__dict__
+
+
+def _lazy_class(model: type[M]) -> type[M]:
+    cls = _lazy_classes.get(model)
+    if cls is None:
+        namespace = {
+            "__slots__": ("_lazy_data",),
+            "__module__": model.__module__,
+            "__qualname__": model.__qualname__,
+            "__doc__": model.__doc__,
+        }
+        metaclass: type = type(model)
+        cls = _lazy_classes[model] = metaclass(model.__name__, (_LazyModel, model), namespace)
+    return cast("type[M]", cls)
+
+
+def lazy_model(model: type[M], data: dict[str, Any]) -> M:
+    """Create an instance of ``model`` from trusted data without validating it.
+
+    The returned object is an instance of ``model``, but its fields are only
+    validated when they are accessed.
+    """
+    cls = _lazy_class(model)
+    obj = object.__new__(cls)
+    object.__setattr__(obj, "__dict__", {})
+    object.__setattr__(obj, "__pydantic_fields_set__", set(data).intersection(model.model_fields))
+    object.__setattr__(obj, "__pydantic_extra__", None)
+    private = {name: attr.get_default() for name, attr in model.__private_attributes__.items()}
+    object.__setattr__(obj, "__pydantic_private__", private or None)
+    object.__setattr__(obj, "_lazy_data", data)
+    return obj
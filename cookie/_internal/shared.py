@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+import threading
+from collections.abc import Callable, Hashable
+from typing import Any, TypeVar
+
+T = TypeVar("T")
+
+
+class ClientRegistry:
+    """Shares one httpx client per key between many API clients.
+
+    Each :meth:`acquire` increments the reference count of the client for its key,
+    creating the client on first use. :meth:`release` decrements it and returns the
+    client once the last user released it, so that the caller can close it.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._clients: dict[Hashable, list[Any]] = {}
+
+    def __len__(self) -> int:
+        return len(self._clients)
+
+    def references(self, key: Hashable) -> int:
+        """Return the number of users of the client for ``key``."""
+        with self._lock:
+            entry = self._clients.get(key)
+            return entry[1] if entry is not None else 0
+
+    def acquire(self, key: Hashable, factory: Callable[[], T]) -> T:
+        with self._lock:
+            entry = self._clients.get(key)
+            if entry is None:
+                entry = self._clients[key] = [factory(), 0]
+            entry[1] += 1
+            return entry[0]
+
+    def release(self, key: Hashable) -> Any | None:
+        with self._lock:
+            entry = self._clients[key]
+            entry[1] -= 1
+            if entry[1] > 0:
+                return None
+            del self._clients[key]
+            return entry[0]
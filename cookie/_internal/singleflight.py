@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from collections.abc import Awaitable, Callable
+from concurrent.futures import Future
+from typing import Any, TypeVar
+
+T = TypeVar("T")
+
+
+class AsyncSingleFlight:
+    """Lets concurrent coroutines that request the same key share one call.
+
+    The shared call runs in its own task, so a cancelled caller does not cancel
+    the request for the other callers that are still waiting for it.
+    """
+
+    def __init__(self):
+        self._calls: dict[str, asyncio.Future] = {}
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._calls
+
+    def __len__(self) -> int:
+        return len(self._calls)
+
+    def keys(self) -> list[str]:
+        return list(self._calls)
+
+    def join(self, key: str) -> Awaitable[Any] | None:
+        """Return an awaitable for the call that is in flight for ``key``, if there is one."""
+        task = self._calls.get(key)
+        return asyncio.shield(task) if task is not None else None
+
+    async def do(self, key: str, func: Callable[[], Awaitable[T]]) -> T:
+        task = self._calls.get(key)
+        if task is None:
+            task = asyncio.ensure_future(func())
+            self._calls[key] = task
+            task.add_done_callback(lambda t: self._done(key, t))
+
+        return await asyncio.shield(task)
+
+    def _done(self, key: str, task: asyncio.Future) -> None:
+        if self._calls.get(key) is task:
+            del self._calls[key]
+        if not task.cancelled():
+            # Mark the exception as retrieved in case every caller was cancelled
+            task.exception()
+
+
+class CallAbandoned(Exception):
+    """The thread that made a shared call raised an exception that only concerns itself."""
+
+
+class SingleFlight:
+    """Lets concurrent threads that request the same key share one call.
+
+    Exceptions of the types in ``local_errors`` only concern the thread that made the
+    call, e.g. because its deadline passed. The waiting threads then make the call
+    again instead of raising them.
+    """
+
+    def __init__(self, local_errors: tuple[type[BaseException], ...] = ()):
+        self._local_errors = local_errors
+        self._lock = threading.Lock()
+        self._calls: dict[str, Future[Any]] = {}
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._calls
+
+    def __len__(self) -> int:
+        return len(self._calls)
+
+    def keys(self) -> list[str]:
+        with self._lock:
+            return list(self._calls)
+
+    def join(self, key: str) -> Future[Any] | None:
+        """Return the future of the call that is in flight for ``key``, if there is one.
+        The future raises :class:`CallAbandoned` if the call was abandoned.
+        """
+        with self._lock:
+            return self._calls.get(key)
+
+    def do(self, key: str, func: Callable[[], T], timeout: float | None = None) -> T:
+        """Call ``func`` or wait for the call that is in flight for ``key``.
+        ``timeout`` only limits the wait for a call of another thread.
+        """
+        end = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self._lock:
+                future = self._calls.get(key)
+                leader = future is None
+                if leader:
+                    future = self._calls[key] = Future()
+                    break
+
+            try:
+                return future.result(None if end is None else max(end - time.monotonic(), 0))
+            except CallAbandoned:
+                continue
+
+        try:
+            result = func()
+        except self._local_errors:
+            future.set_exception(CallAbandoned())
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                del self._calls[key]
@@ -1,20 +1,95 @@
 from __future__ import annotations
 
+import asyncio
+import contextvars
 import json
 import os
-from typing import overload
+import threading
+import time
+from collections.abc import (
+    AsyncIterable,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Iterable,
+    Iterator,
+)
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from concurrent.futures import as_completed
+from concurrent.futures import wait as wait_futures
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, BinaryIO, NoReturn, TypeVar, Union, overload
 
 import httpx
-from dotenv import load_dotenv
-
-from .errors import CookieError, InvalidAPIKey, NoGuildAccess, NotFound, QuotaExceeded
+from pydantic import BaseModel
+
+from ._internal import (
+    AsyncSingleFlight,
+    CallAbandoned,
+    ClientRegistry,
+    JSONBackend,
+    SingleFlight,
+    get_decoder,
+    lazy_model,
+)
+from .cache import CachedValue, ResponseCache, find_wider_window, slice_window
+from .config import ClientConfig
+from .errors import (
+    CookieError,
+    DeadlineExceeded,
+    InvalidAPIKey,
+    NoGuildAccess,
+    NotFound,
+    QuotaExceeded,
+)
+from .export import ImageExporter, ImageManifestEntry
+from .keys import KeyPool, guild_id_of
 from .models import GuildActivity, GuildStats, MemberActivity, MemberStats, UserStats
+from .prefetch import PrefetchScheduler
+from .ratelimit import QuotaBudget, RateLimiter
+from .retry import (
+    CircuitBreaker,
+    HedgePolicy,
+    RetryPolicy,
+    _without_deadline,
+    check_deadline,
+    fits_deadline,
+    remaining_time,
+)
+from .table import MemberStatsTable
+from .tracing import RequestTrace, Tracer, current_trace, trace_request
+
+if TYPE_CHECKING:
+    from httpx._client import UseClientDefault
 
 DEFAULT_DAYS = 14
+DEFAULT_CONCURRENCY = 10
+DEFAULT_CHUNK_SIZE = 64 * 1024
+DEFAULT_REFRESH_WORKERS = 4
+DEFAULT_HEDGE_WORKERS = 200
 BASE_URL = "https://api.cookieapp.me/v1/"
 
+T = TypeVar("T")
+M = TypeVar("M", bound=BaseModel)
+K = TypeVar("K")
+FileTarget = Union[str, os.PathLike, BinaryIO]
+
+# httpx clients shared by API clients with shared_pool=True, per event loop and config
+_shared_clients = ClientRegistry()
+
+
+def _api_key_from_env() -> str:
+    from dotenv import load_dotenv
+
+    load_dotenv()
+    api_key = os.getenv("COOKIE_KEY")
+    if api_key is None:
+        raise InvalidAPIKey("Please provide an API key or set the COOKIE_KEY environment variable.")
+    return api_key
 
-def _handle_error(response: httpx.Response):
+
+def _handle_error(response: httpx.Response) -> NoReturn:
     try:
         data = response.json()
     except json.JSONDecodeError:
@@ -37,29 +112,170 @@ def _handle_error(response: httpx.Response):
         raise CookieError(response)
 
 
+def _batch_error(error: CookieError | httpx.TransportError) -> CookieError:
+    """Return the error of one call of a batch, so that it doesn't abort the other calls.
+    Connection errors are wrapped in a :class:`~cookie.errors.CookieError`.
+    """
+    if isinstance(error, CookieError):
+        return error
+    wrapped = CookieError(str(error) or type(error).__name__)
+    wrapped.__cause__ = error
+    return wrapped
+
+
+async def _aiter(iterable: Iterable[T]) -> AsyncIterator[T]:
+    for item in iterable:
+        yield item
+
+
+def _exclude_key(
+    keys: KeyPool | None, key: str | None, endpoint: str, response: httpx.Response
+) -> bool:
+    """Exclude a key that exceeded its quota or has no access to the guild of the endpoint.
+    Returns whether the request should be sent again with another key.
+    """
+    if keys is None or key is None:
+        return False
+    if response.status_code == 401:
+        try:
+            status = response.json()["detail"]["status"]
+        except (json.JSONDecodeError, KeyError, TypeError):
+            return False
+        if status == "quota_exceeded":
+            keys.retire(key)
+            return True
+    elif response.status_code == 403:
+        guild_id = guild_id_of(endpoint)
+        if guild_id is not None:
+            keys.deny(key, guild_id)
+            return True
+    return False
+
+
+def _deadline_timeout(timeout: httpx.Timeout) -> httpx.Timeout | UseClientDefault:
+    """Cap the timeouts of a request to the time left until the current deadline."""
+    remaining = remaining_time()
+    if remaining is None:
+        return httpx.USE_CLIENT_DEFAULT
+
+    def cap(value: float | None) -> float:
+        return remaining if value is None else min(value, remaining)
+
+    return httpx.Timeout(
+        connect=cap(timeout.connect),
+        read=cap(timeout.read),
+        write=cap(timeout.write),
+        pool=cap(timeout.pool),
+    )
+
+
+def _is_deadline_timeout(error: BaseException) -> bool:
+    remaining = remaining_time()
+    return isinstance(error, httpx.TimeoutException) and remaining is not None and remaining < 0.01
+
+
+@contextmanager
+def _open_target(fp: FileTarget) -> Iterator[BinaryIO]:
+    if isinstance(fp, (str, os.PathLike)):
+        with open(fp, "wb") as f:
+            yield f
+    else:
+        yield fp
+
+
 class AsyncCookieAPI:
     """A class to interact with the Cookie API.
 
     Parameters
     ----------
     api_key:
-        The API key to use. If no key is provided, ``COOKIE_KEY`` is loaded from the environment.
+        The API key to use, or a :class:`~cookie.KeyPool` to distribute requests over
+        several keys. If no key is provided, ``COOKIE_KEY`` is loaded from the environment.
     session:
         An existing aiohttp session to use.
+    cache:
+        A response cache to use. By default, responses are not cached.
+    coalesce:
+        Whether concurrent calls for the same endpoint share a single request.
+        Defaults to ``True``.
+    rate_limiter:
+        A rate limiter that is applied before each request.
+    quota:
+        A client-side quota budget. Requests are rejected when it is exhausted.
+    retry:
+        A retry policy for server errors and connection errors.
+        By default, requests are not retried.
+    circuit_breaker:
+        A circuit breaker that rejects requests while the API is failing.
+    config:
+        Connection pool, timeout and base URL settings.
+    lazy:
+        Whether to validate the fields of returned models on first access instead of
+        all at once. This is faster when only a few fields of each response are used.
+        Defaults to ``False``.
+    json_backend:
+        The library used to decode JSON responses, either ``"json"``, ``"orjson"`` or
+        ``"msgspec"``. The latter two need to be installed separately. Defaults to ``"json"``.
+    tracers:
+        Tracers that receive a :class:`~cookie.tracing.RequestEvent` for every call,
+        e.g. a :class:`~cookie.MetricsCollector`.
+    hedging:
+        A hedging policy that sends a second request when the first one is slower
+        than usual. By default, requests are not hedged.
+    shared_pool:
+        Whether to share one connection pool with all other clients that use the same
+        ``config`` in the same event loop, regardless of their API key. The pool is
+        closed when the last of these clients is closed. Can't be combined with
+        ``session``. Defaults to ``False``.
     """
 
-    def __init__(self, api_key: str | None = None, session: httpx.AsyncClient | None = None):
+    def __init__(
+        self,
+        api_key: str | KeyPool | None = None,
+        session: httpx.AsyncClient | None = None,
+        cache: ResponseCache | None = None,
+        coalesce: bool = True,
+        rate_limiter: RateLimiter | None = None,
+        quota: QuotaBudget | None = None,
+        retry: RetryPolicy | None = None,
+        circuit_breaker: CircuitBreaker | None = None,
+        config: ClientConfig | None = None,
+        lazy: bool = False,
+        json_backend: JSONBackend = "json",
+        tracers: Iterable[Tracer] = (),
+        hedging: HedgePolicy | None = None,
+        shared_pool: bool = False,
+    ):
+        if shared_pool and session is not None:
+            raise ValueError("shared_pool can't be used with an existing session.")
+
         self._session: httpx.AsyncClient | None = session
+        self._shared_pool = shared_pool
+        self._shared_key: tuple | None = None
+        self._cache = cache
+        self._inflight = AsyncSingleFlight() if coalesce else None
+        self._rate_limiter = rate_limiter
+        self.quota = quota
+        self._retry = retry
+        self._breaker = circuit_breaker
+        self._config = config or ClientConfig()
+        self._lazy = lazy
+        self._decode = get_decoder(json_backend)
+        self._tracers = list(tracers)
+        self._hedging = hedging
+        self._refreshing: set[str] = set()
+        self._background: set[asyncio.Future] = set()
+        self._prefetcher: PrefetchScheduler | None = None
 
         if api_key is None:
-            load_dotenv()
-            api_key = os.getenv("COOKIE_KEY")
-            if api_key is None:
-                raise InvalidAPIKey(
-                    "Please provide an API key or set the COOKIE_KEY environment variable."
-                )
+            api_key = _api_key_from_env()
 
-        self._header = {"key": api_key, "accept": "application/json"}
+        if isinstance(api_key, KeyPool):
+            self._keys: KeyPool | None = api_key
+            self._header = {"accept": "application/json"}
+        else:
+            self._keys = None
+            self._header = {"key": api_key, "accept": "application/json"}
 
     async def __aenter__(self):
         await self._setup()
@@ -69,15 +285,67 @@ class AsyncCookieAPI:
         await self.close()
 
     async def _setup(self):
-        if self._session is None:
-            self._session = httpx.AsyncClient()
+        if self._session is not None:
+            return
+
+        kwargs = self._config.client_kwargs()
+        if self._shared_pool:
+            self._shared_key = ("async", asyncio.get_running_loop(), self._config)
+            self._session = _shared_clients.acquire(
+                self._shared_key, lambda: httpx.AsyncClient(**kwargs)
+            )
+        else:
+            self._session = httpx.AsyncClient(**kwargs)
 
     async def close(self):
         """Close the aiohttp session. When using the async context manager,
         this is called automatically.
         """
 
-        await self._session.aclose()
+        for task in list(self._background):
+            task.cancel()
+        if not self._shared_pool:
+            if self._session is not None:
+                await self._session.aclose()
+        elif self._shared_key is not None:
+            session = _shared_clients.release(self._shared_key)
+            self._shared_key = None
+            self._session = None
+            if session is not None:
+                await session.aclose()
+
+    def _url(self, endpoint: str) -> str:
+        return (self._config.base_url or BASE_URL) + endpoint
+
+    def _acquire_key(self, endpoint: str) -> tuple[str | None, dict[str, str]]:
+        if self._keys is None:
+            return None, self._header
+        key = self._keys.acquire(endpoint)
+        return key, {**self._header, "key": key}
+
+    def _handle_error(self, response: httpx.Response) -> NoReturn:
+        try:
+            _handle_error(response)
+        except QuotaExceeded:
+            if self.quota is not None:
+                self.quota.exhaust()
+            raise
+
+    def _parse(self, model: type[M], data: dict) -> M:
+        if self._lazy:
+            return lazy_model(model, data)
+        return model(**data)
+
+    async def _get_model(self, endpoint: str, model: type[M]) -> M:
+        with trace_request(self._tracers, endpoint) as trace:
+            cached = await self._get_cached(endpoint)
+            start = time.perf_counter()
+            result = self._parse(model, cached.value)
+            result._fetched_at = cached.fetched_at
+            result._stale = cached.stale
+            if trace is not None:
+                trace.add_phase("validate", time.perf_counter() - start)
+            return result
 
     @overload
     async def _get(self, endpoint: str) -> dict: ...
@@ -86,15 +354,265 @@ class AsyncCookieAPI:
     async def _get(self, endpoint: str, stream: bool) -> bytes: ...
 
     async def _get(self, endpoint: str, stream: bool = False):
+        return (await self._get_cached(endpoint, stream)).value
+
+    async def _get_cached(self, endpoint: str, stream: bool = False) -> CachedValue:
+        with trace_request(self._tracers, endpoint) as trace:
+            if self._prefetcher is not None:
+                self._prefetcher.record_access(endpoint)
+            if self._cache is not None:
+                cached = self._cache.lookup(endpoint)
+                if cached is not None:
+                    if trace is not None:
+                        trace.cache = "stale" if cached.stale else "hit"
+                    if cached.stale:
+                        self._revalidate(endpoint, stream)
+                    return cached
+
+            data = await self._fetch(endpoint, stream)
+            return CachedValue(data, time.time(), False)
+
+    def _revalidate(self, endpoint: str, stream: bool):
+        if endpoint in self._refreshing:
+            return
+
+        self._refreshing.add(endpoint)
+        # Run the refresh in an empty context, so it isn't traced as part of the current call
+        task = contextvars.Context().run(asyncio.ensure_future, self._refresh(endpoint, stream))
+        self._background.add(task)
+        task.add_done_callback(self._background.discard)
+
+    async def _refresh(self, endpoint: str, stream: bool):
+        try:
+            with trace_request(self._tracers, endpoint):
+                await self._fetch(endpoint, stream)
+        except Exception:
+            # The stale response is still returned until it reaches its maximum age
+            pass
+        finally:
+            self._refreshing.discard(endpoint)
+
+    async def _fetch(self, endpoint: str, stream: bool):
+        trace = current_trace()
+        if self._inflight is None:
+            return await self._request(endpoint, stream)
+
+        if self._cache is not None and self._cache.subsume_windows:
+            wider = find_wider_window(endpoint, self._inflight.keys())
+            joined = self._inflight.join(wider) if wider else None
+            if joined is not None:
+                if trace is not None:
+                    trace.cache = "coalesced"
+                return slice_window(endpoint, await self._wait(joined))
+
+        if trace is not None and endpoint in self._inflight:
+            trace.cache = "coalesced"
+        return await self._wait(
+            self._inflight.do(endpoint, lambda: self._request_shared(endpoint, stream))
+        )
+
+    async def _request_shared(self, endpoint: str, stream: bool):
+        # The shared request runs in its own task, so this only drops the deadline of the
+        # caller that started it. Each caller applies its own deadline with _wait.
+        with _without_deadline():
+            return await self._request(endpoint, stream)
+
+    async def _wait(self, awaitable: Awaitable[T]) -> T:
+        # A shared request keeps running for the other callers when this caller gives up
+        remaining = check_deadline()
+        if remaining is None:
+            return await awaitable
+        try:
+            return await asyncio.wait_for(awaitable, remaining)
+        except asyncio.TimeoutError:
+            raise DeadlineExceeded() from None
+
+    async def _before_send(self) -> bool:
+        """Returns whether the request is the trial request of the circuit breaker."""
+        remaining = check_deadline()
+        if self._breaker is not None:
+            self._breaker.check()
+        if self._rate_limiter is not None:
+            if not await self._rate_limiter.acquire_async(remaining):
+                raise DeadlineExceeded(
+                    "The rate limit doesn't allow a request before the deadline."
+                )
+        # Charged after the rate limiter, so that rejected calls don't use the quota
+        if self.quota is not None:
+            self.quota.consume()
+        # Claimed last, so that a rejected request doesn't hold the trial
+        return self._breaker is not None and self._breaker.before_request()
+
+    def _release_trial(self, trial: bool):
+        # The trial request ended without a result, e.g. it was cancelled
+        if trial:
+            self._breaker.release_trial()
+
+    async def _prepare_send(self, endpoint: str) -> tuple[bool, str | None, dict[str, str]]:
+        # The key is acquired last, so that the usage of a KeyPool only counts sent requests
+        trial = await self._before_send()
+        try:
+            key, headers = self._acquire_key(endpoint)
+        except BaseException:
+            self._release_trial(trial)
+            raise
+        return trial, key, headers
+
+    def _record(self, response: httpx.Response | None):
+        if self._breaker is not None:
+            if response is None or response.status_code >= 500:
+                self._breaker.record_failure()
+            else:
+                self._breaker.record_success()
+
+    async def _send(self, endpoint: str) -> httpx.Response:
+        trial, key, headers = await self._prepare_send(endpoint)
+        trace = current_trace()
+        extensions = {} if trace is None else {"trace": trace.on_httpcore_event_async}
+        start = time.monotonic()
+        try:
+            response = await self._wait(
+                self._session.get(
+                    self._url(endpoint),
+                    headers=headers,
+                    timeout=_deadline_timeout(self._session.timeout),
+                    extensions=extensions,
+                )
+            )
+        except httpx.TransportError as e:
+            if not _is_deadline_timeout(e):
+                self._record(None)
+                raise
+            self._release_trial(trial)
+            raise DeadlineExceeded() from e
+        except BaseException:
+            self._release_trial(trial)
+            raise
+        finally:
+            if trace is not None:
+                trace.attempts += 1
+
+        self._record(response)
+        if self._hedging is not None and response.status_code == 200:
+            self._hedging.record(endpoint, time.monotonic() - start)
+        if trace is not None:
+            trace.status = response.status_code
+            trace.bytes = len(response.content)
+        if _exclude_key(self._keys, key, endpoint, response):
+            return await self._send(endpoint)
+        return response
+
+    async def _send_hedged(self, endpoint: str) -> httpx.Response:
+        delay = self._hedging.delay(endpoint) if self._hedging is not None else None
+        if delay is None:
+            return await self._send(endpoint)
+
+        first = asyncio.ensure_future(self._send(endpoint))
+        tasks = {first}
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=delay)
+            if not done:
+                self._hedging.hedged += 1
+                tasks.add(asyncio.ensure_future(self._send(endpoint)))
+
+            pending = tasks
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is not first:
+                            self._hedging.wins += 1
+                        return task.result()
+            # Both requests failed
+            return first.result()
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def _stream(self, endpoint: str, chunk_size: int) -> AsyncIterator[bytes]:
         await self._setup()
-        response = await self._session.get(BASE_URL + endpoint, headers=self._header)
-        if response.status_code != 200:
-            _handle_error(response)
+        # The trace is not made current, as the context may change between chunks
+        trace = RequestTrace(endpoint) if self._tracers else None
+        extensions = {} if trace is None else {"trace": trace.on_httpcore_event_async}
+        trial = False
+        try:
+            while True:
+                trial, key, headers = await self._prepare_send(endpoint)
+                async with self._session.stream(
+                    "GET",
+                    self._url(endpoint),
+                    headers=headers,
+                    timeout=_deadline_timeout(self._session.timeout),
+                    extensions=extensions,
+                ) as response:
+                    self._record(response)
+                    trial = False
+                    if trace is not None:
+                        trace.status = response.status_code
+                        trace.attempts += 1
+                    if response.status_code != 200:
+                        await response.aread()
+                        if _exclude_key(self._keys, key, endpoint, response):
+                            continue
+                        self._handle_error(response)
+
+                    async for chunk in response.aiter_bytes(chunk_size):
+                        if trace is not None:
+                            trace.bytes += len(chunk)
+                        yield chunk
+                    return
+        except BaseException as e:
+            deadline_exceeded = _is_deadline_timeout(e)
+            if isinstance(e, httpx.TransportError) and not deadline_exceeded:
+                self._record(None)
+            else:
+                self._release_trial(trial)
+            if trace is not None:
+                trace.error = "DeadlineExceeded" if deadline_exceeded else type(e).__name__
+            if deadline_exceeded:
+                raise DeadlineExceeded() from e
+            raise
+        finally:
+            if trace is not None:
+                trace.finish(self._tracers)
+
+    async def _request(self, endpoint: str, stream: bool):
+        await self._setup()
+        started = time.monotonic()
+        attempt = 0
+        while True:
+            attempt += 1
+            try:
+                response = await self._send_hedged(endpoint)
+            except Exception as e:
+                if self._retry is None:
+                    raise
+                delay = self._retry.next_delay(attempt, started, error=e)
+                if delay is None or not fits_deadline(delay):
+                    raise
+            else:
+                if response.status_code == 200:
+                    break
+                if self._retry is None:
+                    self._handle_error(response)
+                delay = self._retry.next_delay(attempt, started, response=response)
+                if delay is None or not fits_deadline(delay):
+                    self._handle_error(response)
+
+            await asyncio.sleep(delay)
 
         if stream:
-            return await response.aread()
+            data = await response.aread()
+        else:
+            start = time.perf_counter()
+            data = self._decode(response.content)
+            trace = current_trace()
+            if trace is not None:
+                trace.add_phase("decode", time.perf_counter() - start)
 
-        return response.json()
+        if self._cache is not None:
+            self._cache.set(endpoint, data, len(response.content))
+        return data
 
     async def get_guild_stats(self, guild_id: int, days: int = DEFAULT_DAYS) -> GuildStats:
         """Get the history of the guild member count for the provided number of days.
@@ -111,8 +629,7 @@ class AsyncCookieAPI:
         NoGuildAccess:
             You don't have access to that guild.
         """
-        data = await self._get(f"stats/guild/{guild_id}?days={days}")
-        return GuildStats(**data)
+        return await self._get_model(f"stats/guild/{guild_id}?days={days}", GuildStats)
 
     async def get_user_stats(self, user_id: int) -> UserStats:
         """Get the user's level stats.
@@ -127,8 +644,7 @@ class AsyncCookieAPI:
         NotFound:
             The user was not found.
         """
-        data = await self._get(f"stats/user/{user_id}")
-        return UserStats(**data)
+        return await self._get_model(f"stats/user/{user_id}", UserStats)
 
     async def get_member_stats(self, user_id: int, guild_id: int) -> MemberStats:
         """Get the member's level stats.
@@ -145,8 +661,7 @@ class AsyncCookieAPI:
         NotFound:
             The user was not found.
         """
-        data = await self._get(f"stats/member/{user_id}/{guild_id}")
-        return MemberStats(**data)
+        return await self._get_model(f"stats/member/{user_id}/{guild_id}", MemberStats)
 
     async def get_member_activity(
         self, user_id: int, guild_id: int, days: int = DEFAULT_DAYS
@@ -167,8 +682,9 @@ class AsyncCookieAPI:
         NotFound:
             The user was not found.
         """
-        data = await self._get(f"activity/member/{user_id}/{guild_id}?days={days}")
-        return MemberActivity(**data)
+        return await self._get_model(
+            f"activity/member/{user_id}/{guild_id}?days={days}", MemberActivity
+        )
 
     async def get_guild_activity(self, guild_id: int, days: int = DEFAULT_DAYS) -> GuildActivity:
         """Get the guild's activity for the provided number of days.
@@ -185,8 +701,7 @@ class AsyncCookieAPI:
         NoGuildAccess:
             You don't have access to that guild.
         """
-        data = await self._get(f"activity/guild/{guild_id}?days={days}")
-        return GuildActivity(**data)
+        return await self._get_model(f"activity/guild/{guild_id}?days={days}", GuildActivity)
 
     async def get_guild_image(self, guild_id: int, days: int = DEFAULT_DAYS) -> bytes:
         """Get the guild's activity image for the provided number of days.
@@ -228,6 +743,489 @@ class AsyncCookieAPI:
             f"activity/member/{user_id}/{guild_id}/image?days={days}", stream=True
         )
 
+    def stream_guild_image(
+        self, guild_id: int, days: int = DEFAULT_DAYS, chunk_size: int = DEFAULT_CHUNK_SIZE
+    ) -> AsyncIterator[bytes]:
+        """Stream the guild's activity image in chunks, without loading it into memory.
+
+        .. code-block:: python
+
+            async for chunk in api.stream_guild_image(guild_id):
+                ...
+
+        Parameters
+        ----------
+        guild_id:
+            The guild's ID.
+        days:
+            The number of days. Defaults to ``14``.
+        chunk_size:
+            The maximum size of each chunk in bytes. Defaults to ``65536``.
+
+        Raises
+        ------
+        NoGuildAccess:
+            You don't have access to that guild.
+        """
+        return self._stream(f"activity/guild/{guild_id}/image?days={days}", chunk_size)
+
+    def stream_member_image(
+        self,
+        user_id: int,
+        guild_id: int,
+        days: int = DEFAULT_DAYS,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ) -> AsyncIterator[bytes]:
+        """Stream the member's activity image in chunks, without loading it into memory.
+
+        Parameters
+        ----------
+        user_id:
+            The user's ID.
+        guild_id:
+            The guild's ID.
+        days:
+            The number of days. Defaults to ``14``.
+        chunk_size:
+            The maximum size of each chunk in bytes. Defaults to ``65536``.
+
+        Raises
+        ------
+        NotFound:
+            The user was not found.
+        """
+        return self._stream(f"activity/member/{user_id}/{guild_id}/image?days={days}", chunk_size)
+
+    async def _save(self, chunks: AsyncIterator[bytes], fp: FileTarget) -> int:
+        written = 0
+        with _open_target(fp) as f:
+            async for chunk in chunks:
+                written += f.write(chunk)
+        return written
+
+    async def save_guild_image(
+        self, guild_id: int, fp: FileTarget, days: int = DEFAULT_DAYS
+    ) -> int:
+        """Stream the guild's activity image into a file.
+
+        Parameters
+        ----------
+        guild_id:
+            The guild's ID.
+        fp:
+            A file path or a binary file-like object, e.g. :class:`io.BytesIO`.
+        days:
+            The number of days. Defaults to ``14``.
+
+        Returns
+        -------
+        int
+            The number of bytes written.
+
+        Raises
+        ------
+        NoGuildAccess:
+            You don't have access to that guild.
+        """
+        return await self._save(self.stream_guild_image(guild_id, days), fp)
+
+    async def save_member_image(
+        self, user_id: int, guild_id: int, fp: FileTarget, days: int = DEFAULT_DAYS
+    ) -> int:
+        """Stream the member's activity image into a file.
+
+        Parameters
+        ----------
+        user_id:
+            The user's ID.
+        guild_id:
+            The guild's ID.
+        fp:
+            A file path or a binary file-like object, e.g. :class:`io.BytesIO`.
+        days:
+            The number of days. Defaults to ``14``.
+
+        Returns
+        -------
+        int
+            The number of bytes written.
+
+        Raises
+        ------
+        NotFound:
+            The user was not found.
+        """
+        return await self._save(self.stream_member_image(user_id, guild_id, days), fp)
+
+    async def _run_many(
+        self,
+        func: Callable[..., Awaitable[T]],
+        arguments: Iterable[tuple],
+        concurrency: int,
+    ) -> list[T | CookieError]:
+        if concurrency < 1:
+            raise ValueError("concurrency must be at least 1.")
+
+        await self._setup()
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def run(args: tuple) -> T | CookieError:
+            async with semaphore:
+                try:
+                    return await func(*args)
+                except (CookieError, httpx.TransportError) as e:
+                    return _batch_error(e)
+
+        tasks = [asyncio.ensure_future(run(args)) for args in arguments]
+        try:
+            return list(await asyncio.gather(*tasks))
+        finally:
+            # gather() doesn't cancel the other calls when one of them raises
+            for task in tasks:
+                task.cancel()
+
+    async def get_many_user_stats(
+        self, user_ids: Iterable[int], concurrency: int = DEFAULT_CONCURRENCY
+    ) -> list[UserStats | CookieError]:
+        """Get the level stats of many users, with at most ``concurrency`` requests in flight.
+
+        Results are returned in the same order as ``user_ids``. If a request fails,
+        the raised :class:`~cookie.errors.CookieError` is returned in its place
+        instead of aborting the whole batch.
+
+        Parameters
+        ----------
+        user_ids:
+            The user IDs.
+        concurrency:
+            The maximum number of concurrent requests. Defaults to ``10``.
+        """
+        return await self._run_many(
+            self.get_user_stats, ((user_id,) for user_id in user_ids), concurrency
+        )
+
+    async def get_many_member_stats(
+        self, pairs: Iterable[tuple[int, int]], concurrency: int = DEFAULT_CONCURRENCY
+    ) -> list[MemberStats | CookieError]:
+        """Get the level stats of many members, with at most ``concurrency`` requests in flight.
+
+        Results are returned in the same order as ``pairs``. If a request fails,
+        the raised :class:`~cookie.errors.CookieError` (e.g. :class:`~cookie.errors.NotFound`)
+        is returned in its place instead of aborting the whole batch.
+
+        Parameters
+        ----------
+        pairs:
+            ``(user_id, guild_id)`` tuples.
+        concurrency:
+            The maximum number of concurrent requests. Defaults to ``10``.
+        """
+        return await self._run_many(self.get_member_stats, pairs, concurrency)
+
+    async def get_many_member_activity(
+        self,
+        pairs: Iterable[tuple[int, int]],
+        days: int = DEFAULT_DAYS,
+        concurrency: int = DEFAULT_CONCURRENCY,
+    ) -> list[MemberActivity | CookieError]:
+        """Get the activity of many members, with at most ``concurrency`` requests in flight.
+
+        Results are returned in the same order as ``pairs``. If a request fails,
+        the raised :class:`~cookie.errors.CookieError` (e.g. :class:`~cookie.errors.NotFound`)
+        is returned in its place instead of aborting the whole batch.
+
+        Parameters
+        ----------
+        pairs:
+            ``(user_id, guild_id)`` tuples.
+        days:
+            The number of days. Defaults to ``14``.
+        concurrency:
+            The maximum number of concurrent requests. Defaults to ``10``.
+        """
+        return await self._run_many(
+            self.get_member_activity,
+            ((user_id, guild_id, days) for user_id, guild_id in pairs),
+            concurrency,
+        )
+
+    async def _iter_many(
+        self,
+        func: Callable[..., Awaitable[T]],
+        keys: Iterable[K] | AsyncIterable[K],
+        arguments: Callable[[K], tuple],
+        concurrency: int,
+    ) -> AsyncIterator[tuple[K, T | CookieError]]:
+        if concurrency < 1:
+            raise ValueError("concurrency must be at least 1.")
+
+        await self._setup()
+        if isinstance(keys, AsyncIterable):
+            iterator = keys.__aiter__()
+        else:
+            iterator = _aiter(keys)
+
+        async def run(key: K) -> tuple[K, T | CookieError]:
+            try:
+                return key, await func(*arguments(key))
+            except (CookieError, httpx.TransportError) as e:
+                return key, _batch_error(e)
+
+        pending: set[asyncio.Future] = set()
+        exhausted = False
+        try:
+            while True:
+                # Only pull new keys while there is room, so a slow consumer stops the input
+                while not exhausted and len(pending) < concurrency:
+                    try:
+                        key = await iterator.__anext__()
+                    except StopAsyncIteration:
+                        exhausted = True
+                    else:
+                        pending.add(asyncio.ensure_future(run(key)))
+                if not pending:
+                    return
+
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    yield task.result()
+        finally:
+            for task in pending:
+                task.cancel()
+
+    def iter_user_stats(
+        self,
+        user_ids: Iterable[int] | AsyncIterable[int],
+        concurrency: int = DEFAULT_CONCURRENCY,
+    ) -> AsyncIterator[tuple[int, UserStats | CookieError]]:
+        """Get the level stats of many users and yield them as they complete.
+
+        At most ``concurrency`` requests are in flight. New user IDs are only taken from
+        ``user_ids`` when a result was consumed, so a slow consumer doesn't build up a backlog.
+        If a request fails, the raised :class:`~cookie.errors.CookieError` is yielded
+        in its place.
+
+        .. code-block:: python
+
+            async for user_id, stats in api.iter_user_stats(user_ids):
+                ...
+
+        Parameters
+        ----------
+        user_ids:
+            The user IDs, as an iterable or async iterable.
+        concurrency:
+            The maximum number of concurrent requests. Defaults to ``10``.
+
+        Yields
+        ------
+        tuple[int, UserStats | CookieError]
+            The user ID and its stats, in the order of completion.
+        """
+        return self._iter_many(
+            self.get_user_stats, user_ids, lambda user_id: (user_id,), concurrency
+        )
+
+    def iter_member_stats(
+        self,
+        guild_id: int,
+        user_ids: Iterable[int] | AsyncIterable[int],
+        concurrency: int = DEFAULT_CONCURRENCY,
+    ) -> AsyncIterator[tuple[int, MemberStats | CookieError]]:
+        """Get the level stats of many members of a guild and yield them as they complete.
+
+        At most ``concurrency`` requests are in flight. New user IDs are only taken from
+        ``user_ids`` when a result was consumed, so a slow consumer doesn't build up a backlog.
+        If a request fails, the raised :class:`~cookie.errors.CookieError`
+        (e.g. :class:`~cookie.errors.NotFound`) is yielded in its place.
+
+        .. code-block:: python
+
+            async for user_id, stats in api.iter_member_stats(guild_id, user_ids):
+                ...
+
+        Parameters
+        ----------
+        guild_id:
+            The guild's ID.
+        user_ids:
+            The user IDs, as an iterable or async iterable.
+        concurrency:
+            The maximum number of concurrent requests. Defaults to ``10``.
+
+        Yields
+        ------
+        tuple[int, MemberStats | CookieError]
+            The user ID and the member's stats, in the order of completion.
+        """
+        return self._iter_many(
+            self.get_member_stats, user_ids, lambda user_id: (user_id, guild_id), concurrency
+        )
+
+    def iter_member_activity(
+        self,
+        guild_id: int,
+        user_ids: Iterable[int] | AsyncIterable[int],
+        days: int = DEFAULT_DAYS,
+        concurrency: int = DEFAULT_CONCURRENCY,
+    ) -> AsyncIterator[tuple[int, MemberActivity | CookieError]]:
+        """Get the activity of many members of a guild and yield it as it completes.
+
+        Works like :meth:`iter_member_stats`.
+
+        Parameters
+        ----------
+        guild_id:
+            The guild's ID.
+        user_ids:
+            The user IDs, as an iterable or async iterable.
+        days:
+            The number of days. Defaults to ``14``.
+        concurrency:
+            The maximum number of concurrent requests. Defaults to ``10``.
+
+        Yields
+        ------
+        tuple[int, MemberActivity | CookieError]
+            The user ID and the member's activity, in the order of completion.
+        """
+        return self._iter_many(
+            self.get_member_activity,
+            user_ids,
+            lambda user_id: (user_id, guild_id, days),
+            concurrency,
+        )
+
+    async def _get_member_stats_data(self, user_id: int, guild_id: int) -> dict:
+        with trace_request(self._tracers, f"stats/member/{user_id}/{guild_id}"):
+            return await self._get(f"stats/member/{user_id}/{guild_id}")
+
+    async def get_member_stats_table(
+        self,
+        guild_id: int,
+        user_ids: Iterable[int] | AsyncIterable[int],
+        concurrency: int = DEFAULT_CONCURRENCY,
+    ) -> MemberStatsTable:
+        """Get the level stats of many members of a guild as a :class:`~cookie.MemberStatsTable`.
+
+        The responses are added to the table directly, without creating model instances.
+        Members that could not be fetched are collected in :attr:`MemberStatsTable.errors`.
+
+        Parameters
+        ----------
+        guild_id:
+            The guild's ID.
+        user_ids:
+            The user IDs, as an iterable or async iterable.
+        concurrency:
+            The maximum number of concurrent requests. Defaults to ``10``.
+        """
+        table = MemberStatsTable()
+        async for user_id, data in self._iter_many(
+            self._get_member_stats_data,
+            user_ids,
+            lambda user_id: (user_id, guild_id),
+            concurrency,
+        ):
+            table.append(user_id, data)
+        return table
+
+    async def _export_images(
+        self, jobs: dict[K, tuple[str, str]], directory: str | os.PathLike, concurrency: int
+    ) -> dict[K, ImageManifestEntry | CookieError]:
+        exporter = ImageExporter(directory)
+
+        async def export(path: str, endpoint: str) -> ImageManifestEntry:
+            writer = exporter.writer(path)
+            try:
+                async for chunk in self._stream(endpoint, DEFAULT_CHUNK_SIZE):
+                    writer.write(chunk)
+            except BaseException:
+                writer.abort()
+                raise
+            return writer.commit()
+
+        try:
+            results = await self._run_many(export, jobs.values(), concurrency)
+        finally:
+            exporter.save()
+        return dict(zip(jobs, results))
+
+    async def export_guild_images(
+        self,
+        guild_ids: Iterable[int],
+        directory: str | os.PathLike,
+        days: int = DEFAULT_DAYS,
+        concurrency: int = DEFAULT_CONCURRENCY,
+    ) -> dict[int, ImageManifestEntry | CookieError]:
+        """Download the activity images of many guilds into a directory.
+
+        Images are streamed with at most ``concurrency`` requests in flight and written
+        atomically as ``guild_<guild_id>.png``. Images whose SHA-256 hash is unchanged since
+        the previous export are not written again. The manifest is saved as
+        ``manifest.json`` in the directory.
+
+        Parameters
+        ----------
+        guild_ids:
+            The guild IDs.
+        directory:
+            The target directory. It is created if it doesn't exist.
+        days:
+            The number of days. Defaults to ``14``.
+        concurrency:
+            The maximum number of concurrent requests. Defaults to ``10``.
+
+        Returns
+        -------
+        dict[int, ImageManifestEntry | CookieError]
+            The manifest entry of each guild, or the raised
+            :class:`~cookie.errors.CookieError` if the image could not be fetched.
+        """
+        jobs = {
+            guild_id: (f"guild_{guild_id}.png", f"activity/guild/{guild_id}/image?days={days}")
+            for guild_id in guild_ids
+        }
+        return await self._export_images(jobs, directory, concurrency)
+
+    async def export_member_images(
+        self,
+        pairs: Iterable[tuple[int, int]],
+        directory: str | os.PathLike,
+        days: int = DEFAULT_DAYS,
+        concurrency: int = DEFAULT_CONCURRENCY,
+    ) -> dict[tuple[int, int], ImageManifestEntry | CookieError]:
+        """Download the activity images of many members into a directory.
+
+        Works like :meth:`export_guild_images`. The images are written as
+        ``member_<user_id>_<guild_id>.png``.
+
+        Parameters
+        ----------
+        pairs:
+            ``(user_id, guild_id)`` tuples.
+        directory:
+            The target directory. It is created if it doesn't exist.
+        days:
+            The number of days. Defaults to ``14``.
+        concurrency:
+            The maximum number of concurrent requests. Defaults to ``10``.
+
+        Returns
+        -------
+        dict[tuple[int, int], ImageManifestEntry | CookieError]
+            The manifest entry of each pair, or the raised
+            :class:`~cookie.errors.CookieError` if the image could not be fetched.
+        """
+        jobs = {
+            (user_id, guild_id): (
+                f"member_{user_id}_{guild_id}.png",
+                f"activity/member/{user_id}/{guild_id}/image?days={days}",
+            )
+            for user_id, guild_id in pairs
+        }
+        return await self._export_images(jobs, directory, concurrency)
+
 
 class CookieAPI:
     """A class to interact with the Cookie API.
@@ -235,25 +1233,161 @@ class CookieAPI:
     Parameters
     ----------
     api_key:
-        The API key to use. If no key is provided, ``COOKIE_KEY`` is loaded from the environment.
+        The API key to use, or a :class:`~cookie.KeyPool` to distribute requests over
+        several keys. If no key is provided, ``COOKIE_KEY`` is loaded from the environment.
     httpx_client:
         An existing httpx client to use.
+    cache:
+        A response cache to use. By default, responses are not cached.
+    coalesce:
+        Whether concurrent calls for the same endpoint share a single request.
+        Defaults to ``True``.
+    rate_limiter:
+        A rate limiter that is applied before each request.
+    quota:
+        A client-side quota budget. Requests are rejected when it is exhausted.
+    retry:
+        A retry policy for server errors and connection errors.
+        By default, requests are not retried.
+    circuit_breaker:
+        A circuit breaker that rejects requests while the API is failing.
+    config:
+        Connection pool, timeout and base URL settings.
+    lazy:
+        Whether to validate the fields of returned models on first access instead of
+        all at once. This is faster when only a few fields of each response are used.
+        Defaults to ``False``.
+    json_backend:
+        The library used to decode JSON responses, either ``"json"``, ``"orjson"`` or
+        ``"msgspec"``. The latter two need to be installed separately. Defaults to ``"json"``.
+    tracers:
+        Tracers that receive a :class:`~cookie.tracing.RequestEvent` for every call,
+        e.g. a :class:`~cookie.MetricsCollector`.
+    hedging:
+        A hedging policy that sends a second request when the first one is slower
+        than usual. By default, requests are not hedged.
+    shared_pool:
+        Whether to share one connection pool with all other clients that use the same
+        ``config``, regardless of their API key. The pool is closed when the
+        last of these clients is closed. Can't be combined with ``httpx_client``.
+        Defaults to ``False``.
     """
 
-    def __init__(self, api_key: str | None = None, httpx_client: httpx.Client | None = None):
-        self._httpx_client: httpx.Client | None = httpx_client
+    def __init__(
+        self,
+        api_key: str | KeyPool | None = None,
+        httpx_client: httpx.Client | None = None,
+        cache: ResponseCache | None = None,
+        coalesce: bool = True,
+        rate_limiter: RateLimiter | None = None,
+        quota: QuotaBudget | None = None,
+        retry: RetryPolicy | None = None,
+        circuit_breaker: CircuitBreaker | None = None,
+        config: ClientConfig | None = None,
+        lazy: bool = False,
+        json_backend: JSONBackend = "json",
+        tracers: Iterable[Tracer] = (),
+        hedging: HedgePolicy | None = None,
+        shared_pool: bool = False,
+    ):
+        if shared_pool and httpx_client is not None:
+            raise ValueError("shared_pool can't be used with an existing httpx client.")
+
+        self._httpx_client = httpx_client
+        self._shared_pool = shared_pool
+        self._shared_key: tuple | None = None
+        self._cache = cache
+        self._inflight = SingleFlight(local_errors=(DeadlineExceeded,)) if coalesce else None
+        self._rate_limiter = rate_limiter
+        self.quota = quota
+        self._retry = retry
+        self._breaker = circuit_breaker
+        self._config = config or ClientConfig()
+        self._lazy = lazy
+        self._decode = get_decoder(json_backend)
+        self._tracers = list(tracers)
+        self._hedging = hedging
+        self._refreshing: set[str] = set()
+        self._refresh_lock = threading.Lock()
+        self._refresher: ThreadPoolExecutor | None = None
+        self._hedger: ThreadPoolExecutor | None = None
 
-        if httpx_client is None:
-            self._httpx_client = httpx.Client()
         if api_key is None:
-            load_dotenv()
-            api_key = os.getenv("COOKIE_KEY")
-            if api_key is None:
-                raise InvalidAPIKey(
-                    "Please provide an API key or set the COOKIE_KEY environment variable."
+            api_key = _api_key_from_env()
+
+        if isinstance(api_key, KeyPool):
+            self._keys: KeyPool | None = api_key
+            self._header = {"accept": "application/json"}
+        else:
+            self._keys = None
+            self._header = {"key": api_key, "accept": "application/json"}
+
+        if self._httpx_client is None:
+            kwargs = self._config.client_kwargs()
+            if shared_pool:
+                # httpx.Client is thread-safe, so it is shared across threads
+                self._shared_key = ("sync", self._config)
+                self._httpx_client = _shared_clients.acquire(
+                    self._shared_key, lambda: httpx.Client(**kwargs)
                 )
+            else:
+                self._httpx_client = httpx.Client(**kwargs)
+
+    def __enter__(self):
+        return self
 
-        self._header = {"key": api_key, "accept": "application/json"}
+    def __exit__(self, *args):
+        self.close()
+
+    def close(self):
+        """Close the httpx client. When using the context manager,
+        this is called automatically.
+        """
+
+        if self._refresher is not None:
+            self._refresher.shutdown(wait=False, cancel_futures=True)
+        if self._hedger is not None:
+            self._hedger.shutdown(wait=False)
+        if not self._shared_pool:
+            self._httpx_client.close()
+        elif self._shared_key is not None:
+            client = _shared_clients.release(self._shared_key)
+            self._shared_key = None
+            if client is not None:
+                client.close()
+
+    def _url(self, endpoint: str) -> str:
+        return (self._config.base_url or BASE_URL) + endpoint
+
+    def _acquire_key(self, endpoint: str) -> tuple[str | None, dict[str, str]]:
+        if self._keys is None:
+            return None, self._header
+        key = self._keys.acquire(endpoint)
+        return key, {**self._header, "key": key}
+
+    def _handle_error(self, response: httpx.Response) -> NoReturn:
+        try:
+            _handle_error(response)
+        except QuotaExceeded:
+            if self.quota is not None:
+                self.quota.exhaust()
+            raise
+
+    def _parse(self, model: type[M], data: dict) -> M:
+        if self._lazy:
+            return lazy_model(model, data)
+        return model(**data)
+
+    def _get_model(self, endpoint: str, model: type[M]) -> M:
+        with trace_request(self._tracers, endpoint) as trace:
+            cached = self._get_cached(endpoint)
+            start = time.perf_counter()
+            result = self._parse(model, cached.value)
+            result._fetched_at = cached.fetched_at
+            result._stale = cached.stale
+            if trace is not None:
+                trace.add_phase("validate", time.perf_counter() - start)
+            return result
 
     @overload
     def _get(self, endpoint: str) -> dict: ...
@@ -262,14 +1396,268 @@ class CookieAPI:
     def _get(self, endpoint: str, stream: bool) -> bytes: ...
 
     def _get(self, endpoint: str, stream: bool = False):
-        response = self._httpx_client.get(BASE_URL + endpoint, headers=self._header)
-        if response.status_code != 200:
-            _handle_error(response)
+        return self._get_cached(endpoint, stream).value
+
+    def _get_cached(self, endpoint: str, stream: bool = False) -> CachedValue:
+        with trace_request(self._tracers, endpoint) as trace:
+            if self._cache is not None:
+                cached = self._cache.lookup(endpoint)
+                if cached is not None:
+                    if trace is not None:
+                        trace.cache = "stale" if cached.stale else "hit"
+                    if cached.stale:
+                        self._revalidate(endpoint, stream)
+                    return cached
+
+            data = self._fetch(endpoint, stream)
+            return CachedValue(data, time.time(), False)
+
+    def _revalidate(self, endpoint: str, stream: bool):
+        with self._refresh_lock:
+            if endpoint in self._refreshing:
+                return
+            self._refreshing.add(endpoint)
+            if self._refresher is None:
+                self._refresher = ThreadPoolExecutor(
+                    max_workers=DEFAULT_REFRESH_WORKERS, thread_name_prefix="cookie-refresh"
+                )
+        self._refresher.submit(self._refresh, endpoint, stream)
+
+    def _refresh(self, endpoint: str, stream: bool):
+        try:
+            with trace_request(self._tracers, endpoint):
+                self._fetch(endpoint, stream)
+        except Exception:
+            # The stale response is still returned until it reaches its maximum age
+            pass
+        finally:
+            with self._refresh_lock:
+                self._refreshing.discard(endpoint)
+
+    def _fetch(self, endpoint: str, stream: bool):
+        trace = current_trace()
+        if self._inflight is None:
+            return self._request(endpoint, stream)
+
+        if self._cache is not None and self._cache.subsume_windows:
+            wider = find_wider_window(endpoint, self._inflight.keys())
+            joined = self._inflight.join(wider) if wider else None
+            if joined is not None:
+                if trace is not None:
+                    trace.cache = "coalesced"
+                try:
+                    return slice_window(endpoint, joined.result(check_deadline()))
+                except FutureTimeoutError:
+                    raise DeadlineExceeded() from None
+                except CallAbandoned:
+                    # The deadline of the thread that requested the wider window passed
+                    pass
+
+        if trace is not None and endpoint in self._inflight:
+            trace.cache = "coalesced"
+        try:
+            # A shared request that exceeds the deadline of the calling thread is made
+            # again by one of the waiting threads, with its own deadline
+            return self._inflight.do(
+                endpoint, lambda: self._request(endpoint, stream), check_deadline()
+            )
+        except FutureTimeoutError:
+            # The shared request keeps running for the other callers
+            raise DeadlineExceeded() from None
+
+    def _before_send(self) -> bool:
+        """Returns whether the request is the trial request of the circuit breaker."""
+        remaining = check_deadline()
+        if self._breaker is not None:
+            self._breaker.check()
+        if self._rate_limiter is not None:
+            if not self._rate_limiter.acquire(remaining):
+                raise DeadlineExceeded(
+                    "The rate limit doesn't allow a request before the deadline."
+                )
+        # Charged after the rate limiter, so that rejected calls don't use the quota
+        if self.quota is not None:
+            self.quota.consume()
+        # Claimed last, so that a rejected request doesn't hold the trial
+        return self._breaker is not None and self._breaker.before_request()
+
+    def _release_trial(self, trial: bool):
+        # The trial request ended without a result, e.g. it was cancelled
+        if trial:
+            self._breaker.release_trial()
+
+    def _prepare_send(self, endpoint: str) -> tuple[bool, str | None, dict[str, str]]:
+        # The key is acquired last, so that the usage of a KeyPool only counts sent requests
+        trial = self._before_send()
+        try:
+            key, headers = self._acquire_key(endpoint)
+        except BaseException:
+            self._release_trial(trial)
+            raise
+        return trial, key, headers
+
+    def _record(self, response: httpx.Response | None):
+        if self._breaker is not None:
+            if response is None or response.status_code >= 500:
+                self._breaker.record_failure()
+            else:
+                self._breaker.record_success()
+
+    def _send(self, endpoint: str) -> httpx.Response:
+        trial, key, headers = self._prepare_send(endpoint)
+        trace = current_trace()
+        extensions = {} if trace is None else {"trace": trace.on_httpcore_event}
+        start = time.monotonic()
+        try:
+            response = self._httpx_client.get(
+                self._url(endpoint),
+                headers=headers,
+                timeout=_deadline_timeout(self._httpx_client.timeout),
+                extensions=extensions,
+            )
+        except httpx.TransportError as e:
+            if not _is_deadline_timeout(e):
+                self._record(None)
+                raise
+            self._release_trial(trial)
+            raise DeadlineExceeded() from e
+        except BaseException:
+            self._release_trial(trial)
+            raise
+        finally:
+            if trace is not None:
+                trace.attempts += 1
+
+        self._record(response)
+        if self._hedging is not None and response.status_code == 200:
+            self._hedging.record(endpoint, time.monotonic() - start)
+        if trace is not None:
+            trace.status = response.status_code
+            trace.bytes = len(response.content)
+        if _exclude_key(self._keys, key, endpoint, response):
+            return self._send(endpoint)
+        return response
+
+    def _send_hedged(self, endpoint: str) -> httpx.Response:
+        delay = self._hedging.delay(endpoint) if self._hedging is not None else None
+        if delay is None:
+            return self._send(endpoint)
+
+        if self._hedger is None:
+            # Threads are only started when needed. Two per connection are enough for a
+            # request and its hedge on every connection, so requests don't queue for a thread.
+            connections = self._config.max_connections
+            self._hedger = ThreadPoolExecutor(
+                max_workers=2 * connections if connections else DEFAULT_HEDGE_WORKERS,
+                thread_name_prefix="cookie-hedge",
+            )
+        started = threading.Event()
+
+        def send_first() -> httpx.Response:
+            started.set()
+            return self._send(endpoint)
+
+        # Both requests run in the pool, so that the first one can be waited for with a timeout
+        first = self._hedger.submit(contextvars.copy_context().run, send_first)
+        futures = {first}
+        # The delay counts from when the request is sent, not while it waits for a thread
+        started.wait()
+        done, _ = wait_futures(futures, timeout=delay)
+        if not done:
+            self._hedging.hedged += 1
+            futures.add(self._hedger.submit(contextvars.copy_context().run, self._send, endpoint))
+
+        for future in as_completed(futures):
+            if future.exception() is None:
+                if future is not first:
+                    self._hedging.wins += 1
+                # The slower request can't be interrupted and its response is discarded
+                return future.result()
+        # Both requests failed
+        return first.result()
+
+    def _stream(self, endpoint: str, chunk_size: int) -> Iterator[bytes]:
+        # The trace is not made current, as the context may change between chunks
+        trace = RequestTrace(endpoint) if self._tracers else None
+        extensions = {} if trace is None else {"trace": trace.on_httpcore_event}
+        trial = False
+        try:
+            while True:
+                trial, key, headers = self._prepare_send(endpoint)
+                with self._httpx_client.stream(
+                    "GET",
+                    self._url(endpoint),
+                    headers=headers,
+                    timeout=_deadline_timeout(self._httpx_client.timeout),
+                    extensions=extensions,
+                ) as response:
+                    self._record(response)
+                    trial = False
+                    if trace is not None:
+                        trace.status = response.status_code
+                        trace.attempts += 1
+                    if response.status_code != 200:
+                        response.read()
+                        if _exclude_key(self._keys, key, endpoint, response):
+                            continue
+                        self._handle_error(response)
+
+                    for chunk in response.iter_bytes(chunk_size):
+                        if trace is not None:
+                            trace.bytes += len(chunk)
+                        yield chunk
+                    return
+        except BaseException as e:
+            deadline_exceeded = _is_deadline_timeout(e)
+            if isinstance(e, httpx.TransportError) and not deadline_exceeded:
+                self._record(None)
+            else:
+                self._release_trial(trial)
+            if trace is not None:
+                trace.error = "DeadlineExceeded" if deadline_exceeded else type(e).__name__
+            if deadline_exceeded:
+                raise DeadlineExceeded() from e
+            raise
+        finally:
+            if trace is not None:
+                trace.finish(self._tracers)
+
+    def _request(self, endpoint: str, stream: bool):
+        started = time.monotonic()
+        attempt = 0
+        while True:
+            attempt += 1
+            try:
+                response = self._send_hedged(endpoint)
+            except Exception as e:
+                if self._retry is None:
+                    raise
+                delay = self._retry.next_delay(attempt, started, error=e)
+                if delay is None or not fits_deadline(delay):
+                    raise
+            else:
+                if response.status_code == 200:
+                    break
+                if self._retry is None:
+                    self._handle_error(response)
+                delay = self._retry.next_delay(attempt, started, response=response)
+                if delay is None or not fits_deadline(delay):
+                    self._handle_error(response)
+
+            time.sleep(delay)
 
         if stream:
-            return response.read()
+            data = response.read()
+        else:
+            start = time.perf_counter()
+            data = self._decode(response.content)
+            trace = current_trace()
+            if trace is not None:
+                trace.add_phase("decode", time.perf_counter() - start)
 
-        return response.json()
+        if self._cache is not None:
+            self._cache.set(endpoint, data, len(response.content))
+        return data
 
     def get_guild_stats(self, guild_id: int, days: int = DEFAULT_DAYS) -> GuildStats:
         """Get the history of the guild member count for the provided number of days.
@@ -286,8 +1674,7 @@ class CookieAPI:
         NoGuildAccess:
             You don't have access to that guild.
         """
-        data = self._get(f"stats/guild/{guild_id}?days={days}")
-        return GuildStats(**data)
+        return self._get_model(f"stats/guild/{guild_id}?days={days}", GuildStats)
 
     def get_user_stats(self, user_id: int) -> UserStats:
         """Get the user's level stats.
@@ -302,8 +1689,7 @@ class CookieAPI:
         NotFound:
             The user was not found.
         """
-        data = self._get(f"stats/user/{user_id}")
-        return UserStats(**data)
+        return self._get_model(f"stats/user/{user_id}", UserStats)
 
     def get_member_stats(self, user_id: int, guild_id: int) -> MemberStats:
         """Get the member's level stats.
@@ -320,8 +1706,7 @@ class CookieAPI:
         NotFound:
             The user was not found.
         """
-        data = self._get(f"stats/member/{user_id}/{guild_id}")
-        return MemberStats(**data)
+        return self._get_model(f"stats/member/{user_id}/{guild_id}", MemberStats)
 
     def get_member_activity(
         self, user_id: int, guild_id: int, days: int = DEFAULT_DAYS
@@ -342,8 +1727,7 @@ class CookieAPI:
         NotFound:
             The user was not found.
         """
-        data = self._get(f"activity/member/{user_id}/{guild_id}?days={days}")
-        return MemberActivity(**data)
+        return self._get_model(f"activity/member/{user_id}/{guild_id}?days={days}", MemberActivity)
 
     def get_guild_activity(self, guild_id: int, days: int = DEFAULT_DAYS) -> GuildActivity:
         """Get the guild's activity for the provided number of days.
@@ -360,8 +1744,7 @@ class CookieAPI:
         NoGuildAccess:
             You don't have access to that guild.
         """
-        data = self._get(f"activity/guild/{guild_id}?days={days}")
-        return GuildActivity(**data)
+        return self._get_model(f"activity/guild/{guild_id}?days={days}", GuildActivity)
 
     def get_guild_image(self, guild_id: int, days: int = DEFAULT_DAYS) -> bytes:
         """Get the guild's activity image for the provided number of days.
@@ -398,3 +1781,385 @@ class CookieAPI:
             The user was not found.
         """
         return self._get(f"activity/member/{user_id}/{guild_id}/image?days={days}", stream=True)
+
+    def stream_guild_image(
+        self, guild_id: int, days: int = DEFAULT_DAYS, chunk_size: int = DEFAULT_CHUNK_SIZE
+    ) -> Iterator[bytes]:
+        """Stream the guild's activity image in chunks, without loading it into memory.
+
+        Parameters
+        ----------
+        guild_id:
+            The guild's ID.
+        days:
+            The number of days. Defaults to ``14``.
+        chunk_size:
+            The maximum size of each chunk in bytes. Defaults to ``65536``.
+
+        Raises
+        ------
+        NoGuildAccess:
+            You don't have access to that guild.
+        """
+        return self._stream(f"activity/guild/{guild_id}/image?days={days}", chunk_size)
+
+    def stream_member_image(
+        self,
+        user_id: int,
+        guild_id: int,
+        days: int = DEFAULT_DAYS,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ) -> Iterator[bytes]:
+        """Stream the member's activity image in chunks, without loading it into memory.
+
+        Parameters
+        ----------
+        user_id:
+            The user's ID.
+        guild_id:
+            The guild's ID.
+        days:
+            The number of days. Defaults to ``14``.
+        chunk_size:
+            The maximum size of each chunk in bytes. Defaults to ``65536``.
+
+        Raises
+        ------
+        NotFound:
+            The user was not found.
+        """
+        return self._stream(f"activity/member/{user_id}/{guild_id}/image?days={days}", chunk_size)
+
+    def _save(self, chunks: Iterator[bytes], fp: FileTarget) -> int:
+        written = 0
+        with _open_target(fp) as f:
+            for chunk in chunks:
+                written += f.write(chunk)
+        return written
+
+    def save_guild_image(self, guild_id: int, fp: FileTarget, days: int = DEFAULT_DAYS) -> int:
+        """Stream the guild's activity image into a file.
+
+        Parameters
+        ----------
+        guild_id:
+            The guild's ID.
+        fp:
+            A file path or a binary file-like object, e.g. :class:`io.BytesIO`.
+        days:
+            The number of days. Defaults to ``14``.
+
+        Returns
+        -------
+        int
+            The number of bytes written.
+
+        Raises
+        ------
+        NoGuildAccess:
+            You don't have access to that guild.
+        """
+        return self._save(self.stream_guild_image(guild_id, days), fp)
+
+    def save_member_image(
+        self, user_id: int, guild_id: int, fp: FileTarget, days: int = DEFAULT_DAYS
+    ) -> int:
+        """Stream the member's activity image into a file.
+
+        Parameters
+        ----------
+        user_id:
+            The user's ID.
+        guild_id:
+            The guild's ID.
+        fp:
+            A file path or a binary file-like object, e.g. :class:`io.BytesIO`.
+        days:
+            The number of days. Defaults to ``14``.
+
+        Returns
+        -------
+        int
+            The number of bytes written.
+
+        Raises
+        ------
+        NotFound:
+            The user was not found.
+        """
+        return self._save(self.stream_member_image(user_id, guild_id, days), fp)
+
+    def map(
+        self,
+        func: Callable[..., T],
+        arguments: Iterable[tuple],
+        concurrency: int = DEFAULT_CONCURRENCY,
+        progress: Callable[[int, int], None] | None = None,
+    ) -> list[T | CookieError]:
+        """Call a method of this client for many arguments in a thread pool.
+
+        All threads share the connection pool of the httpx client. Results are returned
+        in the same order as ``arguments``. If a call fails, the raised
+        :class:`~cookie.errors.CookieError` is returned in its place instead of aborting
+        the whole batch.
+
+        .. code-block:: python
+
+            results = api.map(api.get_member_stats, [(1, 10), (2, 10)])
+
+        Parameters
+        ----------
+        func:
+            The method to call, e.g. :meth:`get_member_stats`.
+        arguments:
+            A tuple of positional arguments for each call.
+        concurrency:
+            The maximum number of concurrent requests. Defaults to ``10``.
+        progress:
+            A function that is called with the number of finished calls and the total
+            number of calls whenever a call finishes.
+        """
+        if concurrency < 1:
+            raise ValueError("concurrency must be at least 1.")
+
+        arguments = list(arguments)
+        results: dict[int, T | CookieError] = {}
+        if not arguments:
+            return []
+
+        def run(args: tuple) -> T | CookieError:
+            try:
+                return func(*args)
+            except (CookieError, httpx.TransportError) as e:
+                return _batch_error(e)
+
+        with ThreadPoolExecutor(
+            max_workers=min(concurrency, len(arguments)), thread_name_prefix="cookie"
+        ) as executor:
+            # Each call gets a copy of the caller's context, e.g. for low_priority()
+            futures = {
+                executor.submit(contextvars.copy_context().run, run, args): i
+                for i, args in enumerate(arguments)
+            }
+            try:
+                for done, future in enumerate(as_completed(futures), 1):
+                    results[futures[future]] = future.result()
+                    if progress is not None:
+                        progress(done, len(arguments))
+            except BaseException:
+                # Don't start the remaining calls when one of them raises
+                executor.shutdown(wait=False, cancel_futures=True)
+                raise
+
+        return [results[i] for i in range(len(arguments))]
+
+    def get_many_user_stats(
+        self,
+        user_ids: Iterable[int],
+        concurrency: int = DEFAULT_CONCURRENCY,
+        progress: Callable[[int, int], None] | None = None,
+    ) -> list[UserStats | CookieError]:
+        """Get the level stats of many users, with at most ``concurrency`` requests in flight.
+
+        Results are returned in the same order as ``user_ids``. If a request fails,
+        the raised :class:`~cookie.errors.CookieError` is returned in its place
+        instead of aborting the whole batch.
+
+        Parameters
+        ----------
+        user_ids:
+            The user IDs.
+        concurrency:
+            The maximum number of concurrent requests. Defaults to ``10``.
+        progress:
+            A function that is called with the number of finished and total requests.
+        """
+        return self.map(
+            self.get_user_stats, ((user_id,) for user_id in user_ids), concurrency, progress
+        )
+
+    def get_many_member_stats(
+        self,
+        pairs: Iterable[tuple[int, int]],
+        concurrency: int = DEFAULT_CONCURRENCY,
+        progress: Callable[[int, int], None] | None = None,
+    ) -> list[MemberStats | CookieError]:
+        """Get the level stats of many members, with at most ``concurrency`` requests in flight.
+
+        Results are returned in the same order as ``pairs``. If a request fails,
+        the raised :class:`~cookie.errors.CookieError` (e.g. :class:`~cookie.errors.NotFound`)
+        is returned in its place instead of aborting the whole batch.
+
+        Parameters
+        ----------
+        pairs:
+            ``(user_id, guild_id)`` tuples.
+        concurrency:
+            The maximum number of concurrent requests. Defaults to ``10``.
+        progress:
+            A function that is called with the number of finished and total requests.
+        """
+        return self.map(self.get_member_stats, pairs, concurrency, progress)
+
+    def get_many_member_activity(
+        self,
+        pairs: Iterable[tuple[int, int]],
+        days: int = DEFAULT_DAYS,
+        concurrency: int = DEFAULT_CONCURRENCY,
+        progress: Callable[[int, int], None] | None = None,
+    ) -> list[MemberActivity | CookieError]:
+        """Get the activity of many members, with at most ``concurrency`` requests in flight.
+
+        Results are returned in the same order as ``pairs``. If a request fails,
+        the raised :class:`~cookie.errors.CookieError` (e.g. :class:`~cookie.errors.NotFound`)
+        is returned in its place instead of aborting the whole batch.
+
+        Parameters
+        ----------
+        pairs:
+            ``(user_id, guild_id)`` tuples.
+        days:
+            The number of days. Defaults to ``14``.
+        concurrency:
+            The maximum number of concurrent requests. Defaults to ``10``.
+        progress:
+            A function that is called with the number of finished and total requests.
+        """
+        return self.map(
+            self.get_member_activity,
+            ((user_id, guild_id, days) for user_id, guild_id in pairs),
+            concurrency,
+            progress,
+        )
+
+    def _get_member_stats_data(self, user_id: int, guild_id: int) -> dict:
+        with trace_request(self._tracers, f"stats/member/{user_id}/{guild_id}"):
+            return self._get(f"stats/member/{user_id}/{guild_id}")
+
+    def get_member_stats_table(
+        self,
+        guild_id: int,
+        user_ids: Iterable[int],
+        concurrency: int = DEFAULT_CONCURRENCY,
+        progress: Callable[[int, int], None] | None = None,
+    ) -> MemberStatsTable:
+        """Get the level stats of many members of a guild as a :class:`~cookie.MemberStatsTable`.
+
+        The responses are added to the table directly, without creating model instances.
+        Members that could not be fetched are collected in :attr:`MemberStatsTable.errors`.
+
+        Parameters
+        ----------
+        guild_id:
+            The guild's ID.
+        user_ids:
+            The user IDs.
+        concurrency:
+            The maximum number of concurrent requests. Defaults to ``10``.
+        progress:
+            A function that is called with the number of finished and total requests.
+        """
+        user_ids = list(user_ids)
+        results = self.map(
+            self._get_member_stats_data,
+            ((user_id, guild_id) for user_id in user_ids),
+            concurrency,
+            progress,
+        )
+        return MemberStatsTable(zip(user_ids, results))
+
+    def _export_images(
+        self, jobs: dict[K, tuple[str, str]], directory: str | os.PathLike, concurrency: int
+    ) -> dict[K, ImageManifestEntry | CookieError]:
+        exporter = ImageExporter(directory)
+
+        def export(path: str, endpoint: str) -> ImageManifestEntry:
+            writer = exporter.writer(path)
+            try:
+                for chunk in self._stream(endpoint, DEFAULT_CHUNK_SIZE):
+                    writer.write(chunk)
+            except BaseException:
+                writer.abort()
+                raise
+            return writer.commit()
+
+        try:
+            results = self.map(export, jobs.values(), concurrency)
+        finally:
+            exporter.save()
+        return dict(zip(jobs, results))
+
+    def export_guild_images(
+        self,
+        guild_ids: Iterable[int],
+        directory: str | os.PathLike,
+        days: int = DEFAULT_DAYS,
+        concurrency: int = DEFAULT_CONCURRENCY,
+    ) -> dict[int, ImageManifestEntry | CookieError]:
+        """Download the activity images of many guilds into a directory.
+
+        Images are streamed with at most ``concurrency`` requests in flight and written
+        atomically as ``guild_<guild_id>.png``. Images whose SHA-256 hash is unchanged since
+        the previous export are not written again. The manifest is saved as
+        ``manifest.json`` in the directory.
+
+        Parameters
+        ----------
+        guild_ids:
+            The guild IDs.
+        directory:
+            The target directory. It is created if it doesn't exist.
+        days:
+            The number of days. Defaults to ``14``.
+        concurrency:
+            The maximum number of concurrent requests. Defaults to ``10``.
+
+        Returns
+        -------
+        dict[int, ImageManifestEntry | CookieError]
+            The manifest entry of each guild, or the raised
+            :class:`~cookie.errors.CookieError` if the image could not be fetched.
+        """
+        jobs = {
+            guild_id: (f"guild_{guild_id}.png", f"activity/guild/{guild_id}/image?days={days}")
+            for guild_id in guild_ids
+        }
+        return self._export_images(jobs, directory, concurrency)
+
+    def export_member_images(
+        self,
+        pairs: Iterable[tuple[int, int]],
+        directory: str | os.PathLike,
+        days: int = DEFAULT_DAYS,
+        concurrency: int = DEFAULT_CONCURRENCY,
+    ) -> dict[tuple[int, int], ImageManifestEntry | CookieError]:
+        """Download the activity images of many members into a directory.
+
+        Works like :meth:`export_guild_images`. The images are written as
+        ``member_<user_id>_<guild_id>.png``.
+
+        Parameters
+        ----------
+        pairs:
+            ``(user_id, guild_id)`` tuples.
+        directory:
+            The target directory. It is created if it doesn't exist.
+        days:
+            The number of days. Defaults to ``14``.
+        concurrency:
+            The maximum number of concurrent requests. Defaults to ``10``.
+
+        Returns
+        -------
+        dict[tuple[int, int], ImageManifestEntry | CookieError]
+            The manifest entry of each pair, or the raised
+            :class:`~cookie.errors.CookieError` if the image could not be fetched.
+        """
+        jobs = {
+            (user_id, guild_id): (
+                f"member_{user_id}_{guild_id}.png",
+                f"activity/member/{user_id}/{guild_id}/image?days={days}",
+            )
+            for user_id, guild_id in pairs
+        }
+        return self._export_images(jobs, directory, concurrency)
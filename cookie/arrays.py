@@ -0,0 +1,166 @@
+"""Helpers to work with charts as NumPy arrays. Requires ``numpy`` (``pip install cookie-api[numpy]``)."""
+
+from __future__ import annotations
+
+from collections.abc import Sequence
+from typing import TYPE_CHECKING, Literal, NamedTuple
+
+if TYPE_CHECKING:
+    import numpy as np
+
+    from ._internal import BaseChart
+
+
+def _numpy():
+    try:
+        import numpy
+    except ImportError:
+        raise ImportError(
+            "numpy is required for array support. Install it with: pip install cookie-api[numpy]"
+        ) from None
+    return numpy
+
+
+class ChartArrays(NamedTuple):
+    """The dates and values of one or more charts."""
+
+    dates: np.ndarray
+    """The dates as a ``datetime64[D]`` array."""
+    values: np.ndarray
+    """The values. For stacked charts, each row contains the values of one chart."""
+
+
+def chart_to_numpy(chart: BaseChart) -> ChartArrays:
+    """Convert a chart to a ``datetime64[D]`` and an ``int64`` array.
+
+    The arrays are cached on the chart and are read-only, so converting the same
+    chart again does not copy any data. Like the date index, they are rebuilt when
+    ``x`` or ``y`` are reassigned or change their length.
+    """
+    np = _numpy()
+    x, y = getattr(chart, "x"), getattr(chart, "y")
+    # Reassignments clear the arrays, appends are detected by the lengths
+    key = (len(x), len(y))
+
+    cached = chart._arrays
+    if cached is not None and chart._arrays_key == key:
+        return cached
+
+    dates = np.array(x, dtype="datetime64[D]")
+    values = np.fromiter(y, dtype=np.int64, count=len(y))
+    dates.flags.writeable = False
+    values.flags.writeable = False
+
+    chart._arrays = arrays = ChartArrays(dates, values)
+    chart._arrays_key = key
+    return arrays
+
+
+def stack_charts(charts: Sequence[BaseChart], fill: float = float("nan")) -> ChartArrays:
+    """Combine many charts, e.g. from a bulk fetch, into one columnar table.
+
+    The dates are the sorted union of all chart dates. The values are a ``float64``
+    array with one row per chart, where dates that are missing from a chart are
+    set to ``fill``.
+
+    Parameters
+    ----------
+    charts:
+        The charts to combine.
+    fill:
+        The value for missing dates. Defaults to ``nan``.
+    """
+    np = _numpy()
+    arrays = [chart_to_numpy(chart) for chart in charts]
+    if not arrays:
+        return ChartArrays(np.array([], dtype="datetime64[D]"), np.empty((0, 0)))
+
+    dates = np.unique(np.concatenate([a.dates for a in arrays]))
+    values = np.full((len(arrays), len(dates)), fill, dtype=np.float64)
+    for row, a in zip(values, arrays):
+        row[np.searchsorted(dates, a.dates)] = a.values
+
+    return ChartArrays(dates, values)
+
+
+def rolling_mean(values: np.ndarray, window: int) -> np.ndarray:
+    """Compute the rolling mean over the last axis.
+
+    The result is ``window - 1`` elements shorter than the input.
+    """
+    np = _numpy()
+    if window < 1:
+        raise ValueError("window must be at least 1.")
+
+    values = np.asarray(values, dtype=np.float64)
+    cumsum = np.cumsum(values, axis=-1)
+    zeros = np.zeros(values.shape[:-1] + (1,))
+    cumsum = np.concatenate([zeros, cumsum], axis=-1)
+    return (cumsum[..., window:] - cumsum[..., :-window]) / window
+
+
+def resample(
+    dates: np.ndarray,
+    values: np.ndarray,
+    period: Literal["week", "month"] = "week",
+    how: Literal["sum", "mean"] = "sum",
+) -> ChartArrays:
+    """Aggregate daily values into weeks (starting on Monday) or months.
+
+    Parameters
+    ----------
+    dates:
+        Sorted ``datetime64[D]`` dates.
+    values:
+        The values, with the dates on the last axis.
+    period:
+        Either ``"week"`` or ``"month"``. Defaults to ``"week"``.
+    how:
+        Either ``"sum"`` or ``"mean"``. Defaults to ``"sum"``.
+
+    Returns
+    -------
+    ChartArrays
+        The first day of each period and the aggregated values.
+    """
+    np = _numpy()
+    dates = np.asarray(dates, dtype="datetime64[D]")
+    values = np.asarray(values, dtype=np.float64)
+
+    if period == "week":
+        # datetime64 weeks start on Thursday, shift them so they start on Monday
+        days = dates.astype(np.int64)
+        starts = ((days + 3) // 7 * 7 - 3).astype("datetime64[D]")
+    elif period == "month":
+        starts = dates.astype("datetime64[M]").astype("datetime64[D]")
+    else:
+        raise ValueError(f"Unknown period: {period!r}")
+
+    periods, offsets, counts = np.unique(starts, return_index=True, return_counts=True)
+    result = np.add.reduceat(values, offsets, axis=-1) if len(offsets) else values
+    if how == "mean":
+        result = result / counts
+    elif how != "sum":
+        raise ValueError(f"Unknown aggregation: {how!r}")
+
+    return ChartArrays(periods, result)
+
+
+def diff(values: np.ndarray) -> np.ndarray:
+    """Compute the difference between consecutive values over the last axis."""
+    np = _numpy()
+    return np.diff(np.asarray(values, dtype=np.float64), axis=-1)
+
+
+def growth(values: np.ndarray) -> np.ndarray:
+    """Compute the relative change between consecutive values over the last axis.
+
+    Changes from ``0`` are ``nan``.
+    """
+    np = _numpy()
+    values = np.asarray(values, dtype=np.float64)
+    previous = values[..., :-1]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        result = np.diff(values, axis=-1) / previous
+    result[previous == 0] = np.nan
+    return result
@@ -0,0 +1,293 @@
+from __future__ import annotations
+
+import re
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Iterable
+from datetime import date, timedelta
+from typing import Any, NamedTuple
+
+# Only guild stats can be sliced: activity responses have fields like ranks, the top
+# channel or the current voice minutes that can't be derived for a smaller window.
+_WINDOW_ENDPOINT = re.compile(r"(stats/guild/\d+)\?days=(\d+)")
+
+
+def _split_window(endpoint: str) -> tuple[str, int] | None:
+    match = _WINDOW_ENDPOINT.fullmatch(endpoint)
+    if match is None:
+        return None
+    return match.group(1), int(match.group(2))
+
+
+def find_wider_window(endpoint: str, endpoints: Iterable[str]) -> str | None:
+    """Return the endpoint with the smallest number of days that covers ``endpoint``,
+    or ``None`` if none of ``endpoints`` covers it.
+    """
+    window = _split_window(endpoint)
+    if window is None:
+        return None
+
+    best: tuple[int, str] | None = None
+    for other in endpoints:
+        other_window = _split_window(other)
+        if other_window is None or other_window[0] != window[0] or other_window[1] <= window[1]:
+            continue
+        if best is None or other_window[1] < best[0]:
+            best = (other_window[1], other)
+    return best[1] if best else None
+
+
+def _slice_chart(chart: dict, days: int) -> dict:
+    x, y = chart["x"], chart["y"]
+    if not x:
+        return chart
+
+    cutoff = (date.fromisoformat(str(x[-1])) - timedelta(days=days - 1)).isoformat()
+    start = next((i for i, d in enumerate(x) if str(d) >= cutoff), len(x))
+    return {"x": x[start:], "y": y[start:]}
+
+
+def slice_window(endpoint: str, data: dict) -> dict:
+    """Slice a response for a wider window to the number of days of ``endpoint``.
+
+    Only guild stats (``stats/guild/{guild_id}?days=...``) can be sliced, as all of
+    their fields are charts. These are cut to the last ``days`` dates.
+    """
+    window = _split_window(endpoint)
+    if window is None:
+        raise ValueError(f"Endpoint {endpoint!r} has no days window.")
+
+    days = window[1]
+    data = dict(data)
+    data["members"] = _slice_chart(data["members"], days)
+    data["boosts"] = _slice_chart(data["boosts"], days)
+    return data
+
+
+class _Entry(NamedTuple):
+    expires: float
+    stale_until: float
+    fetched_at: float
+    value: Any
+    size: int
+
+
+class CachedValue(NamedTuple):
+    """A value returned by :meth:`ResponseCache.lookup`."""
+
+    value: Any
+    """The decoded JSON response or the raw image bytes."""
+    fetched_at: float
+    """When the response was received, as a UNIX timestamp."""
+    stale: bool
+    """Whether the fresh TTL of the entry has expired."""
+
+
+class ResponseCache:
+    """An in-memory LRU cache for API responses that can be shared between
+    :class:`~cookie.CookieAPI` and :class:`~cookie.AsyncCookieAPI` instances.
+
+    Entries are keyed on the endpoint path, including the number of days.
+    When either ``max_entries`` or ``max_bytes`` is exceeded, the least recently
+    used entries are evicted. A TTL of ``0`` disables caching for that kind of endpoint.
+
+    With ``stale_ttl``, the cache works in stale-while-revalidate mode: after the TTL of
+    an entry expires, the clients keep returning it for ``stale_ttl`` more seconds and
+    refresh it in the background. Entries older than their TTL plus ``stale_ttl``
+    (the maximum age) are not returned.
+
+    Parameters
+    ----------
+    stats_ttl:
+        Seconds to cache ``stats/*`` responses. Defaults to ``60``.
+    activity_ttl:
+        Seconds to cache ``activity/*`` responses. Defaults to ``60``.
+    image_ttl:
+        Seconds to cache activity images. Defaults to ``300``.
+    max_entries:
+        The maximum number of cached responses. Defaults to ``1024``.
+    max_bytes:
+        The maximum total size of cached response bodies. Defaults to 32 MiB.
+    subsume_windows:
+        Whether requests for guild stats can be served from a cached or in-flight
+        response for more days, e.g. a 14-day request from a 30-day response.
+        Activity responses are always fetched, as their ranks and totals can't be
+        derived from a wider window. Defaults to ``False``.
+    stale_ttl:
+        Seconds after the TTL during which an expired entry is still returned while it is
+        refreshed in the background. Defaults to ``0``, which disables stale responses.
+    """
+
+    def __init__(
+        self,
+        stats_ttl: float = 60,
+        activity_ttl: float = 60,
+        image_ttl: float = 300,
+        max_entries: int = 1024,
+        max_bytes: int = 32 * 1024 * 1024,
+        subsume_windows: bool = False,
+        stale_ttl: float = 0,
+    ):
+        self.stats_ttl = stats_ttl
+        self.activity_ttl = activity_ttl
+        self.image_ttl = image_ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.subsume_windows = subsume_windows
+        self.stale_ttl = stale_ttl
+
+        self.hits = 0
+        self.misses = 0
+        self._size = 0
+        self._entries: OrderedDict[str, _Entry] = OrderedDict()
+        self._windows: dict[str, set[str]] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, endpoint: str) -> bool:
+        entry = self._entries.get(endpoint)
+        return entry is not None and entry.expires > time.monotonic()
+
+    @property
+    def size(self) -> int:
+        """The total size of all cached response bodies in bytes."""
+        return self._size
+
+    def ttl_for(self, endpoint: str) -> float:
+        """Return the TTL in seconds that applies to an endpoint."""
+        path = endpoint.split("?", 1)[0]
+        if path.endswith("/image"):
+            return self.image_ttl
+        if path.startswith("stats/"):
+            return self.stats_ttl
+        return self.activity_ttl
+
+    def get(self, endpoint: str) -> Any | None:
+        """Return the cached response for an endpoint, or ``None`` if there is no fresh entry."""
+        cached = self.lookup(endpoint, allow_stale=False)
+        return None if cached is None else cached.value
+
+    def lookup(self, endpoint: str, allow_stale: bool = True) -> CachedValue | None:
+        """Return the cached response for an endpoint with the time it was fetched.
+
+        Parameters
+        ----------
+        endpoint:
+            The endpoint path, relative to the base URL.
+        allow_stale:
+            Whether to return entries whose TTL expired, but that are still
+            within ``stale_ttl``. Defaults to ``True``.
+        """
+        with self._lock:
+            now = time.monotonic()
+            entry = self._entries.get(endpoint)
+            if entry is not None and entry.stale_until <= now:
+                self._remove(endpoint)
+                entry = None
+
+            if entry is not None and (allow_stale or entry.expires > now):
+                self._entries.move_to_end(endpoint)
+                self.hits += 1
+                return CachedValue(entry.value, entry.fetched_at, entry.expires <= now)
+
+            if self.subsume_windows:
+                cached = self._get_wider(endpoint)
+                if cached is not None:
+                    self.hits += 1
+                    return cached
+
+            self.misses += 1
+            return None
+
+    def _get_wider(self, endpoint: str) -> CachedValue | None:
+        window = _split_window(endpoint)
+        if window is None:
+            return None
+
+        candidates = set(self._windows.get(window[0], ()))
+        while candidates:
+            wider = find_wider_window(endpoint, candidates)
+            if wider is None:
+                return None
+
+            entry = self._entries[wider]
+            if entry.expires > time.monotonic():
+                self._entries.move_to_end(wider)
+                return CachedValue(slice_window(endpoint, entry.value), entry.fetched_at, False)
+            candidates.discard(wider)
+        return None
+
+    def set(self, endpoint: str, value: Any, size: int) -> None:
+        """Store a response for an endpoint.
+
+        Parameters
+        ----------
+        endpoint:
+            The endpoint path, relative to the base URL.
+        value:
+            The decoded JSON response or the raw image bytes.
+        size:
+            The size of the response body in bytes.
+        """
+        ttl = self.ttl_for(endpoint)
+        if ttl <= 0 or size > self.max_bytes:
+            return
+
+        with self._lock:
+            if endpoint in self._entries:
+                self._remove(endpoint)
+
+            now = time.monotonic()
+            self._entries[endpoint] = _Entry(
+                now + ttl, now + ttl + self.stale_ttl, time.time(), value, size
+            )
+            self._size += size
+            window = _split_window(endpoint)
+            if window is not None:
+                self._windows.setdefault(window[0], set()).add(endpoint)
+
+            while len(self._entries) > self.max_entries or self._size > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+
+    def invalidate(self, prefix: str) -> int:
+        """Remove all entries for an endpoint, regardless of the number of days.
+
+        For example, ``"stats/guild/123"`` removes ``stats/guild/123?days=7`` and
+        ``stats/guild/123?days=30``, while ``"activity/guild/123"`` also removes the
+        guild's images.
+
+        Returns
+        -------
+        int
+            The number of removed entries.
+        """
+        with self._lock:
+            keys = [
+                key
+                for key in self._entries
+                if key == prefix or key.startswith((prefix + "?", prefix + "/"))
+            ]
+            for key in keys:
+                self._remove(key)
+            return len(keys)
+
+    def clear(self) -> None:
+        """Remove all entries and reset the hit and miss counters."""
+        with self._lock:
+            self._entries.clear()
+            self._windows.clear()
+            self._size = 0
+            self.hits = 0
+            self.misses = 0
+
+    def _remove(self, endpoint: str) -> None:
+        self._size -= self._entries.pop(endpoint).size
+        window = _split_window(endpoint)
+        if window is not None:
+            endpoints = self._windows[window[0]]
+            endpoints.discard(endpoint)
+            if not endpoints:
+                del self._windows[window[0]]
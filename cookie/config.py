@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any
+
+import httpx
+
+
+@dataclass(frozen=True)
+class ClientConfig:
+    """Connection settings for the httpx clients that are created by
+    :class:`~cookie.CookieAPI` and :class:`~cookie.AsyncCookieAPI`.
+
+    Parameters
+    ----------
+    max_connections:
+        The maximum number of concurrent connections. Defaults to ``100``.
+    max_keepalive_connections:
+        The maximum number of idle connections that are kept open. Defaults to ``20``.
+    keepalive_expiry:
+        The number of seconds after which idle connections are closed. Defaults to ``30``.
+    http2:
+        Whether to enable HTTP/2, which multiplexes requests over a single connection.
+        Requires the ``h2`` package (``pip install cookie-api[http2]``). Defaults to ``False``.
+    connect_timeout:
+        The timeout for establishing a connection in seconds. Defaults to ``5``.
+    read_timeout:
+        The timeout for receiving a response in seconds. Defaults to ``10``.
+    write_timeout:
+        The timeout for sending a request in seconds. Defaults to ``10``.
+    pool_timeout:
+        The timeout for acquiring a connection from the pool in seconds. Defaults to ``10``.
+    base_url:
+        Overrides the base URL of the API.
+    """
+
+    max_connections: int | None = 100
+    max_keepalive_connections: int | None = 20
+    keepalive_expiry: float | None = 30
+    http2: bool = False
+    connect_timeout: float | None = 5
+    read_timeout: float | None = 10
+    write_timeout: float | None = 10
+    pool_timeout: float | None = 10
+    base_url: str | None = None
+
+    @property
+    def limits(self) -> httpx.Limits:
+        return httpx.Limits(
+            max_connections=self.max_connections,
+            max_keepalive_connections=self.max_keepalive_connections,
+            keepalive_expiry=self.keepalive_expiry,
+        )
+
+    @property
+    def timeout(self) -> httpx.Timeout:
+        return httpx.Timeout(
+            connect=self.connect_timeout,
+            read=self.read_timeout,
+            write=self.write_timeout,
+            pool=self.pool_timeout,
+        )
+
+    def client_kwargs(self) -> dict[str, Any]:
+        """Return the keyword arguments for :class:`httpx.Client` and :class:`httpx.AsyncClient`."""
+        return {"limits": self.limits, "timeout": self.timeout, "http2": self.http2}
@@ -1,16 +1,19 @@
 from __future__ import annotations
 
-from httpx import Response
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from httpx import Response
 
 
 class CookieError(Exception):
     """Base exception class for all Cookie exceptions."""
 
     def __init__(self, response: Response | str):
-        if isinstance(response, Response):
-            msg = f"Status Code {response.status_code} for URL {response.url}: {response.text}"
-        else:
+        if isinstance(response, str):
             msg = response
+        else:
+            msg = f"Status Code {response.status_code} for URL {response.url}: {response.text}"
 
         super().__init__(msg)
 
@@ -42,3 +45,21 @@ class NoGuildAccess(CookieError):
 
     def __init__(self):
         super().__init__("You are not a member of this guild.")
+
+
+class CircuitOpen(CookieError):
+    """Raised when requests are rejected because the API is failing and the
+    circuit breaker is open.
+    """
+
+    def __init__(self, msg: str | None = None):
+        super().__init__(msg or "The Cookie API is unavailable, please try again later.")
+
+
+class DeadlineExceeded(CookieError):
+    """Raised when a call can't be finished before the deadline set with
+    :func:`~cookie.deadline`.
+    """
+
+    def __init__(self, msg: str | None = None):
+        super().__init__(msg or "The deadline of the call was exceeded.")
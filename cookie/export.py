@@ -0,0 +1,197 @@
+"""Export many activity images into a directory, e.g. for nightly jobs.
+
+Images are written atomically and only when their content changed since the
+previous export. Each export updates ``manifest.json`` in the directory.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import BinaryIO
+
+MANIFEST_NAME = "manifest.json"
+SPOOL_SIZE = 1024 * 1024
+
+
+@dataclass
+class ImageManifestEntry:
+    """Describes an exported image."""
+
+    path: str
+    """The path of the image, relative to the export directory."""
+    sha256: str
+    """The SHA-256 hash of the image as a hex string."""
+    size: int
+    """The size of the image in bytes."""
+    fetched_at: datetime
+    """When the image was fetched."""
+    changed: bool = True
+    """Whether the file was written by the last export. ``False`` if the image was
+    unchanged since the previous export."""
+
+
+def load_manifest(directory: str | os.PathLike) -> dict[str, ImageManifestEntry]:
+    """Load the manifest of a previous export, keyed by path.
+    Returns an empty dict if there was no previous export.
+    """
+    try:
+        data = json.loads((Path(directory) / MANIFEST_NAME).read_text())
+    except FileNotFoundError:
+        return {}
+
+    return {
+        path: ImageManifestEntry(
+            path=path,
+            sha256=entry["sha256"],
+            size=entry["size"],
+            fetched_at=datetime.fromisoformat(entry["fetched_at"]),
+            changed=entry.get("changed", True),
+        )
+        for path, entry in data.items()
+    }
+
+
+def _read_umask() -> int:
+    # The umask can only be read by setting it, which isn't thread-safe, so it is read on import
+    umask = os.umask(0)
+    os.umask(umask)
+    return umask
+
+
+_UMASK = _read_umask()
+
+
+def _replace(tmp: str, path: Path) -> None:
+    """Move a temporary file to ``path`` with the permissions of a regular new file.
+    ``mkstemp`` creates files that only the owner can read.
+    """
+    os.chmod(tmp, 0o666 & ~_UMASK)
+    os.replace(tmp, path)
+
+
+def _write_atomic(path: Path, data: bytes) -> None:
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        _replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+class ImageWriter:
+    """Receives the chunks of one image and hashes them while they arrive.
+
+    Chunks are kept in memory up to ``SPOOL_SIZE`` bytes and only spilled into a
+    temporary file next to the target for larger images. If the hash matches the
+    previous export and the file still exists, nothing is written.
+    """
+
+    def __init__(self, exporter: ImageExporter, path: str):
+        self._exporter = exporter
+        self._path = path
+        self._hash = hashlib.sha256()
+        self._chunks: list[bytes] = []
+        self._size = 0
+        self._file: BinaryIO | None = None
+        self._tmp: str | None = None
+
+    def write(self, chunk: bytes) -> None:
+        self._hash.update(chunk)
+        self._size += len(chunk)
+        if self._file is not None:
+            self._file.write(chunk)
+            return
+
+        self._chunks.append(chunk)
+        if self._size > SPOOL_SIZE:
+            target = self._exporter.directory / self._path
+            target.parent.mkdir(parents=True, exist_ok=True)
+            fd, self._tmp = tempfile.mkstemp(
+                dir=target.parent, prefix=f".{target.name}.", suffix=".tmp"
+            )
+            self._file = os.fdopen(fd, "wb")
+            self._file.writelines(self._chunks)
+            self._chunks.clear()
+
+    def abort(self) -> None:
+        """Discard the received chunks."""
+        if self._file is not None:
+            assert self._tmp is not None
+            self._file.close()
+            os.unlink(self._tmp)
+            self._file = None
+        self._chunks.clear()
+
+    def commit(self) -> ImageManifestEntry:
+        """Write the image if it changed and add it to the manifest."""
+        target = self._exporter.directory / self._path
+        digest = self._hash.hexdigest()
+        previous = self._exporter.previous.get(self._path)
+        changed = previous is None or previous.sha256 != digest or not target.exists()
+
+        if not changed:
+            self.abort()
+        elif self._file is not None:
+            assert self._tmp is not None
+            self._file.close()
+            self._file = None
+            _replace(self._tmp, target)
+        else:
+            target.parent.mkdir(parents=True, exist_ok=True)
+            _write_atomic(target, b"".join(self._chunks))
+            self._chunks.clear()
+
+        entry = ImageManifestEntry(
+            path=self._path,
+            sha256=digest,
+            size=self._size,
+            fetched_at=datetime.now(timezone.utc),
+            changed=changed,
+        )
+        self._exporter._add(entry)
+        return entry
+
+
+class ImageExporter:
+    """Collects the images of one export into a directory.
+
+    Parameters
+    ----------
+    directory:
+        The target directory. It is created if it doesn't exist.
+    """
+
+    def __init__(self, directory: str | os.PathLike):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.previous = load_manifest(self.directory)
+        self._entries = dict(self.previous)
+        self._lock = threading.Lock()
+
+    def writer(self, path: str) -> ImageWriter:
+        """Return a writer for an image at ``path``, relative to the directory."""
+        return ImageWriter(self, path)
+
+    def _add(self, entry: ImageManifestEntry) -> None:
+        with self._lock:
+            self._entries[entry.path] = entry
+
+    def save(self) -> None:
+        """Write the manifest, including the images of previous exports."""
+        with self._lock:
+            data = {
+                path: {**asdict(entry), "fetched_at": entry.fetched_at.isoformat()}
+                for path, entry in sorted(self._entries.items())
+            }
+        for entry in data.values():
+            del entry["path"]
+        _write_atomic(self.directory / MANIFEST_NAME, json.dumps(data, indent=2).encode())
@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+import re
+import threading
+from collections.abc import Iterable
+from typing import Literal
+
+from .errors import NoGuildAccess, QuotaExceeded
+from .ratelimit import _current_period
+
+KeyStrategy = Literal["round_robin", "least_used"]
+
+_GUILD_ENDPOINT = re.compile(r"(?:stats|activity)/(?:guild/(\d+)|member/\d+/(\d+))(?:[/?].*)?")
+
+
+def guild_id_of(endpoint: str) -> int | None:
+    """Return the guild ID of a guild-scoped endpoint, or ``None`` for user endpoints."""
+    match = _GUILD_ENDPOINT.fullmatch(endpoint)
+    if match is None:
+        return None
+    return int(match.group(1) or match.group(2))
+
+
+class KeyPool:
+    """Distributes requests over several API keys.
+
+    A key that raises :class:`~cookie.errors.QuotaExceeded` is retired until the end
+    of the month (UTC). A key that raises :class:`~cookie.errors.NoGuildAccess` for a
+    guild is no longer used for that guild. In both cases, the clients retry the
+    request with another key.
+
+    .. code-block:: python
+
+        pool = cookie.KeyPool(["key-1", "key-2"], strategy="least_used")
+        api = cookie.CookieAPI(api_key=pool)
+
+    Parameters
+    ----------
+    keys:
+        The API keys.
+    strategy:
+        How keys are chosen, either ``"round_robin"`` or ``"least_used"``, which picks
+        the key with the fewest requests this month. Defaults to ``"round_robin"``.
+    """
+
+    def __init__(self, keys: Iterable[str], strategy: KeyStrategy = "round_robin"):
+        self.keys = list(dict.fromkeys(keys))
+        if not self.keys:
+            raise ValueError("At least one API key is required.")
+        if strategy not in ("round_robin", "least_used"):
+            raise ValueError(f"Unknown strategy {strategy!r}.")
+
+        self.strategy = strategy
+        self._usage = dict.fromkeys(self.keys, 0)
+        self._retired: set[str] = set()
+        self._denied: dict[int, set[str]] = {}
+        self._next = 0
+        self._period = _current_period()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def _roll(self) -> None:
+        period = _current_period()
+        if period != self._period:
+            self._period = period
+            self._usage = dict.fromkeys(self.keys, 0)
+            self._retired.clear()
+
+    @property
+    def usage(self) -> dict[str, int]:
+        """The number of requests sent with each key this month."""
+        with self._lock:
+            self._roll()
+            return dict(self._usage)
+
+    @property
+    def available(self) -> list[str]:
+        """The keys that are not retired."""
+        with self._lock:
+            self._roll()
+            return [key for key in self.keys if key not in self._retired]
+
+    def acquire(self, endpoint: str) -> str:
+        """Choose the key for a request and count it as used.
+
+        Raises
+        ------
+        QuotaExceeded:
+            All keys are retired.
+        NoGuildAccess:
+            None of the remaining keys has access to the guild of the endpoint.
+        """
+        guild_id = guild_id_of(endpoint)
+        with self._lock:
+            self._roll()
+            keys = [key for key in self.keys if key not in self._retired]
+            if not keys:
+                raise QuotaExceeded("The quota of all API keys is exceeded.")
+
+            denied = self._denied.get(guild_id, ()) if guild_id is not None else ()
+            keys = [key for key in keys if key not in denied]
+            if not keys:
+                raise NoGuildAccess()
+
+            if self.strategy == "least_used":
+                key = min(keys, key=self._usage.__getitem__)
+            else:
+                # Continue after the last used key and skip the excluded ones
+                index = self._next % len(self.keys)
+                key = next((k for k in self.keys[index:] + self.keys[:index] if k in keys), keys[0])
+                self._next = self.keys.index(key) + 1
+
+            self._usage[key] += 1
+            return key
+
+    def retire(self, key: str) -> None:
+        """Stop using a key until the end of the month."""
+        with self._lock:
+            self._roll()
+            self._retired.add(key)
+
+    def deny(self, key: str, guild_id: int) -> None:
+        """Stop using a key for a guild."""
+        with self._lock:
+            self._denied.setdefault(guild_id, set()).add(key)
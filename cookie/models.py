@@ -7,7 +7,7 @@ from datetime import date, datetime
 
 from pydantic import BaseModel, Field
 
-from ._internal import BaseChart
+from ._internal import BaseChart, BaseResponse
 
 
 class Chart(BaseChart):
@@ -22,7 +22,7 @@ class Daily(BaseModel):
     max_streak: int = Field(..., title="Max Streak")
 
 
-class GuildActivity(BaseModel):
+class GuildActivity(BaseResponse):
     msg_activity: Chart
     voice_activity: Chart
     msg_count: int = Field(..., title="Msg Count")
@@ -33,12 +33,12 @@ class GuildActivity(BaseModel):
     most_active_user_hour: int | None = Field(..., title="Most Active User Hour")
 
 
-class GuildStats(BaseModel):
+class GuildStats(BaseResponse):
     members: Chart
     boosts: Chart
 
 
-class MemberActivity(BaseModel):
+class MemberActivity(BaseResponse):
     msg_activity: Chart
     voice_activity: Chart
     msg_count: int = Field(..., title="Msg Count")
@@ -102,7 +102,7 @@ class HTTPValidationError(BaseModel):
     detail: list[ValidationError] | None = Field(None, title="Detail")
 
 
-class MemberStats(BaseModel):
+class MemberStats(BaseResponse):
     level: TextLevel
     voice: VoiceLevel
     greetings: int = Field(..., title="Greetings")
@@ -110,7 +110,7 @@ class MemberStats(BaseModel):
     profile_url: str = Field(..., title="Profile Url")
 
 
-class UserStats(BaseModel):
+class UserStats(BaseResponse):
     cookies: int = Field(..., title="Cookies")
     cookie_history: Chart
     job: Work
@@ -0,0 +1,267 @@
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import random
+import re
+import time
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+from .errors import CookieError, QuotaExceeded
+from .ratelimit import low_priority
+from .tracing import trace_request
+
+if TYPE_CHECKING:
+    from .api import AsyncCookieAPI
+
+DEFAULT_DAYS = 14
+
+_PREFETCHABLE = re.compile(
+    r"stats/guild/\d+\?days=\d+|activity/guild/\d+\?days=\d+|stats/member/\d+/\d+"
+)
+
+
+@dataclass
+class _Key:
+    score: float = 0.0
+    pinned: bool = False
+    hot: bool = False
+    next_refresh: float = 0.0
+
+
+class PrefetchScheduler:
+    """Keeps the responses of hot guilds and members in the cache of an
+    :class:`~cookie.AsyncCookieAPI`, so that requests after a lull don't wait for the API.
+
+    Guild stats, guild activity and member stats are tracked. Every access adds ``1`` to
+    the score of an endpoint and all scores are multiplied by ``decay`` once per
+    ``interval``. Endpoints whose score reaches ``promote_at`` become hot and are refreshed
+    every ``interval`` seconds, spread out with ``jitter``. Hot endpoints whose score
+    drops below ``demote_below`` are no longer refreshed, unless they were pinned.
+
+    Refreshes are made with :func:`~cookie.low_priority`, so they never use the ``reserve``
+    of the client's :class:`~cookie.QuotaBudget`. When the budget is exhausted,
+    refreshes are paused for one interval.
+
+    .. code-block:: python
+
+        api = cookie.AsyncCookieAPI(cache=cookie.ResponseCache())
+        async with cookie.PrefetchScheduler(api, interval=50) as scheduler:
+            scheduler.pin_guild(guild_id)
+            ...
+
+    Parameters
+    ----------
+    api:
+        The client. It must have a :class:`~cookie.ResponseCache`.
+    interval:
+        Seconds between refreshes of each hot endpoint. Should be lower than the TTL
+        of the cache. Defaults to ``50``.
+    jitter:
+        The share of ``interval`` by which refreshes are moved forward at random,
+        between ``0`` and ``1``. Defaults to ``0.2``.
+    promote_at:
+        The score at which an endpoint becomes hot. Defaults to ``3``.
+    demote_below:
+        The score below which a hot endpoint is no longer refreshed. Defaults to ``0.5``.
+    decay:
+        The factor applied to all scores once per interval. Defaults to ``0.5``.
+    max_keys:
+        The maximum number of hot endpoints that are not pinned. Defaults to ``100``.
+    concurrency:
+        The maximum number of concurrent refreshes. Defaults to ``4``.
+    """
+
+    def __init__(
+        self,
+        api: AsyncCookieAPI,
+        interval: float = 50,
+        jitter: float = 0.2,
+        promote_at: float = 3,
+        demote_below: float = 0.5,
+        decay: float = 0.5,
+        max_keys: int = 100,
+        concurrency: int = 4,
+    ):
+        if api._cache is None:
+            raise ValueError("Prefetching requires a client with a ResponseCache.")
+        if not 0 <= jitter <= 1:
+            raise ValueError("jitter must be between 0 and 1.")
+
+        self.api = api
+        self.interval = interval
+        self.jitter = jitter
+        self.promote_at = promote_at
+        self.demote_below = demote_below
+        self.decay = decay
+        self.max_keys = max_keys
+        self.concurrency = concurrency
+
+        self.refreshes = 0
+        self._keys: dict[str, _Key] = {}
+        self._last_decay = time.monotonic()
+        self._paused_until = 0.0
+        self._task: asyncio.Future | None = None
+        self._wakeup: asyncio.Event | None = None
+
+    async def __aenter__(self):
+        self.start()
+        return self
+
+    async def __aexit__(self, *args):
+        await self.stop()
+
+    @property
+    def hot_keys(self) -> list[str]:
+        """The endpoints that are currently refreshed."""
+        return [endpoint for endpoint, key in self._keys.items() if key.hot]
+
+    def _schedule(self, key: _Key, now: float) -> None:
+        key.next_refresh = now + self.interval * (1 - random.uniform(0, self.jitter))
+
+    def _promote(self, key: _Key) -> None:
+        key.hot = True
+        # Spread the first refresh of new keys over the whole interval
+        key.next_refresh = time.monotonic() + random.uniform(0, self.interval)
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    def _pin(self, endpoint: str) -> None:
+        key = self._keys.setdefault(endpoint, _Key())
+        key.pinned = True
+        if not key.hot:
+            self._promote(key)
+
+    def _unpin(self, endpoint: str) -> None:
+        key = self._keys.get(endpoint)
+        if key is not None:
+            key.pinned = False
+
+    def pin_guild(self, guild_id: int, days: int = DEFAULT_DAYS) -> None:
+        """Always refresh the stats and activity of a guild."""
+        self._pin(f"stats/guild/{guild_id}?days={days}")
+        self._pin(f"activity/guild/{guild_id}?days={days}")
+
+    def unpin_guild(self, guild_id: int, days: int = DEFAULT_DAYS) -> None:
+        """Let the stats and activity of a guild be demoted when they are no longer used."""
+        self._unpin(f"stats/guild/{guild_id}?days={days}")
+        self._unpin(f"activity/guild/{guild_id}?days={days}")
+
+    def pin_member(self, user_id: int, guild_id: int) -> None:
+        """Always refresh the stats of a member."""
+        self._pin(f"stats/member/{user_id}/{guild_id}")
+
+    def unpin_member(self, user_id: int, guild_id: int) -> None:
+        """Let the stats of a member be demoted when they are no longer used."""
+        self._unpin(f"stats/member/{user_id}/{guild_id}")
+
+    def record_access(self, endpoint: str) -> None:
+        """Count an access to an endpoint. This is called by the client for every call."""
+        if not _PREFETCHABLE.fullmatch(endpoint):
+            return
+
+        key = self._keys.get(endpoint)
+        if key is None:
+            key = self._keys[endpoint] = _Key()
+        key.score += 1
+        if not key.hot and key.score >= self.promote_at:
+            unpinned = sum(1 for k in self._keys.values() if k.hot and not k.pinned)
+            if unpinned < self.max_keys:
+                self._promote(key)
+
+    def _apply_decay(self, now: float) -> None:
+        while now - self._last_decay >= self.interval:
+            self._last_decay += self.interval
+            for endpoint, key in list(self._keys.items()):
+                key.score *= self.decay
+                if not key.pinned and key.score < self.demote_below:
+                    del self._keys[endpoint]
+
+    async def _refresh(self, endpoint: str) -> None:
+        with low_priority(), trace_request(self.api._tracers, endpoint):
+            try:
+                await self.api._fetch(endpoint, False)
+            except CookieError:
+                raise
+            except Exception as e:
+                # Transport errors are retried at the next refresh
+                raise CookieError(str(e)) from e
+
+    async def tick(self) -> int:
+        """Refresh all hot endpoints that are due and update the scores.
+
+        This is called automatically while the scheduler is running.
+
+        Returns
+        -------
+        int
+            The number of refreshed endpoints.
+        """
+        now = time.monotonic()
+        self._apply_decay(now)
+        if now < self._paused_until:
+            return 0
+        self._paused_until = 0.0
+
+        due = [e for e, key in self._keys.items() if key.hot and key.next_refresh <= now]
+        for endpoint in due:
+            self._schedule(self._keys[endpoint], now)
+        if not due:
+            return 0
+
+        results = await self.api._run_many(
+            self._refresh, ((endpoint,) for endpoint in due), self.concurrency
+        )
+        if any(isinstance(result, QuotaExceeded) for result in results):
+            self._paused_until = time.monotonic() + self.interval
+
+        refreshed = sum(1 for result in results if not isinstance(result, CookieError))
+        self.refreshes += refreshed
+        return refreshed
+
+    def _next_wakeup(self) -> float:
+        now = time.monotonic()
+        times = [self._last_decay + self.interval]
+        if now < self._paused_until:
+            # Refreshes that are due wait until the pause ends
+            times.append(self._paused_until)
+        else:
+            times.extend(key.next_refresh for key in self._keys.values() if key.hot)
+        return max(min(times) - now, 0)
+
+    async def _run(self) -> None:
+        assert self._wakeup is not None
+        while True:
+            await self.tick()
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self._next_wakeup())
+            except asyncio.TimeoutError:
+                pass
+
+    def start(self) -> None:
+        """Start refreshing in the background and count the accesses of the client."""
+        if self._task is not None:
+            return
+
+        self.api._prefetcher = self
+        self._wakeup = asyncio.Event()
+        # Run in an empty context, so refreshes aren't traced as part of the current call
+        self._task = contextvars.Context().run(asyncio.ensure_future, self._run())
+        self.api._background.add(self._task)
+        self._task.add_done_callback(self.api._background.discard)
+
+    async def stop(self) -> None:
+        """Stop refreshing and counting accesses."""
+        if self.api._prefetcher is self:
+            self.api._prefetcher = None
+        if self._task is None:
+            return
+
+        task, self._task = self._task, None
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
@@ -0,0 +1,209 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime, timezone
+
+from .errors import QuotaExceeded
+
+_low_priority: ContextVar[bool] = ContextVar("cookie_low_priority", default=False)
+
+
+def _current_period() -> str:
+    return datetime.now(timezone.utc).strftime("%Y-%m")
+
+
+@contextmanager
+def low_priority() -> Iterator[None]:
+    """A context manager that marks all requests made inside it as low priority.
+
+    Low priority requests are rejected with :class:`~cookie.errors.QuotaExceeded`
+    once a :class:`QuotaBudget` is down to its ``reserve``, so the remaining
+    requests are kept for more important calls.
+
+    .. code-block:: python
+
+        with cookie.low_priority():
+            stats = api.get_guild_stats(guild_id)
+    """
+    token = _low_priority.set(True)
+    try:
+        yield
+    finally:
+        _low_priority.reset(token)
+
+
+class RateLimiter:
+    """A token bucket rate limiter that can be shared between clients and threads.
+
+    Parameters
+    ----------
+    rate:
+        The number of requests per second.
+    burst:
+        The maximum number of requests that can be sent at once. Defaults to ``1``.
+    """
+
+    def __init__(self, rate: float, burst: int = 1):
+        if rate <= 0 or burst < 1:
+            raise ValueError("rate must be positive and burst must be at least 1.")
+
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    @property
+    def tokens(self) -> float:
+        """The number of requests that can currently be sent without waiting."""
+        with self._lock:
+            self._refill()
+            return max(self._tokens, 0.0)
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._last) * self.rate)
+        self._last = now
+
+    def _reserve(self, timeout: float | None) -> float | None:
+        with self._lock:
+            self._refill()
+            delay = max((1 - self._tokens) / self.rate, 0.0)
+            if timeout is not None and delay > timeout:
+                return None
+            self._tokens -= 1
+            return delay
+
+    def acquire(self, timeout: float | None = None) -> bool:
+        """Block until a request may be sent.
+
+        Parameters
+        ----------
+        timeout:
+            The maximum number of seconds to wait. If the wait would take longer,
+            no request is reserved and ``False`` is returned immediately.
+        """
+        delay = self._reserve(timeout)
+        if delay is None:
+            return False
+        if delay:
+            time.sleep(delay)
+        return True
+
+    async def acquire_async(self, timeout: float | None = None) -> bool:
+        """Wait until a request may be sent without blocking the event loop.
+        Works like :meth:`acquire`.
+        """
+        delay = self._reserve(timeout)
+        if delay is None:
+            return False
+        if delay:
+            await asyncio.sleep(delay)
+        return True
+
+
+class QuotaBudget:
+    """Tracks the monthly request quota on the client side.
+
+    Every request that is sent to the API consumes one request of the budget.
+    When the budget is exhausted, :class:`~cookie.errors.QuotaExceeded` is raised
+    before a request is sent. The budget is reset at the start of each month (UTC).
+
+    Parameters
+    ----------
+    limit:
+        The number of requests available per month.
+    used:
+        The number of requests already used this month. Defaults to ``0``.
+    reserve:
+        The number of requests that are kept for calls outside of :func:`low_priority`.
+        Defaults to ``0``.
+    """
+
+    def __init__(self, limit: int, used: int = 0, reserve: int = 0):
+        self.limit = limit
+        self.reserve = reserve
+        self._used = used
+        self._period = _current_period()
+        self._lock = threading.Lock()
+
+    def _roll(self) -> None:
+        period = _current_period()
+        if period != self._period:
+            self._period = period
+            self._used = 0
+
+    @property
+    def used(self) -> int:
+        """The number of requests used this month."""
+        with self._lock:
+            self._roll()
+            return self._used
+
+    @property
+    def remaining(self) -> int:
+        """The number of requests left this month."""
+        with self._lock:
+            self._roll()
+            return max(self.limit - self._used, 0)
+
+    def consume(self, requests: int = 1) -> None:
+        """Consume part of the budget.
+
+        Raises
+        ------
+        QuotaExceeded:
+            Not enough requests are left, taking the ``reserve`` into account
+            for low priority requests.
+        """
+        floor = self.reserve if _low_priority.get() else 0
+        with self._lock:
+            self._roll()
+            if self.limit - self._used - requests < floor:
+                raise QuotaExceeded("The local quota budget is exhausted.")
+            self._used += requests
+
+    def exhaust(self) -> None:
+        """Mark the budget as exhausted for the rest of the month.
+        This is called automatically when the API raises :class:`~cookie.errors.QuotaExceeded`.
+        """
+        with self._lock:
+            self._roll()
+            self._used = max(self._used, self.limit)
+
+    def save(self, path: str | os.PathLike) -> None:
+        """Save the budget to a JSON file."""
+        with self._lock:
+            self._roll()
+            data = {"limit": self.limit, "used": self._used, "period": self._period}
+        with open(path, "w") as f:
+            json.dump(data, f)
+
+    @classmethod
+    def load(
+        cls, path: str | os.PathLike, limit: int | None = None, reserve: int = 0
+    ) -> QuotaBudget:
+        """Load a budget that was saved with :meth:`save`.
+        If the file was saved in a previous month, the used requests are reset.
+
+        Parameters
+        ----------
+        path:
+            The JSON file.
+        limit:
+            Overrides the saved limit.
+        reserve:
+            The number of requests that are kept for calls outside of :func:`low_priority`.
+        """
+        with open(path) as f:
+            data = json.load(f)
+
+        used = data["used"] if data.get("period") == _current_period() else 0
+        return cls(limit if limit is not None else data["limit"], used, reserve)
@@ -0,0 +1,337 @@
+from __future__ import annotations
+
+import random
+import threading
+import time
+from collections import deque
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+import httpx
+
+from .errors import CircuitOpen, DeadlineExceeded
+from .tracing import endpoint_template
+
+NON_RETRYABLE_STATUSES = frozenset({401, 403, 404})
+
+_deadline: ContextVar[float | None] = ContextVar("cookie_deadline", default=None)
+
+
+@contextmanager
+def deadline(seconds: float) -> Iterator[None]:
+    """A context manager that limits the time of all calls made inside it.
+
+    The deadline covers rate limiting, waiting for coalesced requests, retries and
+    the requests themselves. When it can't be met, :class:`~cookie.errors.DeadlineExceeded`
+    is raised, or the last error if a retry wouldn't finish in time. Nested deadlines
+    can only shorten the outer deadline. A coalesced request that is shared with other
+    callers is not bound by the deadline of the caller that started it.
+
+    .. code-block:: python
+
+        with cookie.deadline(2.5):
+            activity = await api.get_guild_activity(guild_id)
+
+    Parameters
+    ----------
+    seconds:
+        The time in seconds from now.
+    """
+    at = time.monotonic() + seconds
+    current = _deadline.get()
+    token = _deadline.set(at if current is None else min(current, at))
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+@contextmanager
+def _without_deadline() -> Iterator[None]:
+    token = _deadline.set(None)
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def remaining_time() -> float | None:
+    """Return the seconds left until the current deadline, or ``None`` if there is none."""
+    at = _deadline.get()
+    return None if at is None else at - time.monotonic()
+
+
+def fits_deadline(seconds: float) -> bool:
+    """Return whether there are more than ``seconds`` left until the current deadline."""
+    remaining = remaining_time()
+    return remaining is None or seconds < remaining
+
+
+def check_deadline() -> float | None:
+    """Return the seconds left until the current deadline.
+
+    Raises
+    ------
+    DeadlineExceeded:
+        The deadline has passed.
+    """
+    remaining = remaining_time()
+    if remaining is not None and remaining <= 0:
+        raise DeadlineExceeded()
+    return remaining
+
+
+class RetryPolicy:
+    """Configures how failed requests are retried.
+
+    Responses that raise :class:`~cookie.errors.InvalidAPIKey`,
+    :class:`~cookie.errors.QuotaExceeded`, :class:`~cookie.errors.NoGuildAccess` or
+    :class:`~cookie.errors.NotFound` are never retried.
+
+    Parameters
+    ----------
+    max_attempts:
+        The maximum number of attempts, including the first request. Defaults to ``3``.
+    backoff:
+        The delay before the first retry in seconds. It is doubled for each following retry.
+        Defaults to ``0.5``.
+    max_backoff:
+        The maximum delay between two attempts in seconds. Responses whose
+        ``Retry-After`` header asks for a longer delay are not retried. Defaults to ``10``.
+    jitter:
+        Whether to randomize the delay between ``0`` and the computed backoff. Defaults to ``True``.
+    statuses:
+        The HTTP status codes that are retried. Defaults to ``429`` and common ``5xx`` codes.
+    exceptions:
+        The exceptions that are retried. Defaults to :class:`httpx.TransportError`.
+    deadline:
+        The maximum total time in seconds to spend on a request, including all retries.
+    """
+
+    def __init__(
+        self,
+        max_attempts: int = 3,
+        backoff: float = 0.5,
+        max_backoff: float = 10,
+        jitter: bool = True,
+        statuses: Iterable[int] = (429, 500, 502, 503, 504),
+        exceptions: tuple[type[Exception], ...] = (httpx.TransportError,),
+        deadline: float | None = None,
+    ):
+        if max_attempts < 1:
+            raise ValueError("max_attempts must be at least 1.")
+
+        self.max_attempts = max_attempts
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.jitter = jitter
+        self.statuses = frozenset(statuses) - NON_RETRYABLE_STATUSES
+        self.exceptions = exceptions
+        self.deadline = deadline
+
+    def next_delay(
+        self,
+        attempt: int,
+        started: float,
+        response: httpx.Response | None = None,
+        error: Exception | None = None,
+    ) -> float | None:
+        """Return the delay before the next attempt, or ``None`` if the request
+        should not be retried.
+
+        Parameters
+        ----------
+        attempt:
+            The number of the attempt that failed, starting at ``1``.
+        started:
+            The :func:`time.monotonic` timestamp of the first attempt.
+        response:
+            The failed response.
+        error:
+            The exception raised by the failed attempt.
+        """
+        if error is not None and not isinstance(error, self.exceptions):
+            return None
+        if response is not None and response.status_code not in self.statuses:
+            return None
+        if attempt >= self.max_attempts:
+            return None
+
+        delay = min(self.backoff * 2 ** (attempt - 1), self.max_backoff)
+        if self.jitter:
+            delay = random.uniform(0, delay)
+        if response is not None:
+            retry_after = response.headers.get("retry-after", "")
+            if retry_after.isdigit():
+                if float(retry_after) > self.max_backoff:
+                    return None
+                delay = max(delay, float(retry_after))
+
+        if self.deadline is not None and time.monotonic() + delay - started > self.deadline:
+            return None
+        return delay
+
+
+class CircuitBreaker:
+    """Fails fast while the API is down instead of sending requests that are doomed to fail.
+
+    After ``failure_threshold`` consecutive server errors or connection errors, the circuit
+    opens and requests raise :class:`~cookie.errors.CircuitOpen` without being sent.
+    After ``recovery_time`` seconds, a single trial request is let through. If it succeeds,
+    the circuit closes again, otherwise it stays open for another ``recovery_time``.
+
+    Parameters
+    ----------
+    failure_threshold:
+        The number of consecutive failures that open the circuit. Defaults to ``5``.
+    recovery_time:
+        The number of seconds the circuit stays open. Defaults to ``30``.
+    """
+
+    def __init__(self, failure_threshold: int = 5, recovery_time: float = 30):
+        self.failure_threshold = failure_threshold
+        self.recovery_time = recovery_time
+        self._failures = 0
+        self._opened_at: float | None = None
+        self._trial = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        """The current state, either ``"closed"``, ``"open"`` or ``"half_open"``."""
+        if self._opened_at is None:
+            return "closed"
+        if self._trial or time.monotonic() - self._opened_at >= self.recovery_time:
+            return "half_open"
+        return "open"
+
+    def _rejects(self) -> bool:
+        assert self._opened_at is not None
+        return self._trial or time.monotonic() - self._opened_at < self.recovery_time
+
+    def check(self) -> None:
+        """Check whether a request may be sent, without claiming the trial request.
+
+        Raises
+        ------
+        CircuitOpen:
+            The circuit is open.
+        """
+        with self._lock:
+            if self._opened_at is not None and self._rejects():
+                raise CircuitOpen()
+
+    def before_request(self) -> bool:
+        """Check whether a request may be sent right before it is sent.
+
+        Returns
+        -------
+        bool
+            Whether the request is the trial request of the half-open circuit. If it
+            ends without a result, :meth:`release_trial` must be called.
+
+        Raises
+        ------
+        CircuitOpen:
+            The circuit is open.
+        """
+        with self._lock:
+            if self._opened_at is None:
+                return False
+            if self._rejects():
+                raise CircuitOpen()
+            self._trial = True
+            return True
+
+    def release_trial(self) -> None:
+        """Let another request through as the trial, e.g. after the trial was cancelled."""
+        with self._lock:
+            self._trial = False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._trial = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            if self._trial or self._failures >= self.failure_threshold:
+                self._opened_at = time.monotonic()
+                self._trial = False
+
+
+class HedgePolicy:
+    """Sends a second identical request when the first one is slower than usual
+    and uses the response that arrives first.
+
+    The latency of successful requests is tracked per endpoint template. Once
+    ``min_samples`` are known, a request that hasn't finished after the ``quantile``
+    of the recent latencies is hedged. This cuts the tail latency at the cost of
+    a few extra requests, which also count towards the quota.
+
+    Parameters
+    ----------
+    quantile:
+        The latency quantile after which a request is hedged. Defaults to ``0.95``.
+    min_samples:
+        The number of latencies needed before requests are hedged. Defaults to ``20``.
+    window:
+        The number of recent latencies that are kept per endpoint. Defaults to ``200``.
+    min_delay:
+        The minimum delay before hedging in seconds. Defaults to ``0.01``.
+    prefixes:
+        The endpoints that may be hedged. Defaults to the read-only ``stats/`` and
+        ``activity/`` endpoints.
+    """
+
+    def __init__(
+        self,
+        quantile: float = 0.95,
+        min_samples: int = 20,
+        window: int = 200,
+        min_delay: float = 0.01,
+        prefixes: tuple[str, ...] = ("stats/", "activity/"),
+    ):
+        if not 0 < quantile < 1:
+            raise ValueError("quantile must be between 0 and 1.")
+
+        self.quantile = quantile
+        self.min_samples = min_samples
+        self.window = window
+        self.min_delay = min_delay
+        self.prefixes = prefixes
+
+        self.hedged = 0
+        """The number of requests that were hedged."""
+        self.wins = 0
+        """The number of hedged requests that were answered first."""
+        self._latencies: dict[str, deque[float]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, endpoint: str, seconds: float) -> None:
+        """Record the latency of a successful request."""
+        template = endpoint_template(endpoint)
+        with self._lock:
+            latencies = self._latencies.get(template)
+            if latencies is None:
+                latencies = self._latencies[template] = deque(maxlen=self.window)
+            latencies.append(seconds)
+
+    def delay(self, endpoint: str) -> float | None:
+        """Return the seconds after which a request to an endpoint is hedged,
+        or ``None`` if it isn't hedged.
+        """
+        if not endpoint.startswith(self.prefixes):
+            return None
+
+        with self._lock:
+            latencies = self._latencies.get(endpoint_template(endpoint))
+            if latencies is None or len(latencies) < self.min_samples:
+                return None
+            ordered = sorted(latencies)
+
+        index = min(int(self.quantile * len(ordered)), len(ordered) - 1)
+        return max(ordered[index], self.min_delay)
@@ -0,0 +1,326 @@
+from __future__ import annotations
+
+import mmap
+import os
+import threading
+from array import array
+from bisect import bisect_left, bisect_right
+from collections.abc import Iterator
+from contextlib import contextmanager
+from datetime import date
+from pathlib import Path
+from typing import TYPE_CHECKING, Literal
+
+from .models import Chart
+
+if TYPE_CHECKING:
+    from .api import AsyncCookieAPI, CookieAPI
+
+DEFAULT_INITIAL_DAYS = 30
+
+_TypeCode = Literal["i", "q"]
+
+_DATE_TYPE: _TypeCode = "i"
+_VALUE_TYPE: _TypeCode = "q"
+
+
+def _tmp(path: Path) -> Path:
+    return path.with_name(path.name + ".tmp")
+
+
+@contextmanager
+def _view(path: Path, typecode: _TypeCode) -> Iterator[memoryview]:
+    """Memory-map a file as a read-only array of ``typecode`` items."""
+    if not path.exists() or path.stat().st_size == 0:
+        yield memoryview(array(typecode))
+        return
+
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as m:
+        view = memoryview(m).cast(typecode)
+        try:
+            yield view
+        finally:
+            view.release()
+
+
+class ChartStore:
+    """A local store that keeps the full history of guild and member charts.
+
+    The API only returns a sliding window of days. This store merges each new window
+    into a file-backed series, so the history can be queried for arbitrary ranges
+    without using the API. Each series is stored as two memory-mappable files in
+    ``directory``: ``<series>.dates`` with the date ordinals as ``int32`` and
+    ``<series>.values`` with the values as ``int64``.
+
+    Merges keep both files consistent if they are interrupted: appends write the values
+    before the dates and rewrites replace both files from complete temporary files.
+    The files of an interrupted merge are repaired when the series is used next.
+
+    Series are named after the data they contain:
+
+    - ``guild/<guild_id>/members`` and ``guild/<guild_id>/boosts``
+    - ``guild/<guild_id>/messages`` and ``guild/<guild_id>/voice``
+    - ``member/<user_id>/<guild_id>/messages`` and ``member/<user_id>/<guild_id>/voice``
+
+    Parameters
+    ----------
+    directory:
+        The directory for the series files. It is created if it doesn't exist.
+    """
+
+    def __init__(self, directory: str | os.PathLike):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+
+    def _paths(self, series: str) -> tuple[Path, Path]:
+        base = self.directory / series
+        return base.with_name(base.name + ".dates"), base.with_name(base.name + ".values")
+
+    def __contains__(self, series: str) -> bool:
+        return self._paths(series)[0].exists()
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self.directory.rglob("*.dates"))
+
+    def _repair(self, series: str) -> None:
+        """Finish or undo a merge of the series that was interrupted."""
+        dates_path, values_path = self._paths(series)
+        if _tmp(dates_path).exists():
+            if _tmp(values_path).exists():
+                # Neither file was replaced yet
+                _tmp(values_path).unlink()
+                _tmp(dates_path).unlink()
+            else:
+                os.replace(_tmp(dates_path), dates_path)
+        elif _tmp(values_path).exists():
+            _tmp(values_path).unlink()
+
+        if not values_path.exists():
+            return
+        # Values that were appended without their dates, or a partially written item
+        dates_size = dates_path.stat().st_size if dates_path.exists() else 0
+        count = min(
+            dates_size // array(_DATE_TYPE).itemsize,
+            values_path.stat().st_size // array(_VALUE_TYPE).itemsize,
+        )
+        for path, typecode in ((dates_path, _DATE_TYPE), (values_path, _VALUE_TYPE)):
+            size = count * array(typecode).itemsize
+            if path.exists() and path.stat().st_size != size:
+                os.truncate(path, size)
+
+    def first_date(self, series: str) -> date | None:
+        """Return the first stored date of a series, or ``None`` if it is empty."""
+        with self._lock:
+            self._repair(series)
+        with _view(self._paths(series)[0], _DATE_TYPE) as dates:
+            return date.fromordinal(dates[0]) if len(dates) else None
+
+    def last_date(self, series: str) -> date | None:
+        """Return the last stored date of a series, or ``None`` if it is empty."""
+        with self._lock:
+            self._repair(series)
+        with _view(self._paths(series)[0], _DATE_TYPE) as dates:
+            return date.fromordinal(dates[-1]) if len(dates) else None
+
+    def get(self, series: str, start: date | None = None, end: date | None = None) -> Chart:
+        """Return the stored values between two dates (inclusive) as a chart.
+
+        Parameters
+        ----------
+        series:
+            The name of the series.
+        start:
+            The first date. Defaults to the first stored date.
+        end:
+            The last date. Defaults to the last stored date.
+        """
+        dates_path, values_path = self._paths(series)
+        with self._lock:
+            self._repair(series)
+        with _view(dates_path, _DATE_TYPE) as dates, _view(values_path, _VALUE_TYPE) as values:
+            i = 0 if start is None else bisect_left(dates, start.toordinal())
+            j = len(dates) if end is None else bisect_right(dates, end.toordinal())
+            x = [date.fromordinal(d) for d in dates[i:j]]
+            y = values[i:j].tolist()
+
+        return Chart.model_construct(x=x, y=y)
+
+    def merge(self, series: str, chart: Chart) -> int:
+        """Merge a chart into a series.
+
+        New dates are appended, values for dates that are already stored are updated
+        in place, e.g. for the current day that was still in progress at the last merge.
+
+        Returns
+        -------
+        int
+            The number of new dates.
+        """
+        points = sorted(zip((d.toordinal() for d in chart.x), chart.y))
+        if not points:
+            return 0
+
+        dates_path, values_path = self._paths(series)
+        dates_path.parent.mkdir(parents=True, exist_ok=True)
+
+        with self._lock:
+            self._repair(series)
+            with _view(dates_path, _DATE_TYPE) as dates:
+                stored = array(_DATE_TYPE, dates)
+
+            last = stored[-1] if stored else None
+            updates: list[tuple[int, int]] = []
+            appended = [(d, v) for d, v in points if last is None or d > last]
+            for d, v in points:
+                if last is None or d > last:
+                    break
+                i = bisect_left(stored, d)
+                if i == len(stored) or stored[i] != d:
+                    # The new date lies before or inside the stored history
+                    return self._rewrite(series, points)
+                updates.append((i, v))
+
+            itemsize = array(_VALUE_TYPE).itemsize
+            if updates:
+                with open(values_path, "r+b") as f:
+                    for i, v in updates:
+                        f.seek(i * itemsize)
+                        f.write(array(_VALUE_TYPE, [v]).tobytes())
+            if appended:
+                # The dates are written last, so an interrupted append only leaves extra
+                # values, which are truncated by _repair
+                with open(values_path, "ab") as f:
+                    f.write(array(_VALUE_TYPE, [v for _, v in appended]).tobytes())
+                with open(dates_path, "ab") as f:
+                    f.write(array(_DATE_TYPE, [d for d, _ in appended]).tobytes())
+            return len(appended)
+
+    def _rewrite(self, series: str, points: list[tuple[int, int]]) -> int:
+        dates_path, values_path = self._paths(series)
+        with _view(dates_path, _DATE_TYPE) as dates, _view(values_path, _VALUE_TYPE) as values:
+            merged = dict(zip(dates.tolist(), values.tolist()))
+
+        added = sum(1 for d, _ in points if d not in merged)
+        merged.update(points)
+        ordered = sorted(merged.items())
+
+        # Both files are complete before either is replaced. The values are replaced
+        # first, so a remaining temporary dates file means that the rewrite can be finished.
+        _tmp(values_path).write_bytes(array(_VALUE_TYPE, [v for _, v in ordered]).tobytes())
+        _tmp(dates_path).write_bytes(array(_DATE_TYPE, [d for d, _ in ordered]).tobytes())
+        os.replace(_tmp(values_path), values_path)
+        os.replace(_tmp(dates_path), dates_path)
+        return added
+
+    def days_to_sync(self, *series: str, initial_days: int = DEFAULT_INITIAL_DAYS) -> int:
+        """Return the number of days that need to be requested to bring all series up to date.
+
+        The last stored day is requested again, as it may have been incomplete.
+
+        Parameters
+        ----------
+        series:
+            The names of the series.
+        initial_days:
+            The number of days to request for series without any data. Defaults to ``30``.
+        """
+        last_dates = [self.last_date(name) for name in series]
+        if not last_dates or None in last_dates:
+            return initial_days
+
+        oldest = min(d for d in last_dates if d is not None)
+        return max((date.today() - oldest).days + 1, 1)
+
+    def sync_guild_stats(
+        self, api: CookieAPI, guild_id: int, initial_days: int = DEFAULT_INITIAL_DAYS
+    ) -> int:
+        """Request the days that are missing since the last sync and merge the guild's
+        member and boost charts.
+
+        Returns
+        -------
+        int
+            The number of new dates.
+        """
+        members, boosts = f"guild/{guild_id}/members", f"guild/{guild_id}/boosts"
+        days = self.days_to_sync(members, boosts, initial_days=initial_days)
+        stats = api.get_guild_stats(guild_id, days)
+        return self.merge(members, stats.members) + self.merge(boosts, stats.boosts)
+
+    async def sync_guild_stats_async(
+        self, api: AsyncCookieAPI, guild_id: int, initial_days: int = DEFAULT_INITIAL_DAYS
+    ) -> int:
+        """Like :meth:`sync_guild_stats`, but for :class:`~cookie.AsyncCookieAPI`."""
+        members, boosts = f"guild/{guild_id}/members", f"guild/{guild_id}/boosts"
+        days = self.days_to_sync(members, boosts, initial_days=initial_days)
+        stats = await api.get_guild_stats(guild_id, days)
+        return self.merge(members, stats.members) + self.merge(boosts, stats.boosts)
+
+    def sync_guild_activity(
+        self, api: CookieAPI, guild_id: int, initial_days: int = DEFAULT_INITIAL_DAYS
+    ) -> int:
+        """Request the days that are missing since the last sync and merge the guild's
+        message and voice activity charts.
+
+        Returns
+        -------
+        int
+            The number of new dates.
+        """
+        messages, voice = f"guild/{guild_id}/messages", f"guild/{guild_id}/voice"
+        days = self.days_to_sync(messages, voice, initial_days=initial_days)
+        activity = api.get_guild_activity(guild_id, days)
+        return self.merge(messages, activity.msg_activity) + self.merge(
+            voice, activity.voice_activity
+        )
+
+    async def sync_guild_activity_async(
+        self, api: AsyncCookieAPI, guild_id: int, initial_days: int = DEFAULT_INITIAL_DAYS
+    ) -> int:
+        """Like :meth:`sync_guild_activity`, but for :class:`~cookie.AsyncCookieAPI`."""
+        messages, voice = f"guild/{guild_id}/messages", f"guild/{guild_id}/voice"
+        days = self.days_to_sync(messages, voice, initial_days=initial_days)
+        activity = await api.get_guild_activity(guild_id, days)
+        return self.merge(messages, activity.msg_activity) + self.merge(
+            voice, activity.voice_activity
+        )
+
+    def sync_member_activity(
+        self,
+        api: CookieAPI,
+        user_id: int,
+        guild_id: int,
+        initial_days: int = DEFAULT_INITIAL_DAYS,
+    ) -> int:
+        """Request the days that are missing since the last sync and merge the member's
+        message and voice activity charts.
+
+        Returns
+        -------
+        int
+            The number of new dates.
+        """
+        messages = f"member/{user_id}/{guild_id}/messages"
+        voice = f"member/{user_id}/{guild_id}/voice"
+        days = self.days_to_sync(messages, voice, initial_days=initial_days)
+        activity = api.get_member_activity(user_id, guild_id, days)
+        return self.merge(messages, activity.msg_activity) + self.merge(
+            voice, activity.voice_activity
+        )
+
+    async def sync_member_activity_async(
+        self,
+        api: AsyncCookieAPI,
+        user_id: int,
+        guild_id: int,
+        initial_days: int = DEFAULT_INITIAL_DAYS,
+    ) -> int:
+        """Like :meth:`sync_member_activity`, but for :class:`~cookie.AsyncCookieAPI`."""
+        messages = f"member/{user_id}/{guild_id}/messages"
+        voice = f"member/{user_id}/{guild_id}/voice"
+        days = self.days_to_sync(messages, voice, initial_days=initial_days)
+        activity = await api.get_member_activity(user_id, guild_id, days)
+        return self.merge(messages, activity.msg_activity) + self.merge(
+            voice, activity.voice_activity
+        )
@@ -0,0 +1,286 @@
+from __future__ import annotations
+
+import heapq
+from array import array
+from collections.abc import Callable, Iterable, Iterator, Mapping
+from typing import TYPE_CHECKING, Any, cast
+
+from .models import MemberStats
+
+if TYPE_CHECKING:
+    import numpy as np
+
+    from .errors import CookieError
+
+_TYPE = "q"
+
+LEVEL_FIELDS = (
+    "msg",
+    "xp",
+    "level",
+    "current_level_progress",
+    "current_level_end",
+    "rank",
+    "total_members",
+)
+VOICE_FIELDS = (
+    "minutes",
+    "xp",
+    "level",
+    "rank",
+    "total_members",
+    "streak_days",
+    "cur_voice_min",
+    "max_voice_min",
+)
+COLUMNS = (
+    "user_id",
+    *(f"level.{name}" for name in LEVEL_FIELDS),
+    *(f"voice.{name}" for name in VOICE_FIELDS),
+    "greetings",
+    "boost_days",
+)
+
+
+class MemberStatsRow:
+    """A view of one row of a :class:`MemberStatsTable`.
+
+    Values are read from the table on access, e.g. ``row["level.xp"]``.
+    """
+
+    __slots__ = ("_table", "_index")
+
+    def __init__(self, table: MemberStatsTable, index: int):
+        self._table = table
+        self._index = index
+
+    @property
+    def user_id(self) -> int:
+        return self._table._columns["user_id"][self._index]
+
+    @property
+    def profile_url(self) -> str:
+        return self._table._profile_urls[self._index]
+
+    def __getitem__(self, column: str) -> int:
+        return self._table.column(column)[self._index]
+
+    def to_dict(self) -> dict[str, int | str]:
+        """Return the values of the row by column name."""
+        row: dict[str, int | str] = {
+            name: column[self._index] for name, column in self._table._columns.items()
+        }
+        row["profile_url"] = self.profile_url
+        return row
+
+    def to_model(self) -> MemberStats:
+        """Create a :class:`~cookie.MemberStats` from the row."""
+        columns, i = self._table._columns, self._index
+        return MemberStats.model_validate(
+            {
+                "level": {name: columns[f"level.{name}"][i] for name in LEVEL_FIELDS},
+                "voice": {name: columns[f"voice.{name}"][i] for name in VOICE_FIELDS},
+                "greetings": columns["greetings"][i],
+                "boost_days": columns["boost_days"][i],
+                "profile_url": self.profile_url,
+            }
+        )
+
+    def __repr__(self) -> str:
+        return f"<MemberStatsRow user_id={self.user_id} xp={self['level.xp']}>"
+
+
+class MemberStatsTable:
+    """A columnar container for the stats of many members.
+
+    Each numeric field of :class:`~cookie.MemberStats` is stored in a typed
+    :class:`array.array`, which needs a fraction of the memory of model instances.
+    Nested fields are named with a dot, e.g. ``level.xp`` or ``voice.minutes``.
+    Rows are created on demand as :class:`MemberStatsRow` views.
+
+    .. code-block:: python
+
+        table = await api.get_member_stats_table(guild_id, user_ids)
+        for row in table.top_k("level.xp", 10):
+            print(row.user_id, row["level.xp"])
+
+    Parameters
+    ----------
+    items:
+        ``(user_id, stats)`` tuples to add, where ``stats`` is a :class:`~cookie.MemberStats`
+        or the raw response of the API. Errors, e.g. from
+        :meth:`~cookie.AsyncCookieAPI.iter_member_stats`, are collected in :attr:`errors`.
+    """
+
+    def __init__(self, items: Iterable[tuple[int, MemberStats | Mapping | CookieError]] = ()):
+        self._columns: dict[str, array] = {name: array(_TYPE) for name in COLUMNS}
+        self._profile_urls: list[str] = []
+        self.errors: dict[int, CookieError] = {}
+        """The errors of members that could not be added, by user ID."""
+        self.extend(items)
+
+    def append(self, user_id: int, stats: MemberStats | Mapping | CookieError) -> None:
+        """Add the stats of a member.
+
+        Parameters
+        ----------
+        user_id:
+            The user's ID.
+        stats:
+            A :class:`~cookie.MemberStats`, the raw response of the API or an error.
+        """
+        if isinstance(stats, Exception):
+            self.errors[user_id] = stats
+            return
+        data: Mapping
+        if isinstance(stats, MemberStats):
+            data = stats.model_dump()
+        else:
+            data = cast(Mapping, stats)
+
+        level, voice = data["level"], data["voice"]
+        values = [
+            user_id,
+            *(level[name] for name in LEVEL_FIELDS),
+            *(voice[name] for name in VOICE_FIELDS),
+            data["greetings"],
+            data["boost_days"],
+        ]
+        # Convert all values first, so that a bad response doesn't leave a partial row
+        values = [int(value) for value in values]
+        profile_url = str(data["profile_url"])
+
+        for column, value in zip(self._columns.values(), values):
+            column.append(value)
+        self._profile_urls.append(profile_url)
+
+    def extend(self, items: Iterable[tuple[int, MemberStats | Mapping | CookieError]]) -> None:
+        """Add the stats of many members from ``(user_id, stats)`` tuples."""
+        for user_id, stats in items:
+            self.append(user_id, stats)
+
+    @property
+    def columns(self) -> tuple[str, ...]:
+        """The names of the numeric columns."""
+        return COLUMNS
+
+    def column(self, name: str) -> array:
+        """Return a numeric column as an ``int64`` :class:`array.array`.
+
+        The array is shared with the table and must not be modified.
+        """
+        try:
+            return self._columns[name]
+        except KeyError:
+            raise KeyError(f"Unknown column {name!r}, expected one of {COLUMNS}") from None
+
+    def to_numpy(self, name: str) -> np.ndarray:
+        """Return a numeric column as a read-only NumPy array without copying.
+        Requires ``numpy``.
+        """
+        from .arrays import _numpy
+
+        return _view(_numpy(), self.column(name))
+
+    def __len__(self) -> int:
+        return len(self._profile_urls)
+
+    def __getitem__(self, index: int) -> MemberStatsRow:
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("row index out of range")
+        return MemberStatsRow(self, index)
+
+    def __iter__(self) -> Iterator[MemberStatsRow]:
+        return (MemberStatsRow(self, i) for i in range(len(self)))
+
+    def __repr__(self) -> str:
+        return f"<MemberStatsTable rows={len(self)} errors={len(self.errors)}>"
+
+    def take(self, indices: Iterable[int]) -> MemberStatsTable:
+        """Return a new table with the rows at ``indices``, in that order."""
+        np = _optional_numpy()
+        indices = list(indices)
+        table = MemberStatsTable()
+        for name, column in self._columns.items():
+            if np is not None:
+                taken = array(_TYPE)
+                taken.frombytes(
+                    _view(np, column).take(np.asarray(indices, dtype=np.intp)).tobytes()
+                )
+                table._columns[name] = taken
+            else:
+                table._columns[name] = array(_TYPE, map(column.__getitem__, indices))
+        table._profile_urls = list(map(self._profile_urls.__getitem__, indices))
+        return table
+
+    def argsort(self, column: str, descending: bool = False) -> list[int]:
+        """Return the row indices that sort the table by a column. The sort is stable."""
+        values = self.column(column)
+        np = _optional_numpy()
+        if np is None:
+            return sorted(range(len(self)), key=values.__getitem__, reverse=descending)
+        if not descending:
+            return np.argsort(_view(np, values), kind="stable").tolist()
+        # Sort the reversed column and map the indices back, which keeps ties in their
+        # original order without negating the values (that would overflow for int64 min)
+        order = np.argsort(_view(np, values)[::-1], kind="stable")[::-1]
+        return (len(values) - 1 - order).tolist()
+
+    def sort(self, column: str, descending: bool = False) -> MemberStatsTable:
+        """Return a new table sorted by a column."""
+        return self.take(self.argsort(column, descending))
+
+    def top_k(self, column: str, k: int, largest: bool = True) -> MemberStatsTable:
+        """Return a new table with the ``k`` rows with the largest (or smallest) values
+        of a column, sorted by that column.
+
+        This is faster than :meth:`sort` for small ``k``.
+        """
+        values = self.column(column)
+        select = heapq.nlargest if largest else heapq.nsmallest
+        return self.take(select(k, range(len(self)), key=values.__getitem__))
+
+    def filter(self, column: str, predicate: Callable[[Any], Any]) -> MemberStatsTable:
+        """Return a new table with the rows for which ``predicate`` returns ``True``
+        for the value of a column.
+
+        When ``numpy`` is installed, ``predicate`` is first called once with the whole
+        column as a read-only array. If it returns a boolean array, that is used as the
+        mask of the rows to keep. Otherwise, e.g. if it raises, it is called per value.
+
+        .. code-block:: python
+
+            active = table.filter("voice.minutes", lambda minutes: minutes >= 60)
+        """
+        values = self.column(column)
+        np = _optional_numpy()
+        if np is not None:
+            try:
+                mask = predicate(_view(np, values))
+            except (TypeError, ValueError):
+                mask = None
+            if (
+                isinstance(mask, np.ndarray)
+                and mask.dtype == np.bool_
+                and mask.shape == (len(values),)
+            ):
+                return self.take(np.flatnonzero(mask).tolist())
+        return self.take(i for i, value in enumerate(values) if predicate(value))
+
+
+def _optional_numpy():
+    """Return the ``numpy`` module, or ``None`` if it is not installed."""
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
+
+
+def _view(numpy, column: array) -> np.ndarray:
+    """Return a read-only NumPy view of a column."""
+    values = numpy.frombuffer(column, dtype="int64")
+    values.flags.writeable = False
+    return values
@@ -0,0 +1,217 @@
+"""A local stand-in for the Cookie API to test and benchmark code without network access.
+
+.. code-block:: python
+
+    mock = MockCookieAPI(latency=0.05)
+    api = CookieAPI(api_key="test", httpx_client=httpx.Client(transport=mock.transport()))
+"""
+
+from __future__ import annotations
+
+import asyncio
+import random
+import re
+import threading
+import time
+from collections.abc import Iterable
+from datetime import date, timedelta
+from typing import Any
+
+import httpx
+
+PNG_HEADER = b"\x89PNG\r\n\x1a\n"
+
+
+def _chart(today: date, days: int, start: int = 0) -> dict[str, list]:
+    dates = [today - timedelta(days=days - 1 - i) for i in range(days)]
+    return {"x": [d.isoformat() for d in dates], "y": [start + i for i in range(days)]}
+
+
+class MockCookieAPI:
+    """Serves payloads for every endpoint of the Cookie API through :class:`httpx.MockTransport`.
+
+    The payloads are deterministic: member stats are derived from the user ID and each
+    chart counts up from ``0`` (or ``5`` for voice activity) for ``days`` days up to ``today``.
+
+    Parameters
+    ----------
+    api_keys:
+        The API keys that are accepted. ``None`` accepts every key. Defaults to ``("test",)``.
+    latency:
+        The delay of each response in seconds, or a ``(min, max)`` tuple for a random delay.
+    error_rate:
+        The share of requests that fail with ``error_status``, between ``0`` and ``1``.
+    error_status:
+        The status code of injected errors. Defaults to ``503``.
+    missing_ids:
+        User IDs that return ``404``.
+    forbidden_guild_ids:
+        Guild IDs that return ``403``.
+    today:
+        The last date of all charts. Defaults to the current date.
+    image_size:
+        The size of the returned images in bytes. Defaults to ``264``.
+    seed:
+        The seed for random latency and error injection.
+    """
+
+    def __init__(
+        self,
+        api_keys: Iterable[str] | None = ("test",),
+        latency: float | tuple[float, float] = 0,
+        error_rate: float = 0,
+        error_status: int = 503,
+        missing_ids: Iterable[int] = (),
+        forbidden_guild_ids: Iterable[int] = (),
+        today: date | None = None,
+        image_size: int = 264,
+        seed: int | None = None,
+    ):
+        self.api_keys = None if api_keys is None else set(api_keys)
+        self.latency = latency
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.missing_ids = set(missing_ids)
+        self.forbidden_guild_ids = set(forbidden_guild_ids)
+        self.today = today or date.today()
+        self.image = PNG_HEADER + b"\x00" * max(image_size - len(PNG_HEADER), 0)
+        self.request_count = 0
+
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def payload(self, path: str, days: int = 14) -> dict[str, Any]:
+        """Return the JSON payload for an endpoint path like ``stats/guild/123``."""
+        today = self.today
+        if re.fullmatch(r"stats/guild/\d+", path):
+            return {"members": _chart(today, days, 100), "boosts": _chart(today, days)}
+
+        if re.fullmatch(r"stats/user/\d+", path):
+            timestamp = f"{today.isoformat()}T00:00:00"
+            return {
+                "cookies": 10,
+                "cookie_history": _chart(today, days),
+                "job": {
+                    "career": "baker",
+                    "total_shifts": 1,
+                    "current_shifts": 1,
+                    "job": "cook",
+                    "job_level": 1,
+                    "job_ready": True,
+                    "next_shift": timestamp,
+                },
+                "steals": {
+                    "total": 1,
+                    "users": 1,
+                    "successful": 1,
+                    "cookies_gained": 1,
+                    "cookies_lost": 0,
+                },
+                "oven": {"ready": True, "next": timestamp},
+                "daily": {"ready": True, "next": timestamp, "streak": 1, "max_streak": 2},
+                "profile_url": "https://cookieapp.me",
+            }
+
+        if match := re.fullmatch(r"stats/member/(\d+)/\d+", path):
+            user_id = int(match.group(1))
+            return {
+                "level": {
+                    "msg": user_id,
+                    "xp": user_id * 10,
+                    "level": user_id % 100,
+                    "current_level_progress": 1,
+                    "current_level_end": 2,
+                    "rank": user_id % 1000,
+                    "total_members": 1000,
+                },
+                "voice": {
+                    "minutes": user_id * 2,
+                    "xp": user_id * 3,
+                    "level": user_id % 50,
+                    "rank": user_id % 1000,
+                    "total_members": 1000,
+                    "streak_days": 1,
+                    "cur_voice_min": 0,
+                    "max_voice_min": 60,
+                },
+                "greetings": 1,
+                "boost_days": 0,
+                "profile_url": "https://cookieapp.me",
+            }
+
+        if re.fullmatch(r"activity/(member/\d+/\d+|guild/\d+)", path):
+            msg, voice = _chart(today, days), _chart(today, days, 5)
+            data = {
+                "msg_activity": msg,
+                "voice_activity": voice,
+                "msg_count": sum(msg["y"]),
+                "voice_min": sum(voice["y"]),
+            }
+            if path.startswith("activity/member/"):
+                data.update(msg_rank=1, voice_rank=1, current_voice_min=0)
+            else:
+                data.update(
+                    top_channel=1,
+                    top_channel_messages=1,
+                    most_active_user_day=None,
+                    most_active_user_hour=None,
+                )
+            return data
+
+        raise KeyError(path)
+
+    def respond(self, request: httpx.Request) -> httpx.Response:
+        """Return the response for a request without any latency."""
+        with self._lock:
+            self.request_count += 1
+            failed = self.error_rate and self._random.random() < self.error_rate
+
+        path = request.url.path.split("/v1/", 1)[-1]
+        ids = [int(i) for i in re.findall(r"\d+", path)]
+
+        if self.api_keys is not None and request.headers.get("key") not in self.api_keys:
+            detail = {"status": "invalid_key", "message": "Invalid API key."}
+            return httpx.Response(401, json={"detail": detail})
+        if failed:
+            return httpx.Response(self.error_status, text="Injected error")
+        if self.missing_ids.intersection(ids):
+            detail = {"status": "not_found", "message": "User not found."}
+            return httpx.Response(404, json={"detail": detail})
+        if self.forbidden_guild_ids.intersection(ids):
+            return httpx.Response(403, json={"detail": {"status": "no_guild_access"}})
+        if path.endswith("/image"):
+            return httpx.Response(200, content=self.image, headers={"content-type": "image/png"})
+
+        try:
+            data = self.payload(path, int(request.url.params.get("days", 14)))
+        except KeyError:
+            return httpx.Response(404, json={"detail": {"status": "not_found"}})
+        return httpx.Response(200, json=data)
+
+    def _delay(self) -> float:
+        if isinstance(self.latency, tuple):
+            with self._lock:
+                return self._random.uniform(*self.latency)
+        return self.latency
+
+    def handle(self, request: httpx.Request) -> httpx.Response:
+        """Respond to a request after blocking for the configured latency."""
+        delay = self._delay()
+        if delay:
+            time.sleep(delay)
+        return self.respond(request)
+
+    async def handle_async(self, request: httpx.Request) -> httpx.Response:
+        """Respond to a request after waiting for the configured latency."""
+        delay = self._delay()
+        if delay:
+            await asyncio.sleep(delay)
+        return self.respond(request)
+
+    def transport(self) -> httpx.MockTransport:
+        """Return a transport for :class:`httpx.Client`."""
+        return httpx.MockTransport(self.handle)
+
+    def async_transport(self) -> httpx.MockTransport:
+        """Return a transport for :class:`httpx.AsyncClient`."""
+        return httpx.MockTransport(self.handle_async)
@@ -0,0 +1,326 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .ratelimit import QuotaBudget
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+_ID_NAMES = {"guild": ("guild_id",), "user": ("user_id",), "member": ("user_id", "guild_id")}
+_current: ContextVar[RequestTrace | None] = ContextVar("cookie_request_trace", default=None)
+
+
+def endpoint_template(endpoint: str) -> str:
+    """Replace the IDs of an endpoint with placeholders and remove the query,
+    e.g. ``stats/member/{user_id}/{guild_id}`` for ``stats/member/1/2``.
+    """
+    parts = endpoint.split("?", 1)[0].split("/")
+    names = iter(_ID_NAMES.get(parts[1], ()) if len(parts) > 1 else ())
+    return "/".join(f"{{{next(names, 'id')}}}" if p.isdigit() else p for p in parts)
+
+
+@dataclass
+class RequestEvent:
+    """Describes a finished call to an API endpoint."""
+
+    endpoint: str
+    """The endpoint template, e.g. ``activity/guild/{guild_id}``."""
+    status: int | None
+    """The HTTP status code of the last response, or ``None`` if no response was received."""
+    cache: str
+    """``"hit"`` if the response was served from the cache, ``"stale"`` if an expired response
+    was served from the cache while it is refreshed, ``"coalesced"`` if it was shared with
+    a concurrent call, ``"miss"`` if it was requested from the API."""
+    duration: float
+    """The total time of the call in seconds."""
+    phases: dict[str, float] = field(default_factory=dict)
+    """The time spent in each phase in seconds. Phases are ``connect`` (DNS, TCP and TLS),
+    ``server`` (until the response headers were received), ``read`` (the response body),
+    ``decode`` (JSON decoding) and ``validate`` (model validation). Phases that did not
+    happen are missing."""
+    bytes: int = 0
+    """The size of the response body."""
+    attempts: int = 0
+    """The number of requests that were sent, including retries."""
+    error: str | None = None
+    """The name of the raised exception, if the call failed."""
+
+
+class Tracer:
+    """Base class for objects that receive a :class:`RequestEvent` for every API call.
+
+    Tracers are passed to :class:`~cookie.CookieAPI` or :class:`~cookie.AsyncCookieAPI`
+    with the ``tracers`` parameter.
+    """
+
+    def on_request(self, event: RequestEvent) -> None:
+        raise NotImplementedError
+
+
+class RequestTrace:
+    """Collects the timings of a single call while it is in progress."""
+
+    def __init__(self, endpoint: str):
+        self.endpoint = endpoint
+        self.status: int | None = None
+        self.cache = "miss"
+        self.bytes = 0
+        self.attempts = 0
+        self.error: str | None = None
+        self.phases: dict[str, float] = {}
+        self._started = time.perf_counter()
+        self._marks: dict[str, float] = {}
+
+    def add_phase(self, name: str, seconds: float) -> None:
+        self.phases[name] = self.phases.get(name, 0.0) + seconds
+
+    def on_httpcore_event(self, name: str, info: dict[str, Any]) -> None:
+        now = time.perf_counter()
+        step, _, state = name.rpartition(".")
+        step = step.split(".", 1)[-1]
+        if state == "started":
+            self._marks[step] = now
+            return
+
+        started = self._marks.pop(step, None)
+        if started is None:
+            return
+        if step in ("connect_tcp", "connect_unix_socket", "start_tls"):
+            self.add_phase("connect", now - started)
+        elif step == "receive_response_body":
+            self.add_phase("read", now - started)
+        elif step == "receive_response_headers":
+            sent = self._marks.pop("send_request_headers", started)
+            self.add_phase("server", now - sent)
+        elif step == "send_request_headers":
+            # Keep the start of the request to measure the server time
+            self._marks[step] = started
+
+    async def on_httpcore_event_async(self, name: str, info: dict[str, Any]) -> None:
+        self.on_httpcore_event(name, info)
+
+    def finish(self, tracers: list[Tracer]) -> None:
+        """Send the event for this call to all tracers."""
+        event = self.event()
+        for tracer in tracers:
+            tracer.on_request(event)
+
+    def event(self) -> RequestEvent:
+        return RequestEvent(
+            endpoint=endpoint_template(self.endpoint),
+            status=self.status,
+            cache=self.cache,
+            duration=time.perf_counter() - self._started,
+            phases=dict(self.phases),
+            bytes=self.bytes,
+            attempts=self.attempts,
+            error=self.error,
+        )
+
+
+def current_trace() -> RequestTrace | None:
+    """Return the trace of the call that is in progress in the current context."""
+    return _current.get()
+
+
+@contextmanager
+def trace_request(tracers: list[Tracer], endpoint: str) -> Iterator[RequestTrace | None]:
+    """Trace a call and send the event to all tracers when it is finished.
+    Nested calls reuse the trace of the outer call.
+    """
+    trace = _current.get()
+    if not tracers or trace is not None:
+        yield trace
+        return
+
+    trace = RequestTrace(endpoint)
+    token = _current.set(trace)
+    try:
+        yield trace
+    except BaseException as e:
+        trace.error = type(e).__name__
+        raise
+    finally:
+        _current.reset(token)
+        trace.finish(tracers)
+
+
+class _Histogram:
+    def __init__(self, buckets: tuple[float, ...]):
+        self.counts = [0] * len(buckets)
+        self.sum = 0.0
+        self.count = 0
+        self.buckets = buckets
+
+    def observe(self, value: float) -> None:
+        self.sum += value
+        self.count += 1
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+
+
+def _labels(**labels: Any) -> str:
+    def escape(value: Any) -> str:
+        return str(value).replace("\\", "\\\\").replace('"', '\\"')
+
+    return "{" + ",".join(f'{k}="{escape(v)}"' for k, v in labels.items()) + "}"
+
+
+class MetricsCollector(Tracer):
+    """An in-process aggregator of request counters and latency histograms.
+
+    .. code-block:: python
+
+        metrics = cookie.MetricsCollector()
+        api = cookie.CookieAPI(tracers=[metrics])
+        ...
+        print(metrics.to_prometheus())
+
+    Parameters
+    ----------
+    buckets:
+        The upper bounds of the latency histogram buckets in seconds.
+    quota:
+        A quota budget whose remaining requests are exported as a gauge.
+    """
+
+    def __init__(
+        self, buckets: Iterable[float] = DEFAULT_BUCKETS, quota: QuotaBudget | None = None
+    ):
+        self.buckets = tuple(sorted(buckets))
+        self.quota = quota
+        self.requests: dict[tuple[str, str, str], int] = {}
+        self.bytes: dict[str, int] = {}
+        self.durations: dict[str, _Histogram] = {}
+        self.phases: dict[tuple[str, str], _Histogram] = {}
+        self._lock = threading.Lock()
+
+    def on_request(self, event: RequestEvent) -> None:
+        status = str(event.status) if event.status is not None else "error"
+        key = (event.endpoint, status, event.cache)
+        with self._lock:
+            self.requests[key] = self.requests.get(key, 0) + 1
+            self.bytes[event.endpoint] = self.bytes.get(event.endpoint, 0) + event.bytes
+            self._histogram(self.durations, event.endpoint).observe(event.duration)
+            for phase, seconds in event.phases.items():
+                self._histogram(self.phases, (event.endpoint, phase)).observe(seconds)
+
+    def _histogram(self, histograms: dict, key: Any) -> _Histogram:
+        histogram = histograms.get(key)
+        if histogram is None:
+            histogram = histograms[key] = _Histogram(self.buckets)
+        return histogram
+
+    def reset(self) -> None:
+        """Remove all collected metrics."""
+        with self._lock:
+            self.requests.clear()
+            self.bytes.clear()
+            self.durations.clear()
+            self.phases.clear()
+
+    def to_prometheus(self) -> str:
+        """Export the metrics in the Prometheus text exposition format."""
+        lines = [
+            "# HELP cookie_requests_total Calls to the Cookie API.",
+            "# TYPE cookie_requests_total counter",
+        ]
+        with self._lock:
+            for (endpoint, status, cache), count in sorted(self.requests.items()):
+                labels = _labels(endpoint=endpoint, status=status, cache=cache)
+                lines.append(f"cookie_requests_total{labels} {count}")
+
+            lines += [
+                "# HELP cookie_response_bytes_total Size of the received response bodies.",
+                "# TYPE cookie_response_bytes_total counter",
+            ]
+            for endpoint, size in sorted(self.bytes.items()):
+                lines.append(f"cookie_response_bytes_total{_labels(endpoint=endpoint)} {size}")
+
+            lines += [
+                "# HELP cookie_request_duration_seconds Total duration of calls.",
+                "# TYPE cookie_request_duration_seconds histogram",
+            ]
+            for endpoint, histogram in sorted(self.durations.items()):
+                lines += self._export_histogram(
+                    "cookie_request_duration_seconds", histogram, endpoint=endpoint
+                )
+
+            lines += [
+                "# HELP cookie_request_phase_seconds Duration of the phases of calls.",
+                "# TYPE cookie_request_phase_seconds histogram",
+            ]
+            for (endpoint, phase), histogram in sorted(self.phases.items()):
+                lines += self._export_histogram(
+                    "cookie_request_phase_seconds", histogram, endpoint=endpoint, phase=phase
+                )
+
+        if self.quota is not None:
+            lines += [
+                "# HELP cookie_quota_remaining Requests left in the monthly quota budget.",
+                "# TYPE cookie_quota_remaining gauge",
+                f"cookie_quota_remaining {self.quota.remaining}",
+            ]
+        return "\n".join(lines) + "\n"
+
+    @staticmethod
+    def _export_histogram(name: str, histogram: _Histogram, **labels: str) -> list[str]:
+        lines = [
+            f"{name}_bucket{_labels(**labels, le=bound)} {count}"
+            for bound, count in zip(histogram.buckets, histogram.counts)
+        ]
+        lines += [
+            f"{name}_bucket{_labels(**labels, le='+Inf')} {histogram.count}",
+            f"{name}_sum{_labels(**labels)} {histogram.sum}",
+            f"{name}_count{_labels(**labels)} {histogram.count}",
+        ]
+        return lines
+
+
+class OpenTelemetryTracer(Tracer):
+    """Records request metrics with OpenTelemetry. Requires ``opentelemetry-api``.
+
+    Parameters
+    ----------
+    meter_provider:
+        The meter provider to use. Defaults to the global meter provider.
+    """
+
+    def __init__(self, meter_provider: Any = None):
+        try:
+            from opentelemetry import metrics
+        except ImportError:
+            raise ImportError(
+                "opentelemetry-api is required for this tracer. "
+                "Install it with: pip install cookie-api[opentelemetry]"
+            ) from None
+
+        meter = metrics.get_meter("cookie-api", meter_provider=meter_provider)
+        self._duration = meter.create_histogram(
+            "cookie.request.duration", unit="s", description="Total duration of calls."
+        )
+        self._phase = meter.create_histogram(
+            "cookie.request.phase.duration", unit="s", description="Duration of call phases."
+        )
+        self._bytes = meter.create_counter(
+            "cookie.response.size", unit="By", description="Size of the response bodies."
+        )
+
+    def on_request(self, event: RequestEvent) -> None:
+        attributes = {
+            "endpoint": event.endpoint,
+            "status": event.status if event.status is not None else "error",
+            "cache": event.cache,
+        }
+        self._duration.record(event.duration, attributes)
+        self._bytes.add(event.bytes, attributes)
+        for phase, seconds in event.phases.items():
+            self._phase.record(seconds, {**attributes, "phase": phase})
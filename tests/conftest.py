@@ -0,0 +1,52 @@
+"""Offline fixtures that serve Cookie API payloads through :class:`httpx.MockTransport`."""
+
+from __future__ import annotations
+
+from datetime import date, timedelta
+
+import httpx
+import pytest
+
+from cookie.testing import MockCookieAPI
+
+MISSING_USER_ID = 404
+FORBIDDEN_GUILD_ID = 403
+TODAY = date(2024, 1, 31)
+
+mock_api = MockCookieAPI(
+    missing_ids=[MISSING_USER_ID], forbidden_guild_ids=[FORBIDDEN_GUILD_ID], today=TODAY
+)
+cookie_handler = mock_api.respond
+PNG = mock_api.image
+
+
+def chart(days: int, start: int = 0) -> dict:
+    dates = [TODAY - timedelta(days=days - 1 - i) for i in range(days)]
+    return {"x": [d.isoformat() for d in dates], "y": [start + i for i in range(days)]}
+
+
+class Recorder:
+    """Wraps a handler and records every request path it receives."""
+
+    def __init__(self, handler=cookie_handler):
+        self.handler = handler
+        self.calls: list[str] = []
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.calls.append(request.url.path.removeprefix("/v1/"))
+        return self.handler(request)
+
+
+@pytest.fixture
+def recorder():
+    return Recorder()
+
+
+@pytest.fixture
+def sync_client(recorder):
+    return httpx.Client(transport=httpx.MockTransport(recorder))
+
+
+@pytest.fixture
+def async_client(recorder):
+    return httpx.AsyncClient(transport=httpx.MockTransport(recorder))
@@ -0,0 +1,52 @@
+from datetime import date
+
+import pytest
+
+import cookie
+
+from .conftest import chart
+
+np = pytest.importorskip("numpy")
+arrays = pytest.importorskip("cookie.arrays")
+
+
+def test_chart_to_numpy():
+    data = cookie.Chart(**chart(14))
+    dates, values = data.to_numpy()
+
+    assert dates.dtype == np.dtype("datetime64[D]")
+    assert values.dtype == np.int64
+    assert dates[-1] == np.datetime64("2024-01-31")
+    assert values.tolist() == data.y
+    assert data.to_numpy().values is values
+    assert data == cookie.Chart(**chart(14))
+
+    data.y = [0] * 14
+    assert data.to_numpy().values.tolist() == data.y
+
+
+def test_stack_and_resample():
+    short, long = cookie.Chart(**chart(3)), cookie.Chart(**chart(31))
+    dates, values = arrays.stack_charts([short, long])
+
+    assert values.shape == (2, 31)
+    assert np.isnan(values[0, 0])
+    assert values[0, -3:].tolist() == [0, 1, 2]
+
+    weeks, sums = arrays.resample(dates, values[1], "week")
+    assert weeks[:2].tolist() == [date(2024, 1, 1), date(2024, 1, 8)]
+    assert sums.sum() == sum(range(31))
+
+    months, means = arrays.resample(*long.to_numpy(), period="month", how="mean")
+    assert months.tolist() == [date(2024, 1, 1)]
+    assert means.tolist() == [15.0]
+
+
+def test_vectorized_helpers():
+    values = np.array([[0, 2, 4, 8]])
+
+    assert arrays.rolling_mean(values, 2).tolist() == [[1, 3, 6]]
+    assert arrays.diff(values).tolist() == [[2, 2, 4]]
+    growth = arrays.growth(values)
+    assert np.isnan(growth[0, 0])
+    assert growth[0, 1:].tolist() == [1, 1]
@@ -0,0 +1,178 @@
+import asyncio
+import threading
+import time
+
+import httpx
+import pytest
+
+import cookie
+
+from .conftest import MISSING_USER_ID, cookie_handler
+
+
+@pytest.mark.asyncio
+async def test_many_member_stats_order_and_errors(async_client):
+    pairs = [(1, 10), (MISSING_USER_ID, 10), (3, 10)]
+
+    async with cookie.AsyncCookieAPI(api_key="test", session=async_client) as api:
+        results = await api.get_many_member_stats(pairs)
+
+    assert isinstance(results[0], cookie.MemberStats)
+    assert results[0].level.msg == 1
+    assert isinstance(results[1], cookie.NotFound)
+    assert results[2].level.msg == 3
+
+
+@pytest.mark.asyncio
+async def test_many_bounded_concurrency():
+    in_flight = peak = 0
+
+    async def handler(request):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return cookie_handler(request)
+
+    session = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    async with cookie.AsyncCookieAPI(api_key="test", session=session) as api:
+        results = await api.get_many_user_stats(range(1, 21), concurrency=3)
+
+    assert len(results) == 20
+    assert peak == 3
+
+
+@pytest.mark.asyncio
+async def test_many_connection_errors():
+    calls = []
+
+    async def handler(request):
+        calls.append(request)
+        await asyncio.sleep(0.01)
+        if request.url.path.endswith("/2"):
+            raise httpx.ConnectError("Connection refused", request=request)
+        if request.url.path.endswith("/3"):
+            raise RuntimeError("Unexpected")
+        return cookie_handler(request)
+
+    session = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    async with cookie.AsyncCookieAPI(api_key="test", session=session) as api:
+        results = await api.get_many_user_stats([1, 2], concurrency=1)
+        assert isinstance(results[0], cookie.UserStats)
+        assert isinstance(results[1], cookie.CookieError)
+        assert isinstance(results[1].__cause__, httpx.ConnectError)
+
+        with pytest.raises(RuntimeError):
+            await api.get_many_user_stats(range(3, 23), concurrency=2)
+        # The remaining calls of the batch were cancelled, only requests that were
+        # already in flight may still be sent
+        sent = len(calls)
+        await asyncio.sleep(0.05)
+        assert len(calls) <= sent + 2 < 12
+
+
+def test_map_order_errors_and_progress(sync_client):
+    progress = []
+    pairs = [(1, 10), (MISSING_USER_ID, 10), (3, 10)]
+
+    with cookie.CookieAPI(api_key="test", httpx_client=sync_client) as api:
+        results = api.get_many_member_stats(pairs, progress=lambda *p: progress.append(p))
+
+    assert results[0].level.msg == 1
+    assert isinstance(results[1], cookie.NotFound)
+    assert results[2].level.msg == 3
+    assert sorted(progress) == [(1, 3), (2, 3), (3, 3)]
+
+
+def test_map_connection_errors():
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        time.sleep(0.01)
+        if request.url.path.endswith("/2"):
+            raise httpx.ConnectError("Connection refused", request=request)
+        if request.url.path.endswith("/3"):
+            raise RuntimeError("Unexpected")
+        return cookie_handler(request)
+
+    client = httpx.Client(transport=httpx.MockTransport(handler))
+    with cookie.CookieAPI(api_key="test", httpx_client=client) as api:
+        results = api.get_many_user_stats([1, 2], concurrency=1)
+        assert isinstance(results[0], cookie.UserStats)
+        assert isinstance(results[1].__cause__, httpx.ConnectError)
+
+        with pytest.raises(RuntimeError):
+            api.map(api.get_user_stats, [(i,) for i in range(3, 23)], concurrency=2)
+        assert len(calls) < 10
+
+
+def test_map_bounded_concurrency():
+    lock = threading.Lock()
+    in_flight = peak = 0
+
+    def handler(request):
+        nonlocal in_flight, peak
+        with lock:
+            in_flight += 1
+            peak = max(peak, in_flight)
+        time.sleep(0.01)
+        with lock:
+            in_flight -= 1
+        return cookie_handler(request)
+
+    client = httpx.Client(transport=httpx.MockTransport(handler))
+    with cookie.CookieAPI(api_key="test", httpx_client=client) as api:
+        results = api.map(api.get_user_stats, [(i,) for i in range(1, 21)], concurrency=3)
+
+    assert [r.cookies for r in results] == [10] * 20
+    assert 1 < peak <= 3
+
+
+@pytest.mark.asyncio
+async def test_iter_member_stats_async_input(async_client):
+    async def user_ids():
+        for user_id in (1, MISSING_USER_ID, 3):
+            yield user_id
+
+    async with cookie.AsyncCookieAPI(api_key="test", session=async_client) as api:
+        results = dict([item async for item in api.iter_member_stats(10, user_ids())])
+
+    assert results[1].level.msg == 1
+    assert isinstance(results[MISSING_USER_ID], cookie.NotFound)
+    assert results[3].level.msg == 3
+
+
+@pytest.mark.asyncio
+async def test_iter_backpressure(async_client):
+    pulled = []
+
+    def user_ids():
+        for user_id in range(1, 101):
+            pulled.append(user_id)
+            yield user_id
+
+    async with cookie.AsyncCookieAPI(api_key="test", session=async_client) as api:
+        results = api.iter_user_stats(user_ids(), concurrency=4)
+        await results.__anext__()
+        await asyncio.sleep(0.05)
+        assert len(pulled) == 4
+
+        await results.aclose()
+
+
+@pytest.mark.asyncio
+async def test_iter_connection_errors():
+    def handler(request):
+        if request.url.path.endswith("/2"):
+            raise httpx.ConnectError("Connection refused", request=request)
+        return cookie_handler(request)
+
+    session = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    async with cookie.AsyncCookieAPI(api_key="test", session=session) as api:
+        results = dict([item async for item in api.iter_user_stats([1, 2, 3])])
+
+    assert isinstance(results[1], cookie.UserStats)
+    assert isinstance(results[2].__cause__, httpx.ConnectError)
+    assert isinstance(results[3], cookie.UserStats)
@@ -0,0 +1,141 @@
+import asyncio
+import time
+
+import httpx
+import pytest
+
+import cookie
+
+
+def test_cache_hits_and_invalidation(sync_client, recorder):
+    cache = cookie.ResponseCache()
+    api = cookie.CookieAPI(api_key="test", httpx_client=sync_client, cache=cache)
+
+    first = api.get_guild_stats(1)
+    second = api.get_guild_stats(1)
+    api.get_guild_stats(1, days=30)
+
+    assert first == second
+    assert recorder.calls == ["stats/guild/1", "stats/guild/1"]
+    assert (cache.hits, cache.misses) == (1, 2)
+
+    assert cache.invalidate("stats/guild/1") == 2
+    api.get_guild_stats(1)
+    assert len(recorder.calls) == 3
+
+
+@pytest.mark.asyncio
+async def test_cache_shared_with_async_client(sync_client, async_client, recorder):
+    cache = cookie.ResponseCache()
+    cookie.CookieAPI(api_key="test", httpx_client=sync_client, cache=cache).get_guild_image(1)
+
+    async with cookie.AsyncCookieAPI(api_key="test", session=async_client, cache=cache) as api:
+        await api.get_guild_image(1)
+
+    assert len(recorder.calls) == 1
+
+
+def test_cache_eviction():
+    cache = cookie.ResponseCache(max_entries=2, max_bytes=100)
+    cache.set("stats/user/1", {}, 10)
+    cache.set("stats/user/2", {}, 10)
+    cache.get("stats/user/1")
+    cache.set("stats/user/3", {}, 10)
+
+    assert "stats/user/2" not in cache
+    assert "stats/user/1" in cache
+
+    cache.set("stats/user/4", {}, 95)
+    assert len(cache) == 1
+    assert cache.size == 95
+
+
+def test_cache_ttl_disabled():
+    cache = cookie.ResponseCache(image_ttl=0)
+    cache.set("activity/guild/1/image?days=14", b"png", 3)
+    assert len(cache) == 0
+
+
+def test_cache_window_subsumption(sync_client, recorder):
+    cache = cookie.ResponseCache(subsume_windows=True)
+    api = cookie.CookieAPI(api_key="test", httpx_client=sync_client, cache=cache)
+
+    wide = api.get_guild_stats(1, days=30)
+    narrow = api.get_guild_stats(1, days=7)
+
+    assert recorder.calls == ["stats/guild/1"]
+    assert narrow.members.x == wide.members.x[-7:]
+    assert narrow.boosts.y == wide.boosts.y[-7:]
+
+    api.get_guild_stats(1, days=60)
+    assert len(recorder.calls) == 2
+
+    # Activity has ranks and totals that can't be derived from a wider window
+    api.get_guild_activity(1, days=30)
+    api.get_guild_activity(1, days=7)
+    api.get_member_activity(1, 2, days=30)
+    api.get_member_activity(1, 2, days=7)
+    assert recorder.calls[2:] == ["activity/guild/1"] * 2 + ["activity/member/1/2"] * 2
+
+
+@pytest.mark.asyncio
+async def test_inflight_window_subsumption(recorder):
+    async def handler(request):
+        await asyncio.sleep(0.01)
+        return recorder(request)
+
+    cache = cookie.ResponseCache(subsume_windows=True)
+    session = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    async with cookie.AsyncCookieAPI(api_key="test", session=session, cache=cache) as api:
+        wide, narrow = await asyncio.gather(
+            api.get_guild_stats(1, days=30), api.get_guild_stats(1, days=14)
+        )
+
+    assert recorder.calls == ["stats/guild/1"]
+    assert narrow.members.y == wide.members.y[-14:]
+
+
+def test_stale_while_revalidate(sync_client, recorder):
+    cache = cookie.ResponseCache(activity_ttl=0.01, stale_ttl=60)
+    with cookie.CookieAPI(api_key="test", httpx_client=sync_client, cache=cache) as api:
+        first = api.get_guild_activity(1)
+        assert first.age is not None and not first.is_stale
+
+        time.sleep(0.02)
+        stale = api.get_guild_activity(1)
+        assert stale.is_stale
+        assert abs((stale.fetched_at - first.fetched_at).total_seconds()) < 0.01
+        assert stale == first
+
+        deadline = time.monotonic() + 1
+        while cache.lookup("activity/guild/1?days=14").stale and time.monotonic() < deadline:
+            time.sleep(0.005)
+        assert not api.get_guild_activity(1).is_stale
+
+    assert recorder.calls == ["activity/guild/1", "activity/guild/1"]
+
+
+@pytest.mark.asyncio
+async def test_stale_while_revalidate_async(async_client, recorder):
+    cache = cookie.ResponseCache(stats_ttl=0.01, stale_ttl=60)
+    async with cookie.AsyncCookieAPI(api_key="test", session=async_client, cache=cache) as api:
+        await api.get_member_stats(1, 2)
+        await asyncio.sleep(0.02)
+
+        stale = await asyncio.gather(*(api.get_member_stats(1, 2) for _ in range(3)))
+        assert all(stats.is_stale for stats in stale)
+
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+        assert not (await api.get_member_stats(1, 2)).is_stale
+
+    assert len(recorder.calls) == 2
+
+
+def test_stale_max_age():
+    cache = cookie.ResponseCache(stats_ttl=0.01, stale_ttl=0.01)
+    cache.set("stats/user/1", {}, 2)
+    time.sleep(0.03)
+
+    assert cache.lookup("stats/user/1") is None
+    assert len(cache) == 0
@@ -0,0 +1,53 @@
+from datetime import date
+
+import cookie
+
+from .conftest import chart
+
+
+def test_chart_index():
+    data = cookie.Chart(**chart(30))
+    day = date(2024, 1, 31)
+
+    assert data[day] == 29
+    assert data._mapping() is data._mapping()
+    assert len(data) == 30
+    assert list(data.keys()) == data.x
+    assert day in data
+
+    data.x.append(date(2024, 2, 1))
+    data.y.append(30)
+    assert data[date(2024, 2, 1)] == 30
+
+    data.y = [0] * len(data.x)
+    assert data[day] == 0
+
+    copy = data.to_dict()
+    copy[day] = 5
+    assert data[day] == 0
+
+
+def test_chart_equality(sync_client):
+    a, b = cookie.Chart(**chart(30)), cookie.Chart(**chart(30))
+    a[date(2024, 1, 31)]
+    assert a == b
+    assert a != cookie.Chart(**chart(29))
+
+    api = cookie.CookieAPI(api_key="test", httpx_client=sync_client)
+    activity, other = api.get_guild_activity(1), api.get_guild_activity(1)
+    activity.msg_activity.items()
+    assert activity == other
+
+
+def test_chart_ranges():
+    data = cookie.Chart(**chart(30))
+
+    window = data.between(date(2024, 1, 10), date(2024, 1, 12))
+    assert isinstance(window, cookie.Chart)
+    assert window.x == [date(2024, 1, 10), date(2024, 1, 11), date(2024, 1, 12)]
+    assert window.y == [8, 9, 10]
+    assert len(data.between(start=date(2024, 1, 30))) == 2
+
+    assert data.nearest(date(2023, 1, 1)) == date(2024, 1, 2)
+    assert data.nearest(date(2025, 1, 1)) == date(2024, 1, 31)
+    assert data.nearest(date(2024, 1, 15)) == date(2024, 1, 15)
@@ -0,0 +1,53 @@
+import asyncio
+import threading
+import time
+
+import httpx
+import pytest
+
+import cookie
+
+from .conftest import MISSING_USER_ID, Recorder, cookie_handler
+
+
+@pytest.mark.asyncio
+async def test_async_coalescing():
+    async def handler(request):
+        await asyncio.sleep(0.01)
+        return cookie_handler(request)
+
+    recorder = Recorder(handler)
+    session = httpx.AsyncClient(transport=httpx.MockTransport(recorder))
+
+    async with cookie.AsyncCookieAPI(api_key="test", session=session) as api:
+        results = await asyncio.gather(*(api.get_guild_activity(1) for _ in range(10)))
+        errors = await asyncio.gather(
+            *(api.get_user_stats(MISSING_USER_ID) for _ in range(3)), return_exceptions=True
+        )
+
+    assert len({id(r) for r in results}) == 10
+    assert all(r == results[0] for r in results)
+    assert all(isinstance(e, cookie.NotFound) for e in errors)
+    assert len(recorder.calls) == 2
+
+
+def test_sync_coalescing():
+    def handler(request):
+        time.sleep(0.05)
+        return cookie_handler(request)
+
+    recorder = Recorder(handler)
+    api = cookie.CookieAPI(
+        api_key="test", httpx_client=httpx.Client(transport=httpx.MockTransport(recorder))
+    )
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(api.get_guild_activity(1))) for _ in range(5)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(results) == 5
+    assert len(recorder.calls) == 1
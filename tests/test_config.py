@@ -0,0 +1,71 @@
+import httpx
+import pytest
+
+import cookie
+
+from .conftest import Recorder
+
+
+def test_config_base_url():
+    recorder = Recorder()
+    client = httpx.Client(transport=httpx.MockTransport(recorder))
+    config = cookie.ClientConfig(base_url="http://localhost:8000/v1/")
+
+    with cookie.CookieAPI(api_key="test", httpx_client=client, config=config) as api:
+        api.get_user_stats(1)
+
+    assert client.is_closed
+    assert recorder.calls == ["stats/user/1"]
+
+
+def test_config_client_kwargs():
+    config = cookie.ClientConfig(max_connections=5, keepalive_expiry=60, read_timeout=3)
+    api = cookie.CookieAPI(api_key="test", config=config)
+
+    pool = api._httpx_client._transport._pool
+    assert pool._max_connections == 5
+    assert pool._keepalive_expiry == 60
+    assert api._httpx_client.timeout.read == 3
+    api.close()
+
+
+def test_shared_pool():
+    config = cookie.ClientConfig(max_connections=7)
+    api1 = cookie.CookieAPI(api_key="a", config=config, shared_pool=True)
+    api2 = cookie.CookieAPI(api_key="b", config=config, shared_pool=True)
+    other = cookie.CookieAPI(api_key="a", shared_pool=True)
+
+    client = api1._httpx_client
+    assert api2._httpx_client is client
+    assert other._httpx_client is not client
+
+    api1.close()
+    api1.close()
+    assert not client.is_closed
+    api2.close()
+    assert client.is_closed
+    api2.close()
+
+    other.close()
+    assert other._httpx_client.is_closed
+
+
+@pytest.mark.asyncio
+async def test_shared_pool_async():
+    api1 = cookie.AsyncCookieAPI(api_key="a", shared_pool=True)
+    api2 = cookie.AsyncCookieAPI(api_key="b", shared_pool=True)
+    await api1._setup()
+    await api2._setup()
+
+    session = api1._session
+    assert api2._session is session
+
+    await api1.close()
+    assert not session.is_closed
+    await api2.close()
+    assert session.is_closed
+
+
+def test_shared_pool_with_client():
+    with pytest.raises(ValueError):
+        cookie.CookieAPI(api_key="a", httpx_client=httpx.Client(), shared_pool=True)
@@ -0,0 +1,19 @@
+import pytest
+
+import cookie
+from cookie._internal import get_decoder
+
+
+@pytest.mark.parametrize("backend", ["json", "orjson", "msgspec"])
+def test_json_backends(sync_client, backend):
+    pytest.importorskip(backend)
+    api = cookie.CookieAPI(api_key="test", httpx_client=sync_client, json_backend=backend)
+    reference = cookie.CookieAPI(api_key="test", httpx_client=sync_client)
+
+    assert api.get_guild_activity(1) == reference.get_guild_activity(1)
+    assert api.get_user_stats(1) == reference.get_user_stats(1)
+
+
+def test_unknown_backend():
+    with pytest.raises(ValueError):
+        get_decoder("yaml")
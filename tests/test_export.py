@@ -0,0 +1,63 @@
+import json
+
+import pytest
+
+import cookie
+from cookie.export import load_manifest
+
+from .conftest import FORBIDDEN_GUILD_ID, PNG
+
+
+def mode(path):
+    return path.stat().st_mode & 0o777
+
+
+def default_mode(directory):
+    """The mode of a file created with open()."""
+    path = directory / "regular"
+    path.write_bytes(b"")
+    try:
+        return mode(path)
+    finally:
+        path.unlink()
+
+
+def test_export_guild_images(sync_client, recorder, tmp_path):
+    with cookie.CookieAPI(api_key="test", httpx_client=sync_client) as api:
+        first = api.export_guild_images([1, 2, FORBIDDEN_GUILD_ID], tmp_path)
+        mtime = (tmp_path / "guild_1.png").stat().st_mtime_ns
+        second = api.export_guild_images([1], tmp_path)
+
+    assert first[1].path == "guild_1.png"
+    assert first[1].size == len(PNG) and first[1].changed
+    assert isinstance(first[FORBIDDEN_GUILD_ID], cookie.NoGuildAccess)
+    assert (tmp_path / "guild_2.png").read_bytes() == PNG
+    assert len(recorder.calls) == 4
+
+    assert second[1].sha256 == first[1].sha256
+    assert not second[1].changed
+    assert (tmp_path / "guild_1.png").stat().st_mtime_ns == mtime
+
+    manifest = load_manifest(tmp_path)
+    assert set(manifest) == {"guild_1.png", "guild_2.png"}
+    assert not manifest["guild_1.png"].changed
+    assert not [p for p in tmp_path.iterdir() if p.suffix == ".tmp"]
+    for name in ("guild_1.png", "manifest.json"):
+        assert mode(tmp_path / name) == default_mode(tmp_path)
+
+
+@pytest.mark.asyncio
+async def test_export_member_images_rewrites_missing(async_client, tmp_path, monkeypatch):
+    monkeypatch.setattr("cookie.export.SPOOL_SIZE", 16)
+
+    async with cookie.AsyncCookieAPI(api_key="test", session=async_client) as api:
+        await api.export_member_images([(1, 2)], tmp_path)
+        (tmp_path / "member_1_2.png").unlink()
+        result = await api.export_member_images([(1, 2)], tmp_path)
+
+    assert result[(1, 2)].changed
+    assert (tmp_path / "member_1_2.png").read_bytes() == PNG
+    data = json.loads((tmp_path / "manifest.json").read_text())
+    assert data["member_1_2.png"]["size"] == len(PNG)
+    # Spooled into a temporary file, as the image is larger than SPOOL_SIZE
+    assert mode(tmp_path / "member_1_2.png") == default_mode(tmp_path)
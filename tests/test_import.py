@@ -0,0 +1,43 @@
+import subprocess
+import sys
+
+HEAVY_MODULES = ("httpx", "pydantic", "dotenv", "cookie.api", "cookie.models")
+
+
+def run(code: str) -> str:
+    return subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    ).stdout.strip()
+
+
+def test_import_is_lazy():
+    loaded = run(f"import sys, cookie; print([m for m in {HEAVY_MODULES!r} if m in sys.modules])")
+    assert loaded == "[]"
+
+
+def test_import_time():
+    """Guards the import time of the package itself, excluding the interpreter startup."""
+    code = "import time; start = time.perf_counter(); import cookie; print(time.perf_counter() - start)"
+    lazy = min(float(run(code)) for _ in range(3))
+
+    code = code.replace("import cookie;", "import cookie; cookie.CookieAPI; cookie.GuildStats;")
+    eager = min(float(run(code)) for _ in range(3))
+
+    assert lazy < eager / 2
+
+
+def test_lazy_attributes():
+    code = "import cookie; print(cookie.CookieAPI.__module__, cookie.UserStats.__module__)"
+    assert run(code) == "cookie.api cookie.models"
+
+    names = run("from cookie import *; print(sorted(k for k in dir() if not k.startswith('_')))")
+    for name in ("AsyncCookieAPI", "CookieAPI", "GuildStats", "NotFound", "ResponseCache"):
+        assert repr(name) in names
+
+
+def test_submodule_attributes():
+    code = "import cookie; print(cookie.api.BASE_URL, cookie.models.Chart.__name__, cookie.testing)"
+    assert run(code).startswith("https://api.cookieapp.me/v1/ Chart <module 'cookie.testing'")
+
+    code = "import cookie; print(hasattr(cookie, 'missing'), hasattr(cookie, '_missing'))"
+    assert run(code) == "False False"
@@ -0,0 +1,116 @@
+import httpx
+import pytest
+
+import cookie
+from cookie.testing import MockCookieAPI
+
+mock_api = MockCookieAPI(api_keys=None)
+
+
+class KeyHandler:
+    """Exceeds the quota of ``exhausted`` and denies ``denied`` access to guild 7."""
+
+    def __init__(self, exhausted=(), denied=()):
+        self.exhausted = set(exhausted)
+        self.denied = set(denied)
+        self.keys: list[str] = []
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        key = request.headers["key"]
+        self.keys.append(key)
+        if key in self.exhausted:
+            detail = {"status": "quota_exceeded", "message": "Quota exceeded."}
+            return httpx.Response(401, json={"detail": detail})
+        if key in self.denied and "/7" in request.url.path:
+            return httpx.Response(403, json={"detail": {"status": "no_guild_access"}})
+        return mock_api.respond(request)
+
+
+def make_api(handler, pool):
+    return cookie.CookieAPI(
+        api_key=pool, httpx_client=httpx.Client(transport=httpx.MockTransport(handler))
+    )
+
+
+def test_round_robin_and_usage():
+    handler = KeyHandler()
+    pool = cookie.KeyPool(["a", "b", "c"])
+    api = make_api(handler, pool)
+    for user_id in range(4):
+        api.get_user_stats(user_id)
+
+    assert handler.keys == ["a", "b", "c", "a"]
+    assert pool.usage == {"a": 2, "b": 1, "c": 1}
+
+
+def test_least_used():
+    pool = cookie.KeyPool(["a", "b"], strategy="least_used")
+    pool.acquire("stats/user/1")
+    pool.acquire("stats/user/1")
+    pool.retire("a")
+    pool.acquire("stats/user/1")
+
+    assert pool.usage == {"a": 1, "b": 2}
+    assert pool.acquire("stats/user/1") == "b"
+
+
+def test_quota_exceeded_retires_key():
+    handler = KeyHandler(exhausted={"a"})
+    pool = cookie.KeyPool(["a", "b"])
+    api = make_api(handler, pool)
+
+    assert api.get_user_stats(1).cookies == 10
+    api.get_user_stats(2)
+    assert handler.keys == ["a", "b", "b"]
+    assert pool.available == ["b"]
+
+    pool.retire("b")
+    with pytest.raises(cookie.QuotaExceeded):
+        api.get_user_stats(3)
+
+
+def test_no_guild_access_excludes_key_for_guild():
+    handler = KeyHandler(denied={"a"})
+    pool = cookie.KeyPool(["a", "b"])
+    api = make_api(handler, pool)
+
+    api.get_guild_stats(7)
+    api.get_guild_stats(8)
+    assert api.get_guild_image(7) == mock_api.image
+    assert handler.keys == ["a", "b", "a", "b"]
+
+
+@pytest.mark.asyncio
+async def test_async_no_access_for_any_key():
+    handler = KeyHandler(denied={"a", "b"})
+    session = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    async with cookie.AsyncCookieAPI(api_key=cookie.KeyPool(["a", "b"]), session=session) as api:
+        with pytest.raises(cookie.NoGuildAccess):
+            await api.get_member_stats(1, 7)
+        with pytest.raises(cookie.NoGuildAccess):
+            await api.get_guild_image(7)
+
+    assert handler.keys == ["a", "b"]
+
+
+def test_rejected_calls_dont_use_keys():
+    pool = cookie.KeyPool(["a", "b"])
+    breaker = cookie.CircuitBreaker(failure_threshold=1, recovery_time=60)
+    breaker.record_failure()
+    api = cookie.CookieAPI(
+        api_key=pool,
+        httpx_client=httpx.Client(transport=httpx.MockTransport(KeyHandler())),
+        circuit_breaker=breaker,
+    )
+    for _ in range(5):
+        with pytest.raises(cookie.CircuitOpen):
+            api.get_user_stats(1)
+    assert pool.usage == {"a": 0, "b": 0}
+
+    # A trial whose key can't be acquired doesn't keep the circuit half-open
+    breaker.recovery_time = 0
+    pool.retire("a")
+    pool.retire("b")
+    with pytest.raises(cookie.QuotaExceeded):
+        api.get_user_stats(1)
+    assert breaker.before_request()
@@ -0,0 +1,35 @@
+import pickle
+
+import pytest
+from pydantic import ValidationError
+
+import cookie
+from cookie._internal import lazy_model
+
+
+def test_lazy_models(sync_client):
+    api = cookie.CookieAPI(api_key="test", httpx_client=sync_client, lazy=True)
+    eager = cookie.CookieAPI(api_key="test", httpx_client=sync_client)
+
+    stats = api.get_user_stats(1)
+    assert isinstance(stats, cookie.UserStats)
+    assert stats.__dict__ == {}
+
+    assert stats.cookies == 10
+    assert isinstance(stats.job, cookie.Work)
+    assert set(stats.__dict__) == {"cookies", "job"}
+
+    assert stats == eager.get_user_stats(1)
+    assert stats.model_dump() == eager.get_user_stats(1).model_dump()
+    assert pickle.loads(pickle.dumps(stats)).cookies == 10
+
+
+def test_lazy_validation_errors():
+    stats = lazy_model(cookie.MemberStats, {"greetings": "many"})
+
+    with pytest.raises(ValidationError):
+        stats.greetings
+    with pytest.raises(ValidationError):
+        stats.boost_days
+    with pytest.raises(AttributeError):
+        stats.unknown
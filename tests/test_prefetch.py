@@ -0,0 +1,83 @@
+import asyncio
+import time
+
+import pytest
+
+import cookie
+
+
+@pytest.mark.asyncio
+async def test_hot_keys_are_refreshed(async_client, recorder):
+    api = cookie.AsyncCookieAPI(api_key="test", session=async_client, cache=cookie.ResponseCache())
+    async with api, cookie.PrefetchScheduler(api, interval=0.02, promote_at=2) as scheduler:
+        await api.get_guild_stats(1)
+        await api.get_guild_stats(1)
+        await api.get_user_stats(1)
+        assert scheduler.hot_keys == ["stats/guild/1?days=14"]
+
+        await asyncio.sleep(0.1)
+
+    assert scheduler.refreshes >= 2
+    assert recorder.calls.count("stats/guild/1") == 1 + scheduler.refreshes
+    assert recorder.calls.count("stats/user/1") == 1
+
+
+@pytest.mark.asyncio
+async def test_demote_and_pin(async_client):
+    api = cookie.AsyncCookieAPI(api_key="test", session=async_client, cache=cookie.ResponseCache())
+    scheduler = cookie.PrefetchScheduler(api, interval=0.01, promote_at=1)
+    scheduler.start()
+    scheduler.pin_member(1, 2)
+    await api.get_guild_activity(1)
+    assert len(scheduler.hot_keys) == 2
+
+    await asyncio.sleep(0.05)
+    assert scheduler.hot_keys == ["stats/member/1/2"]
+
+    await scheduler.stop()
+    await api.get_guild_activity(1)
+    assert scheduler.hot_keys == ["stats/member/1/2"]
+    await api.close()
+
+
+@pytest.mark.asyncio
+async def test_quota_reserve_pauses_refreshes(async_client, recorder):
+    quota = cookie.QuotaBudget(limit=1, reserve=1)
+    api = cookie.AsyncCookieAPI(
+        api_key="test", session=async_client, cache=cookie.ResponseCache(), quota=quota
+    )
+    scheduler = cookie.PrefetchScheduler(api, interval=0.01)
+    scheduler.pin_guild(1)
+    await asyncio.sleep(0.02)
+
+    assert await scheduler.tick() == 0
+    assert recorder.calls == []
+    assert quota.remaining == 1
+
+
+def test_requires_cache():
+    with pytest.raises(ValueError):
+        cookie.PrefetchScheduler(cookie.AsyncCookieAPI(api_key="test"))
+
+
+@pytest.mark.asyncio
+async def test_pause_then_resume(async_client):
+    api = cookie.AsyncCookieAPI(api_key="test", session=async_client, cache=cookie.ResponseCache())
+    scheduler = cookie.PrefetchScheduler(api, interval=0.05, jitter=0)
+    scheduler.pin_guild(1)
+    ticks = 0
+    tick = scheduler.tick
+
+    async def counting_tick():
+        nonlocal ticks
+        ticks += 1
+        return await tick()
+
+    scheduler.tick = counting_tick
+    # As if the quota had been exhausted
+    scheduler._paused_until = time.monotonic() + 0.05
+    async with api, scheduler:
+        await asyncio.sleep(0.3)
+
+    assert scheduler.refreshes >= 4
+    assert ticks < 30
@@ -0,0 +1,60 @@
+import time
+
+import httpx
+import pytest
+
+import cookie
+
+
+def test_rate_limiter_burst():
+    limiter = cookie.RateLimiter(rate=20, burst=2)
+    start = time.monotonic()
+    for _ in range(4):
+        limiter.acquire()
+
+    assert time.monotonic() - start >= 0.09
+
+
+@pytest.mark.asyncio
+async def test_rate_limiter_async(async_client):
+    limiter = cookie.RateLimiter(rate=50, burst=1)
+    start = time.monotonic()
+    async with cookie.AsyncCookieAPI(
+        api_key="test", session=async_client, rate_limiter=limiter
+    ) as api:
+        await api.get_many_user_stats(range(1, 4))
+
+    assert time.monotonic() - start >= 0.04
+
+
+def test_quota_budget(sync_client, recorder, tmp_path):
+    budget = cookie.QuotaBudget(limit=3, reserve=2)
+    api = cookie.CookieAPI(api_key="test", httpx_client=sync_client, quota=budget)
+
+    with cookie.low_priority():
+        api.get_user_stats(1)
+        with pytest.raises(cookie.QuotaExceeded):
+            api.get_user_stats(2)
+
+    api.get_user_stats(3)
+    assert budget.remaining == 1
+
+    path = tmp_path / "quota.json"
+    budget.save(path)
+    loaded = cookie.QuotaBudget.load(path)
+    assert (loaded.limit, loaded.used) == (3, 2)
+    assert len(recorder.calls) == 2
+
+
+def test_quota_exhausted_by_api():
+    def handler(request):
+        detail = {"status": "quota_exceeded", "message": "Out of quota"}
+        return httpx.Response(401, json={"detail": detail})
+
+    budget = cookie.QuotaBudget(limit=100)
+    client = httpx.Client(transport=httpx.MockTransport(handler))
+    api = cookie.CookieAPI(api_key="test", httpx_client=client, quota=budget)
+
+    with pytest.raises(cookie.QuotaExceeded):
+        api.get_user_stats(1)
+    assert budget.remaining == 0
@@ -0,0 +1,304 @@
+import asyncio
+import threading
+import time
+
+import httpx
+import pytest
+
+import cookie
+
+from .conftest import MISSING_USER_ID, Recorder, cookie_handler
+
+
+def flaky(failures: int):
+    def handler(request):
+        nonlocal failures
+        if failures:
+            failures -= 1
+            return httpx.Response(503, text="Service Unavailable")
+        return cookie_handler(request)
+
+    return Recorder(handler)
+
+
+def make_api(recorder, **kwargs):
+    client = httpx.Client(transport=httpx.MockTransport(recorder))
+    return cookie.CookieAPI(api_key="test", httpx_client=client, **kwargs)
+
+
+def test_retry_server_errors():
+    recorder = flaky(2)
+    api = make_api(recorder, retry=cookie.RetryPolicy(backoff=0.001))
+
+    assert isinstance(api.get_user_stats(1), cookie.UserStats)
+    assert len(recorder.calls) == 3
+
+
+def test_retry_gives_up():
+    recorder = flaky(5)
+    api = make_api(recorder, retry=cookie.RetryPolicy(max_attempts=2, backoff=0.001))
+
+    with pytest.raises(cookie.CookieError, match="503"):
+        api.get_user_stats(1)
+    assert len(recorder.calls) == 2
+
+
+def test_retry_after():
+    policy = cookie.RetryPolicy(max_backoff=1, jitter=False)
+    started = time.monotonic()
+
+    def response(retry_after: str) -> httpx.Response:
+        return httpx.Response(429, headers={"retry-after": retry_after})
+
+    assert policy.next_delay(1, started, response=response("1")) == 1
+    assert policy.next_delay(1, started, response=response("86400")) is None
+
+    policy = cookie.RetryPolicy(max_backoff=60, deadline=5)
+    assert policy.next_delay(1, started, response=response("30")) is None
+
+
+def test_no_retry_for_not_found(sync_client, recorder):
+    retry = cookie.RetryPolicy(statuses=(404, 503), backoff=0.001)
+    api = cookie.CookieAPI(api_key="test", httpx_client=sync_client, retry=retry)
+
+    with pytest.raises(cookie.NotFound):
+        api.get_user_stats(MISSING_USER_ID)
+    assert len(recorder.calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_retry_connection_errors():
+    failures = 1
+
+    def handler(request):
+        nonlocal failures
+        if failures:
+            failures -= 1
+            raise httpx.ConnectError("Connection refused", request=request)
+        return cookie_handler(request)
+
+    session = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    retry = cookie.RetryPolicy(backoff=0.001)
+    async with cookie.AsyncCookieAPI(api_key="test", session=session, retry=retry) as api:
+        assert isinstance(await api.get_user_stats(1), cookie.UserStats)
+
+
+def test_circuit_breaker():
+    recorder = flaky(3)
+    breaker = cookie.CircuitBreaker(failure_threshold=2, recovery_time=60)
+    api = make_api(recorder, circuit_breaker=breaker)
+
+    for _ in range(2):
+        with pytest.raises(cookie.CookieError, match="503"):
+            api.get_user_stats(1)
+    with pytest.raises(cookie.CircuitOpen):
+        api.get_user_stats(1)
+    assert len(recorder.calls) == 2
+    assert breaker.state == "open"
+
+    breaker.recovery_time = 0
+    with pytest.raises(cookie.CookieError, match="503"):
+        api.get_user_stats(1)
+    api.get_user_stats(1)
+    assert breaker.state == "closed"
+
+
+def test_circuit_breaker_rejected_trial():
+    breaker = cookie.CircuitBreaker(failure_threshold=1, recovery_time=0)
+    quota = cookie.QuotaBudget(limit=1)
+    api = make_api(flaky(1), circuit_breaker=breaker, quota=quota)
+
+    with pytest.raises(cookie.CookieError, match="503"):
+        api.get_user_stats(1)
+    with pytest.raises(cookie.QuotaExceeded):
+        api.get_user_stats(1)
+    assert breaker.state == "half_open"
+
+    quota.limit = 10
+    api.get_user_stats(1)
+    assert breaker.state == "closed"
+
+
+@pytest.mark.asyncio
+async def test_circuit_breaker_cancelled_trial():
+    async def handler(request):
+        await asyncio.sleep(1)
+        return cookie_handler(request)
+
+    breaker = cookie.CircuitBreaker(failure_threshold=1, recovery_time=0)
+    breaker.record_failure()
+    session = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    async with cookie.AsyncCookieAPI(
+        api_key="test", session=session, coalesce=False, circuit_breaker=breaker
+    ) as api:
+        with cookie.deadline(0.05), pytest.raises(cookie.DeadlineExceeded):
+            await api.get_user_stats(1)
+
+    assert breaker.before_request()
+
+
+def test_deadline_stops_retries():
+    recorder = flaky(5)
+    api = make_api(recorder, retry=cookie.RetryPolicy(backoff=1, jitter=False))
+
+    started = time.monotonic()
+    with cookie.deadline(0.5), pytest.raises(cookie.CookieError) as e:
+        api.get_user_stats(1)
+
+    assert not isinstance(e.value, cookie.DeadlineExceeded)
+    assert time.monotonic() - started < 0.5
+    assert len(recorder.calls) == 1
+
+
+def test_deadline_rate_limit():
+    api = make_api(Recorder(), rate_limiter=cookie.RateLimiter(rate=1))
+    api.get_user_stats(1)
+
+    with cookie.deadline(0.1), pytest.raises(cookie.DeadlineExceeded):
+        api.get_user_stats(2)
+    with cookie.deadline(10), cookie.deadline(0.1), pytest.raises(cookie.DeadlineExceeded):
+        api.get_user_stats(2)
+
+
+def test_deadline_rate_limit_keeps_quota():
+    quota = cookie.QuotaBudget(limit=10)
+    api = make_api(Recorder(), rate_limiter=cookie.RateLimiter(rate=0.1), quota=quota)
+    api.get_user_stats(1)
+
+    for user_id in range(2, 5):
+        with cookie.deadline(0.05), pytest.raises(cookie.DeadlineExceeded):
+            api.get_user_stats(user_id)
+    assert quota.used == 1
+
+
+@pytest.mark.asyncio
+async def test_deadline_async_request():
+    async def handler(request):
+        await asyncio.sleep(1)
+        return cookie_handler(request)
+
+    session = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    async with cookie.AsyncCookieAPI(api_key="test", session=session) as api:
+        with cookie.deadline(0.05), pytest.raises(cookie.DeadlineExceeded):
+            await api.get_guild_stats(1)
+
+
+@pytest.mark.asyncio
+async def test_deadline_coalesced_async():
+    recorder = Recorder()
+
+    async def handler(request):
+        await asyncio.sleep(0.2)
+        return recorder(request)
+
+    async def with_deadline():
+        with cookie.deadline(0.05):
+            return await api.get_guild_stats(1)
+
+    async def without_deadline():
+        # Join the request that was started with the deadline
+        await asyncio.sleep(0.01)
+        return await api.get_guild_stats(1)
+
+    session = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    async with cookie.AsyncCookieAPI(api_key="test", session=session, coalesce=True) as api:
+        results = await asyncio.gather(with_deadline(), without_deadline(), return_exceptions=True)
+
+    assert isinstance(results[0], cookie.DeadlineExceeded)
+    assert isinstance(results[1], cookie.GuildStats)
+    assert len(recorder.calls) == 1
+
+
+def test_deadline_coalesced_sync():
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        if len(calls) == 1:
+            time.sleep(0.1)
+            raise httpx.ReadTimeout("Timed out", request=request)
+        return cookie_handler(request)
+
+    api = make_api(handler, coalesce=True)
+    results = {}
+
+    def with_deadline():
+        with cookie.deadline(0.05):
+            try:
+                api.get_guild_stats(1)
+            except cookie.DeadlineExceeded as e:
+                results["deadline"] = e
+
+    thread = threading.Thread(target=with_deadline)
+    thread.start()
+    time.sleep(0.02)
+    results["other"] = api.get_guild_stats(1)
+    thread.join()
+
+    assert isinstance(results["deadline"], cookie.DeadlineExceeded)
+    assert isinstance(results["other"], cookie.GuildStats)
+    assert len(calls) == 2
+
+
+def warm_policy():
+    policy = cookie.HedgePolicy(min_samples=5)
+    for _ in range(5):
+        policy.record("stats/user/1", 0.01)
+    return policy
+
+
+@pytest.mark.asyncio
+async def test_hedged_request_async():
+    policy = warm_policy()
+    calls = []
+
+    async def handler(request):
+        calls.append(request)
+        if len(calls) == 1:
+            await asyncio.sleep(0.5)
+        return cookie_handler(request)
+
+    session = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    async with cookie.AsyncCookieAPI(api_key="test", session=session, hedging=policy) as api:
+        started = time.monotonic()
+        stats = await api.get_user_stats(2)
+
+    assert stats.cookies == 10
+    assert time.monotonic() - started < 0.3
+    assert (policy.hedged, policy.wins) == (1, 1)
+
+
+def test_hedged_request_sync():
+    policy = warm_policy()
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        if len(calls) == 1:
+            time.sleep(0.5)
+        return cookie_handler(request)
+
+    api = make_api(Recorder(handler), hedging=policy)
+    started = time.monotonic()
+    assert api.get_user_stats(2).cookies == 10
+    assert time.monotonic() - started < 0.3
+    assert (policy.hedged, policy.wins) == (1, 1)
+    assert policy.delay("stats/guild/1?days=14") is None
+
+
+def test_hedging_under_load_sync():
+    policy = cookie.HedgePolicy(min_samples=5)
+    for _ in range(5):
+        policy.record("stats/user/1", 0.1)
+
+    def handler(request):
+        time.sleep(0.03)
+        return cookie_handler(request)
+
+    recorder = Recorder(handler)
+    api = make_api(recorder, hedging=policy)
+    results = api.map(api.get_user_stats, [(i,) for i in range(1, 97)], concurrency=48)
+
+    assert all(isinstance(result, cookie.UserStats) for result in results)
+    assert policy.hedged == 0
+    assert len(recorder.calls) == 96
@@ -0,0 +1,86 @@
+import os
+from datetime import date
+
+import pytest
+
+import cookie
+
+from .conftest import chart
+
+
+def test_store_merge_and_query(tmp_path):
+    store = cookie.ChartStore(tmp_path)
+    first = cookie.Chart(**chart(10))
+    second = cookie.Chart(**chart(5, start=100))
+
+    assert store.merge("guild/1/members", first) == 10
+    assert store.merge("guild/1/members", first) == 0
+    assert store.merge("guild/1/members", second) == 0
+    assert store.last_date("guild/1/members") == date(2024, 1, 31)
+
+    history = store.get("guild/1/members")
+    assert len(history) == 10
+    assert history.y == [0, 1, 2, 3, 4, 100, 101, 102, 103, 104]
+
+    window = store.get("guild/1/members", date(2024, 1, 27), date(2024, 1, 28))
+    assert window.y == [100, 101]
+    assert store.get("guild/2/members").x == []
+
+
+def test_store_backfill(tmp_path):
+    store = cookie.ChartStore(tmp_path)
+    store.merge("guild/1/boosts", cookie.Chart(**chart(3)))
+
+    assert store.merge("guild/1/boosts", cookie.Chart(**chart(10))) == 7
+    assert store.first_date("guild/1/boosts") == date(2024, 1, 22)
+    assert len(store.get("guild/1/boosts")) == 10
+
+
+def test_store_sync(tmp_path, sync_client, recorder):
+    store = cookie.ChartStore(tmp_path)
+    api = cookie.CookieAPI(api_key="test", httpx_client=sync_client)
+
+    assert store.days_to_sync("guild/1/members", initial_days=7) == 7
+    assert store.sync_guild_stats(api, 1, initial_days=7) == 14
+    assert store.days_to_sync("guild/1/members") == (date.today() - date(2024, 1, 31)).days + 1
+    assert len(store.get("guild/1/boosts")) == 7
+
+
+def test_store_interrupted_append(tmp_path):
+    store = cookie.ChartStore(tmp_path)
+    store.merge("guild/1/members", cookie.Chart(**chart(10)))
+    # The values of an append were written, but not the dates
+    with open(tmp_path / "guild/1/members.values", "ab") as f:
+        f.write(b"\x01" * 12)
+
+    assert store.get("guild/1/members").y == list(range(10))
+    assert store.merge("guild/1/members", cookie.Chart(**chart(2, start=50))) == 0
+    assert store.get("guild/1/members").y[-2:] == [50, 51]
+
+
+@pytest.mark.parametrize("replaced", [0, 1])
+def test_store_interrupted_rewrite(tmp_path, monkeypatch, replaced):
+    store = cookie.ChartStore(tmp_path)
+    store.merge("guild/1/boosts", cookie.Chart(**chart(3, start=7)))
+
+    replace = os.replace
+    calls = 0
+
+    def crash(src, dst):
+        nonlocal calls
+        calls += 1
+        if calls > replaced:
+            raise OSError("Interrupted")
+        replace(src, dst)
+
+    monkeypatch.setattr(os, "replace", crash)
+    with pytest.raises(OSError):
+        store.merge("guild/1/boosts", cookie.Chart(**chart(10)))
+    monkeypatch.undo()
+
+    history = cookie.ChartStore(tmp_path).get("guild/1/boosts")
+    if replaced:
+        assert history.y == list(range(10))
+    else:
+        assert history.y == [7, 8, 9]
+    assert list(tmp_path.rglob("*.tmp")) == []
@@ -0,0 +1,36 @@
+import io
+
+import pytest
+
+import cookie
+
+from .conftest import FORBIDDEN_GUILD_ID, PNG
+
+
+def test_sync_stream(sync_client, tmp_path):
+    api = cookie.CookieAPI(api_key="test", httpx_client=sync_client)
+
+    chunks = list(api.stream_guild_image(1, chunk_size=100))
+    assert b"".join(chunks) == PNG
+    assert max(len(chunk) for chunk in chunks) <= 100
+
+    path = tmp_path / "member.png"
+    assert api.save_member_image(1, 2, path) == len(PNG)
+    assert path.read_bytes() == PNG
+
+    with pytest.raises(cookie.NoGuildAccess):
+        api.save_guild_image(FORBIDDEN_GUILD_ID, io.BytesIO())
+
+
+@pytest.mark.asyncio
+async def test_async_stream(async_client):
+    async with cookie.AsyncCookieAPI(api_key="test", session=async_client) as api:
+        chunks = [chunk async for chunk in api.stream_member_image(1, 2)]
+        assert b"".join(chunks) == PNG
+
+        buffer = io.BytesIO()
+        await api.save_guild_image(1, buffer)
+        assert buffer.getvalue() == PNG
+
+        with pytest.raises(cookie.NoGuildAccess):
+            await api.save_guild_image(FORBIDDEN_GUILD_ID, io.BytesIO())
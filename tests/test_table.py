@@ -0,0 +1,75 @@
+import pytest
+
+import cookie
+from cookie.testing import MockCookieAPI
+
+from .conftest import MISSING_USER_ID
+
+mock_api = MockCookieAPI()
+
+
+def member(user_id: int) -> dict:
+    return mock_api.payload(f"stats/member/{user_id}/1")
+
+
+def test_append_and_rows():
+    table = cookie.MemberStatsTable([(2, member(2)), (1, cookie.MemberStats(**member(1)))])
+
+    assert len(table) == 2
+    assert list(table.column("level.xp")) == [20, 10]
+    assert table[0].user_id == 2
+    assert table[-1]["voice.minutes"] == 2
+    assert table[1].to_model() == cookie.MemberStats(**member(1))
+    with pytest.raises(KeyError):
+        table.column("missing")
+
+
+def test_sort_top_k_filter():
+    table = cookie.MemberStatsTable((i, member(i)) for i in (5, 3, 9, 1, 7))
+
+    assert list(table.sort("level.xp").column("user_id")) == [1, 3, 5, 7, 9]
+    assert [row.user_id for row in table.top_k("level.xp", 2)] == [9, 7]
+    assert [row.user_id for row in table.top_k("level.xp", 2, largest=False)] == [1, 3]
+    assert list(table.filter("voice.minutes", lambda m: m > 10).column("user_id")) == [9, 7]
+
+
+@pytest.mark.parametrize("numpy", [True, False])
+def test_sort_filter_backends(monkeypatch, numpy):
+    if numpy:
+        pytest.importorskip("numpy")
+    else:
+        monkeypatch.setattr(cookie.table, "_optional_numpy", lambda: None)
+    table = cookie.MemberStatsTable((i, member(i)) for i in (2, 1, 2, 3, 1))
+
+    assert table.argsort("level.xp") == [1, 4, 0, 2, 3]
+    assert table.argsort("level.xp", descending=True) == [3, 0, 2, 1, 4]
+    assert list(table.take([3, 0]).column("level.xp")) == [30, 20]
+    assert list(table.filter("level.xp", lambda xp: xp >= 20).column("user_id")) == [2, 2, 3]
+    # Predicates that only work on single values are called per value
+    only_two = table.filter("level.xp", lambda xp: 10 < xp and xp < 30)
+    assert [row.profile_url for row in only_two] == [table[0].profile_url] * 2
+    assert len(cookie.MemberStatsTable().sort("level.xp")) == 0
+
+
+def test_to_numpy():
+    pytest.importorskip("numpy")
+    table = cookie.MemberStatsTable((i, member(i)) for i in (1, 2, 3))
+
+    assert table.to_numpy("level.msg").tolist() == [1, 2, 3]
+
+
+@pytest.mark.asyncio
+async def test_get_member_stats_table(async_client):
+    async with cookie.AsyncCookieAPI(api_key="test", session=async_client) as api:
+        table = await api.get_member_stats_table(10, [1, MISSING_USER_ID, 3])
+
+    assert sorted(table.column("user_id")) == [1, 3]
+    assert isinstance(table.errors[MISSING_USER_ID], cookie.NotFound)
+
+
+def test_get_member_stats_table_sync(sync_client):
+    with cookie.CookieAPI(api_key="test", httpx_client=sync_client) as api:
+        table = api.get_member_stats_table(10, [1, MISSING_USER_ID, 3])
+
+    assert list(table.column("user_id")) == [1, 3]
+    assert list(table.errors) == [MISSING_USER_ID]
@@ -0,0 +1,32 @@
+import time
+
+import httpx
+import pytest
+
+import cookie
+from cookie.testing import MockCookieAPI
+
+
+def test_mock_error_injection():
+    mock = MockCookieAPI(error_rate=1, error_status=502)
+    client = httpx.Client(transport=mock.transport())
+    api = cookie.CookieAPI(api_key="test", httpx_client=client)
+
+    with pytest.raises(cookie.CookieError, match="502"):
+        api.get_guild_stats(1)
+    with pytest.raises(cookie.InvalidAPIKey):
+        cookie.CookieAPI(api_key="wrong", httpx_client=client).get_guild_stats(1)
+    assert mock.request_count == 2
+
+
+@pytest.mark.asyncio
+async def test_mock_latency():
+    mock = MockCookieAPI(latency=0.05)
+    session = httpx.AsyncClient(transport=mock.async_transport())
+
+    start = time.monotonic()
+    async with cookie.AsyncCookieAPI(api_key="test", session=session) as api:
+        activity = await api.get_guild_activity(1, days=365)
+
+    assert time.monotonic() - start >= 0.05
+    assert len(activity.msg_activity) == 365
@@ -0,0 +1,62 @@
+import pytest
+
+import cookie
+from cookie.tracing import endpoint_template
+
+from .conftest import MISSING_USER_ID, PNG
+
+
+class EventList(cookie.Tracer):
+    def __init__(self):
+        self.events = []
+
+    def on_request(self, event):
+        self.events.append(event)
+
+
+def test_endpoint_template():
+    assert endpoint_template("stats/member/1/2") == "stats/member/{user_id}/{guild_id}"
+    assert endpoint_template("activity/guild/1/image?days=7") == "activity/guild/{guild_id}/image"
+
+
+def test_request_events(sync_client):
+    events = EventList()
+    api = cookie.CookieAPI(
+        api_key="test", httpx_client=sync_client, cache=cookie.ResponseCache(), tracers=[events]
+    )
+
+    api.get_guild_activity(1)
+    api.get_guild_activity(1)
+    with pytest.raises(cookie.NotFound):
+        api.get_user_stats(MISSING_USER_ID)
+    b"".join(api.stream_guild_image(1))
+
+    miss, hit, error, image = events.events
+    assert miss.endpoint == "activity/guild/{guild_id}"
+    assert (miss.status, miss.cache, miss.attempts) == (200, "miss", 1)
+    assert miss.bytes > 0
+    assert {"decode", "validate"} <= set(miss.phases)
+    assert hit.cache == "hit"
+    assert "decode" not in hit.phases
+    assert (error.status, error.error) == (404, "NotFound")
+    assert (image.endpoint, image.bytes) == ("activity/guild/{guild_id}/image", len(PNG))
+
+
+@pytest.mark.asyncio
+async def test_metrics_collector(async_client):
+    quota = cookie.QuotaBudget(limit=100)
+    metrics = cookie.MetricsCollector(quota=quota)
+    async with cookie.AsyncCookieAPI(
+        api_key="test", session=async_client, quota=quota, tracers=[metrics]
+    ) as api:
+        await api.get_many_member_stats([(1, 2), (3, 4)])
+
+    text = metrics.to_prometheus()
+    labels = 'endpoint="stats/member/{user_id}/{guild_id}",status="200",cache="miss"'
+    assert f"cookie_requests_total{{{labels}}} 2" in text
+    assert (
+        'cookie_request_duration_seconds_count{endpoint="stats/member/{user_id}/{guild_id}"} 2'
+        in text
+    )
+    assert 'phase="validate"' in text
+    assert "cookie_quota_remaining 98" in text